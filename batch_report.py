@@ -0,0 +1,258 @@
+"""체크리스트 일괄 처리 - 디렉토리의 체크리스트 통합문서마다 세션 파일(xlsx)과 보고서(PDF) 생성
+
+사용법:
+    python batch_report.py 체크리스트 -o 결과                 # CPU 수만큼 프로세스로 처리
+    python batch_report.py 체크리스트 -o 결과 --workers 4 --recursive
+    python batch_report.py 체크리스트 -o 결과 --no-pdf        # 세션 파일만
+    python batch_report.py 체크리스트 -o 결과 --force         # 이미 처리한 파일도 다시
+    python batch_report.py 체크리스트 -o 결과 --columnar parquet   # 분석용 표 압축파일도 (parquet, arrow, csv)
+
+Streamlit 없이 wmsd_core만 사용합니다. 파일마다 체크리스트 탭과 같은 형식 검사와 부담작업 값 변환을
+거친 뒤, 모든 작업을 한 번씩 연 것과 같은 세션 상태로 세션 파일과 보고서를 만듭니다.
+
+끝난 파일은 출력 디렉토리의 progress.jsonl에 바로 기록하므로, 중단한 뒤 같은 명령을 다시 실행하면
+남은 파일(과 바뀐 파일, 오류가 났던 파일)만 처리합니다. 형식이 맞지 않는 파일은 파일이 바뀌기 전까지
+다시 처리하지 않습니다. 마지막에 파일별 결과를 manifest.json에 기록합니다.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from importlib.util import find_spec
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from wmsd_core import storage
+
+PROGRESS_FILE = "progress.jsonl"
+MANIFEST_FILE = "manifest.json"
+INPUT_EXTENSIONS = (".xlsx", ".xls")
+
+# 결과 상태 - 완료/형식 오류는 파일이 바뀌지 않으면 다시 처리하지 않음
+OK, INVALID, ERROR = "ok", "invalid", "error"
+
+
+def scan_inputs(input_dir, output_dir, recursive=False):
+    """처리할 체크리스트 파일의 상대 경로 목록 (Excel 잠금 파일, 숨김 파일, 출력 디렉토리 제외)"""
+    output_dir = os.path.abspath(output_dir)
+    found = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs[:] = sorted(d for d in dirs
+                         if not d.startswith(".") and os.path.abspath(os.path.join(root, d)) != output_dir)
+        for filename in sorted(files):
+            if filename.startswith(("~$", ".")) or not filename.lower().endswith(INPUT_EXTENSIONS):
+                continue
+            found.append(os.path.relpath(os.path.join(root, filename), input_dir))
+        if not recursive:
+            break
+    return found
+
+
+def fingerprint(path):
+    """파일이 바뀌면 달라지는 값 (크기, 수정 시각)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_progress(output_dir):
+    """progress.jsonl -> {입력 상대 경로: 마지막 결과} (중간에 끊긴 마지막 줄은 무시)"""
+    done = {}
+    path = os.path.join(output_dir, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[record["file"]] = record
+    return done
+
+
+def _finished(record, fingerprint_now, output_dir):
+    """이전 결과를 그대로 쓸 수 있는지 (같은 파일이고, 완료면 출력 파일이 남아 있음)"""
+    if record is None or record.get("fingerprint") != fingerprint_now:
+        return False
+    if record["status"] == INVALID:
+        return True
+    return record["status"] == OK and all(os.path.exists(os.path.join(output_dir, p)) for p in record["outputs"])
+
+
+def _output_stem(relpath):
+    """입력 상대 경로 -> 출력 파일 이름 앞부분 (하위 디렉토리 구조 유지)"""
+    return os.path.splitext(relpath)[0]
+
+
+def process_file(input_dir, output_dir, relpath, pdf=True, columnar_format=None):
+    """체크리스트 하나를 처리하고 결과 dict 반환 - 자식 프로세스에서 실행"""
+    import pandas as pd
+    from wmsd_core import checklist, workbook
+    from wmsd_core.session import initial_state
+    from wmsd_core.work_model import task_names, 작업조건_키, 원인분석_키
+
+    path = os.path.join(input_dir, relpath)
+    record = {"file": relpath, "fingerprint": fingerprint(path), "outputs": []}
+    started = time.perf_counter()
+    try:
+        df = pd.read_excel(path)
+        missing = checklist.missing_columns(df)
+        if missing:
+            record.update(status=INVALID, error=f"필수 컬럼 누락: {', '.join(missing)}")
+            return record
+        df = checklist.normalize_checklist(df)
+
+        stem = _output_stem(relpath)
+        workplace = (checklist.사업장명_목록(df) or [os.path.basename(stem)])[0]
+        state = initial_state(df, 사업장명=workplace)
+        작업명_목록 = task_names(state)
+        작업조건 = [state[작업조건_키.format(작업명)] for 작업명 in 작업명_목록]
+        부담 = checklist.burden_counts(df)
+        record.update(
+            workplace=workplace,
+            rows=len(df),
+            tasks=len(작업명_목록),
+            burden_units=int((부담["해당"] > 0).sum()),
+            potential_units=int(((부담["해당"] == 0) & (부담["잠재"] > 0)).sum()),
+            hazards=sum(1 for 작업명 in 작업명_목록 for entry in state[원인분석_키.format(작업명)] if entry.get("유형")),
+            score_total=int(sum(table["총점"].sum() for table in 작업조건)),
+        )
+
+        os.makedirs(os.path.join(output_dir, os.path.dirname(stem)), exist_ok=True)
+        xlsx = f"{stem}_유해요인조사.xlsx"
+        with storage.atomic_write(os.path.join(output_dir, xlsx)) as fp:
+            workbook.write_workbook(state, fp, session_id=os.path.basename(stem), workplace=workplace)
+        record["outputs"].append(xlsx)
+        if pdf:
+            from report_engine import build_report_pdf
+            report = f"{stem}_유해요인조사보고서.pdf"
+            pdf_bytes = build_report_pdf(state)
+            with storage.atomic_write(os.path.join(output_dir, report)) as fp:
+                fp.write(pdf_bytes)
+            record["outputs"].append(report)
+        if columnar_format:
+            from wmsd_core import columnar
+            tables = f"{stem}_분석용표_{columnar_format}.zip"
+            with storage.atomic_write(os.path.join(output_dir, tables)) as fp:
+                for data in columnar.stream_archive(state, columnar_format):
+                    fp.write(data)
+            record["outputs"].append(tables)
+        record["status"] = OK
+    except Exception as e:
+        record.update(status=ERROR, error=f"{type(e).__name__}: {e}")
+    finally:
+        record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def _last_byte(path):
+    with open(path, "rb") as fp:
+        fp.seek(-1, os.SEEK_END)
+        return fp.read(1)
+
+
+def _append_progress(fp, record):
+    fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+    fp.flush()
+    os.fsync(fp.fileno())
+
+
+def write_manifest(output_dir, input_dir, records, elapsed, workers):
+    """파일별 결과 요약을 manifest.json으로 기록 (임시 파일에 쓴 뒤 교체)"""
+    counts = {status: sum(1 for r in records if r["status"] == status) for status in (OK, INVALID, ERROR)}
+    manifest = {
+        "input_dir": os.path.abspath(input_dir),
+        "output_dir": os.path.abspath(output_dir),
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "elapsed": round(elapsed, 3),
+        "workers": workers,
+        "counts": counts,
+        "files": sorted(records, key=lambda r: r["file"]),
+    }
+    with storage.atomic_write(os.path.join(output_dir, MANIFEST_FILE), "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def run(input_dir, output_dir, workers=None, recursive=False, pdf=True, force=False, log=print,
+        columnar_format=None):
+    """디렉토리 일괄 처리 후 manifest dict 반환"""
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    inputs = scan_inputs(input_dir, output_dir, recursive)
+    progress = {} if force else load_progress(output_dir)
+    records = {}
+    pending = []
+    for relpath in inputs:
+        previous = progress.get(relpath)
+        # 분석용 표를 처음 요청했으면 이미 처리한 파일도 다시 (압축파일이 없으므로)
+        if previous and columnar_format and previous["status"] == OK and \
+                f"{_output_stem(relpath)}_분석용표_{columnar_format}.zip" not in previous["outputs"]:
+            previous = None
+        if _finished(previous, fingerprint(os.path.join(input_dir, relpath)), output_dir):
+            records[relpath] = previous
+        else:
+            pending.append(relpath)
+    log(f"📂 체크리스트 {len(inputs)}개 - 처리 {len(pending)}개, 이전 결과 사용 {len(records)}개 (프로세스 {workers}개)")
+
+    progress_path = os.path.join(output_dir, PROGRESS_FILE)
+    with open(progress_path, "w" if force else "a", encoding="utf-8") as progress_fp:
+        # 이전 실행이 줄 중간에서 끊겼으면 새 기록이 그 줄에 이어 붙지 않도록 줄을 바꿈
+        if progress_fp.tell() > 0 and _last_byte(progress_path) != b"\n":
+            progress_fp.write("\n")
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                futures = {executor.submit(process_file, input_dir, output_dir, relpath, pdf, columnar_format): relpath
+                           for relpath in pending}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        # 자식 프로세스가 비정상 종료한 경우 (메모리 부족 등)
+                        record = {"file": futures[future], "fingerprint": None, "outputs": [], "status": ERROR,
+                                  "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+                    records[record["file"]] = record
+                    _append_progress(progress_fp, record)
+                    mark = {OK: "✅", INVALID: "⚠️", ERROR: "❌"}[record["status"]]
+                    log(f"  [{done}/{len(pending)}] {mark} {record['file']} ({record['seconds']:.1f}초)"
+                        + (f" - {record['error']}" if record.get("error") else ""))
+
+    # 입력 디렉토리에 지금 있는 파일만 요약 (지워진 파일의 이전 기록은 제외)
+    return write_manifest(output_dir, input_dir, [records[relpath] for relpath in inputs],
+                          time.perf_counter() - started, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="체크리스트 통합문서 일괄 처리 (세션 파일 + 보고서)")
+    parser.add_argument("input_dir", help="체크리스트 통합문서(.xlsx, .xls)가 있는 디렉토리")
+    parser.add_argument("-o", "--output", required=True, help="결과 디렉토리 (진행 기록과 manifest.json도 여기에 저장)")
+    parser.add_argument("--workers", type=int, default=None, help="동시에 처리할 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--recursive", action="store_true", help="하위 디렉토리까지 처리")
+    parser.add_argument("--no-pdf", action="store_true", help="보고서(PDF)를 만들지 않음")
+    parser.add_argument("--columnar", choices=["parquet", "arrow", "csv"], default=None,
+                        help="분석용 표(체크리스트, 작업조건, 원인분석 등)를 표마다 파일 하나씩 묶은 압축파일도 생성")
+    parser.add_argument("--force", action="store_true", help="이전 진행 기록을 무시하고 모두 다시 처리")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"디렉토리가 없습니다: {args.input_dir}")
+    pdf = not args.no_pdf
+    if pdf and find_spec("reportlab") is None:
+        print("⚠️ reportlab이 설치되지 않아 보고서(PDF)는 만들지 않습니다.")
+        pdf = False
+    if args.columnar in ("parquet", "arrow") and find_spec("pyarrow") is None:
+        print("⚠️ pyarrow가 설치되지 않아 분석용 표는 CSV로 만듭니다.")
+        args.columnar = "csv"
+
+    manifest = run(args.input_dir, args.output, args.workers, args.recursive, pdf, args.force,
+                   columnar_format=args.columnar)
+    counts = manifest["counts"]
+    print(f"✅ 완료 {counts[OK]}개, 형식 오류 {counts[INVALID]}개, 처리 오류 {counts[ERROR]}개 "
+          f"({manifest['elapsed']:.1f}초) - {os.path.join(args.output, MANIFEST_FILE)}")
+    return 1 if counts[ERROR] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
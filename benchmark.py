@@ -0,0 +1,218 @@
+"""저장/불러오기/조회/보고서 생성 마이크로 벤치마크
+
+사용법:
+    python benchmark.py                       # small, medium 규모에서 측정하고 기준값과 비교해 출력
+    python benchmark.py --scale small         # 지정한 규모만 측정
+    python benchmark.py --save-baseline       # 측정 결과를 benchmark_baseline.json에 기준값으로 저장
+    python benchmark.py --check               # 기준값보다 허용 비율 이상 느리거나 메모리를 더 쓰면 종료 코드 1
+
+synthetic_data.py로 만든 가상 현장 데이터를 임시 디렉토리에서 사용하므로 saved_sessions는 건드리지 않습니다.
+시간은 여러 번 실행한 것 중 가장 빠른 1회 평균, 메모리는 tracemalloc으로 잰 최대 할당량입니다.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from importlib.util import find_spec
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(APP_DIR, "benchmark_baseline.json")
+
+# 규모: (회사, 소속, 작업, 단위작업) - 행 수는 곱
+규모_목록 = {
+    "small": (1, 2, 5, 3),
+    "medium": (2, 4, 25, 6),
+    "large": (3, 6, 40, 6),
+}
+# 지정하지 않으면 측정할 규모 (large는 수 분이 걸리므로 --scale large로 따로 실행)
+기본_규모 = ["small", "medium"]
+# 기준값 대비 허용 비율 (시간은 실행 환경에 따라 흔들리므로 넉넉하게)
+TIME_TOLERANCE = float(os.environ.get("WMSD_BENCH_TIME_TOLERANCE", "1.5"))
+MEMORY_TOLERANCE = float(os.environ.get("WMSD_BENCH_MEMORY_TOLERANCE", "1.25"))
+# 이 차이(초)보다 작은 시간 증가는 측정 오차로 보고 회귀로 치지 않음
+TIME_NOISE_FLOOR = 0.002
+# 빠른 항목을 반복 실행할 때 한 묶음의 최소 시간(초)
+MIN_BATCH_SECONDS = 0.1
+
+
+def _measure(func, repeat):
+    """(1회 평균 시간의 최솟값, 최대 메모리) - 메모리는 별도 1회 실행에서 측정
+
+    빠른 항목은 timeit처럼 한 묶음이 MIN_BATCH_SECONDS 이상 걸리도록 여러 번 실행해 잽니다.
+    """
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_BATCH_SECONDS:
+            break
+        calls *= 2
+    best = elapsed / calls
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, (time.perf_counter() - started) / calls)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _cases(state, workdir):
+    """측정 항목 {이름: 함수} - 앱과 같은 st.session_state 경로를 사용"""
+    import streamlit as st
+    from data_manager import save_to_excel, load_from_excel, clear_session_cache
+    from utils import (get_saved_sessions, get_사업장명_목록, get_팀_목록,
+                       get_작업명_목록, get_단위작업명_목록)
+    from wmsd_core.checklist import total_scores
+    from wmsd_core.session import initial_state
+
+    for key, value in state.items():
+        st.session_state[key] = value
+    작업조건_목록 = [value for key, value in state.items() if key.startswith("작업조건_data_")]
+    checklist_df = state["checklist_df"]
+    회사 = checklist_df["회사명"].iloc[0]
+    소속 = checklist_df["소속"].iloc[0]
+    작업명 = checklist_df["작업명"].iloc[0]
+
+    # 불러오기/목록 측정용 파일을 미리 저장 (저장 목록은 세션 10개 기준)
+    saved_path = save_to_excel("bench_0", "벤치마크", trigger="manual")[1]
+    for i in range(1, 10):
+        save_to_excel(f"bench_{i}", "벤치마크", trigger="manual")
+
+    def load_uncached():
+        # 매번 파싱하는 경우 (처음 불러오거나 파일이 바뀐 경우)
+        clear_session_cache()
+        load_from_excel(saved_path)
+
+    def lookups():
+        for 사업장명 in get_사업장명_목록():
+            for 팀 in get_팀_목록(사업장명):
+                for 작업 in get_작업명_목록(사업장명, 팀):
+                    get_단위작업명_목록(작업, 사업장명, 팀)
+
+    from synthetic_data import generate_assessments
+    from wmsd_core import ergonomics
+    들기, 자세 = generate_assessments(500)
+
+    def assessments():
+        ergonomics.niosh_lifting(들기)
+        ergonomics.posture_scores(자세)
+
+    def tab4_scoring():
+        # tab4 계산 결과 표와 같은 방식 (표 전체 총점을 한 번에)
+        for df in 작업조건_목록:
+            df.assign(총점=total_scores(df))
+
+    cases = {
+        "save_to_excel": lambda: save_to_excel("bench_0", "벤치마크", trigger="manual"),
+        "load_from_excel": load_uncached,
+        "load_from_excel (캐시)": lambda: load_from_excel(saved_path),
+        "get_saved_sessions": get_saved_sessions,
+        "get_*_목록 (전체 계층)": lookups,
+        "get_단위작업명_목록 (필터)": lambda: get_단위작업명_목록(작업명, 회사, 소속),
+        "tab4 총점 계산": tab4_scoring,
+        "인간공학 평가 (500건)": assessments,
+        "체크리스트 -> 세션 상태 (wmsd_core)": lambda: initial_state(checklist_df),
+    }
+    if find_spec("reportlab") is not None:
+        from report_engine import build_report_pdf
+        cases["build_report_pdf"] = lambda: build_report_pdf(state)
+    return cases
+
+
+def run_scale(name, repeat):
+    """규모 하나를 임시 디렉토리에서 측정 {항목: {seconds, peak_bytes}}"""
+    from synthetic_data import generate_session_state
+
+    companies, teams, tasks, units = 규모_목록[name]
+    state = generate_session_state(companies, teams, tasks, units, responses=100 * companies * teams)
+    results = {}
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="wmsd_bench_") as workdir:
+        # SAVE_DIR이 상대 경로이므로 임시 디렉토리로 이동해서 실행
+        os.chdir(workdir)
+        try:
+            for case, func in _cases(state, workdir).items():
+                seconds, peak = _measure(func, repeat)
+                results[case] = {"seconds": round(seconds, 6), "peak_bytes": peak}
+        finally:
+            os.chdir(previous_cwd)
+    return len(state["checklist_df"]), results
+
+
+def _compare(current, baseline):
+    """기준값과 비교한 (비율 문자열, 회귀 여부)"""
+    if not baseline:
+        return "기준값 없음", False
+    time_ratio = current["seconds"] / baseline["seconds"] if baseline["seconds"] else 1.0
+    memory_ratio = current["peak_bytes"] / baseline["peak_bytes"] if baseline["peak_bytes"] else 1.0
+    time_regressed = time_ratio > TIME_TOLERANCE and current["seconds"] - baseline["seconds"] > TIME_NOISE_FLOOR
+    regressed = time_regressed or memory_ratio > MEMORY_TOLERANCE
+    return f"시간 ×{time_ratio:.2f}, 메모리 ×{memory_ratio:.2f}", regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마이크로 벤치마크")
+    parser.add_argument("--scale", choices=list(규모_목록), action="append", help="측정할 규모 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값 파일에 저장")
+    parser.add_argument("--check", action="store_true", help="기준값 대비 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="기준값 파일 경로")
+    args = parser.parse_args()
+
+    # 스크립트 실행(bare mode)에서 나오는 Streamlit 경고 숨김
+    import streamlit.logger
+    streamlit.logger.set_log_level(logging.ERROR)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+
+    measured = {}
+    regressions = []
+    for scale in args.scale or 기본_규모:
+        rows, results = run_scale(scale, args.repeat)
+        measured[scale] = results
+        print(f"[{scale}] 체크리스트 {rows:,}행")
+        for case, result in results.items():
+            ratio, regressed = _compare(result, baseline.get(scale, {}).get(case))
+            mark = "❌" if regressed else "  "
+            print(f"  {mark} {case:<28} {result['seconds'] * 1000:9.1f} ms  "
+                  f"{result['peak_bytes'] / 1024 / 1024:8.2f} MB  ({ratio})")
+            if regressed:
+                regressions.append(f"[{scale}] {case}: {ratio}")
+        print()
+
+    if args.save_baseline:
+        baseline.update(measured)
+        with open(args.baseline, "w", encoding="utf-8") as fp:
+            json.dump(baseline, fp, ensure_ascii=False, indent=2)
+        print(f"✅ 기준값을 {args.baseline}에 저장했습니다.")
+        return 0
+
+    if regressions:
+        print(f"❌ 기준값 대비 회귀 (허용: 시간 ×{TIME_TOLERANCE}, 메모리 ×{MEMORY_TOLERANCE})")
+        for line in regressions:
+            print(f"   {line}")
+        return 1 if args.check else 0
+    print("✅ 기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,136 +1,142 @@
 import streamlit as st
 import pandas as pd
 import os
-from datetime import datetime
-from utils import SAVE_DIR, get_작업명_목록
+import copy
+import time
+import threading
+from collections import OrderedDict
+import profiler
+import metrics
+from wmsd_core import storage, workbook
+import frame_store
+import site_registry
 
-def save_to_excel(session_id, workplace):
-    """현재 세션 상태의 모든 데이터를 Excel 파일로 저장합니다."""
+# 불러온 세션 캐시 크기 제한 (프로세스 전체에서 공유, 환경변수로 조정 가능)
+SESSION_CACHE_BYTES = int(os.environ.get("WMSD_SESSION_CACHE_MB", "128")) * 1024 * 1024
+
+# 파일 식별값 -> (파싱된 내용, 메모리 추정치), 오래 안 쓴 순서
+_session_cache = OrderedDict()
+_session_cache_bytes = 0
+_session_cache_lock = threading.Lock()
+
+
+@profiler.timed("save_to_excel", "io")
+def save_to_excel(session_id, workplace, trigger="manual"):
+    """현재 세션 상태의 모든 데이터를 Excel 파일로 저장합니다 (wmsd_core.workbook.save_session의 Streamlit 어댑터).
+
+    trigger(auto, manual, upload)는 운영 지표에서 저장 경로를 구분하는 데 사용됩니다.
+    """
     if not session_id or not workplace:
         return False, "세션 ID 또는 작업장 정보가 없습니다."
 
-    filepath = os.path.join(SAVE_DIR, f"{session_id}.xlsx")
-    
+    started = time.perf_counter()
     try:
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            all_keys = list(st.session_state.keys())
-
-            # --- 탭 1: 사업장 개요 ---
-            overview_data = {
-                "분류": ["사업장명", "소재지", "업종", "예비조사일", "수행기관", "본조사일", "성명"],
-                "내용": [
-                    st.session_state.get("사업장명", ""),
-                    st.session_state.get("소재지", ""),
-                    st.session_state.get("업종", ""),
-                    st.session_state.get("예비조사", ""),
-                    st.session_state.get("수행기관", ""),
-                    st.session_state.get("본조사", ""),
-                    st.session_state.get("성명", "")
-                ]
-            }
-            pd.DataFrame(overview_data).to_excel(writer, sheet_name="1_사업장개요", index=False)
-
-            # --- 탭 2: 체크리스트 ---
-            if "checklist_df" in st.session_state and not st.session_state["checklist_df"].empty:
-                st.session_state["checklist_df"].to_excel(writer, sheet_name="2_체크리스트", index=False)
-
-            # --- 탭 3 & 4 & 5: 작업별 상세 데이터 ---
-            작업명_목록 = get_작업명_목록()
-            if not 작업명_목록: # 체크리스트에 작업이 없을 경우를 대비
-                작업명_목록 = []
-
-            for 작업명 in 작업명_목록:
-                # 시트 이름은 31자 제한이 있으므로 작업명 일부만 사용
-                safe_sheet_name = 작업명.replace("/", "_").replace("\\", "_")[:25]
-
-                # --- 탭 3: 유해요인조사표 ---
-                hazard_data = {
-                    "항목": ["조사일시", "조사자", "부서명", "작업공정명", "작업명"],
-                    "내용": [
-                        st.session_state.get(f"조사일시_{작업명}", ""),
-                        st.session_state.get(f"조사자_{작업명}", ""),
-                        st.session_state.get(f"부서명_{작업명}", ""),
-                        st.session_state.get(f"작업공정명_{작업명}", ""),
-                        st.session_state.get(f"작업명_{작업명}", "")
-                    ]
-                }
-                pd.DataFrame(hazard_data).to_excel(writer, sheet_name=f"3_{safe_sheet_name}_유해요인", index=False)
-                
-                # --- 탭 4: 작업조건조사 ---
-                # 1단계, 3단계 정보
-                work_cond_data = {
-                     "항목": ["(1단계)작업공정", "(1단계)작업내용", "(3단계)작업명", "(3단계)근로자수"],
-                     "내용": [
-                         st.session_state.get(f"1단계_작업공정_{작업명}", ""),
-                         st.session_state.get(f"1단계_작업내용_{작업명}", ""),
-                         st.session_state.get(f"3단계_작업명_{작업명}", ""),
-                         st.session_state.get(f"3단계_근로자수_{작업명}", "")
-                     ]
-                }
-                pd.DataFrame(work_cond_data).to_excel(writer, sheet_name=f"4_{safe_sheet_name}_작업조건", index=False, startrow=0)
-                
-                # 2단계 데이터 (DataFrame)
-                if f"작업조건_data_{작업명}" in st.session_state:
-                    df_work_cond = st.session_state[f"작업조건_data_{작업명}"]
-                    df_work_cond.to_excel(writer, sheet_name=f"4_{safe_sheet_name}_작업조건", index=False, startrow=len(work_cond_data)+2)
-
-                # 원인분석 데이터
-                if f"원인분석_항목_{작업명}" in st.session_state:
-                    df_analysis = pd.DataFrame(st.session_state[f"원인분석_항목_{작업명}"])
-                    df_analysis.to_excel(writer, sheet_name=f"4_{safe_sheet_name}_원인분석", index=False)
-            
-            # (기타 탭 데이터 추가 영역)
-            # tab5_detailed_investigation, tab6_symptom_analysis, tab7_improvement_plan 관련 데이터가 
-            # st.session_state에 저장된다면 여기에 유사한 로직으로 추가할 수 있습니다.
-
+        # 같은 세션의 저장(자동 저장, 여러 브라우저 탭)은 순서대로, 파일은 완성된 뒤에 교체
+        with profiler.span("write_workbook", "io"):
+            filepath, metadata = workbook.save_session(st.session_state, session_id, workplace)
+        site_registry.record_session(session_id, workplace, os.path.basename(filepath), metadata["saved_at"])
+        nbytes = os.path.getsize(filepath)
+        profiler.record_size("세션 파일", nbytes)
+        metrics.record_save(time.perf_counter() - started, True, trigger, nbytes)
         return True, filepath
     except Exception as e:
+        metrics.record_save(time.perf_counter() - started, False, trigger)
         return False, str(e)
 
 
+# 앱에서 쓸 때는 실행 시간을 프로파일러에 기록
+write_workbook = profiler.timed("write_workbook", "io")(workbook.write_workbook)
+
+
+def _session_view(values):
+    """캐시된 내용을 세션마다 따로 쓸 수 있게 복사
+
+    Copy-on-Write에서는 DataFrame을 얕게 복사해도 한쪽을 고칠 때 그쪽만 복사되므로
+    데이터를 실제로 복제하지 않습니다. 목록/사전(원인분석 항목)은 작아서 깊은 복사합니다.
+    """
+    view = {}
+    for key, value in values.items():
+        if isinstance(value, pd.DataFrame):
+            view[key] = frame_store.view(value)
+        elif isinstance(value, (list, dict)):
+            view[key] = copy.deepcopy(value)
+        else:
+            view[key] = value
+    return view
+
+
+def _file_identity(filepath):
+    """파일이 바뀌면 달라지는 값 (경로, inode, 수정 시각, 크기) - 저장은 파일 교체라 inode도 바뀜"""
+    stat = os.stat(filepath)
+    return (os.path.realpath(filepath), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _cached_session(identity):
+    with _session_cache_lock:
+        entry = _session_cache.get(identity)
+        if entry is not None:
+            _session_cache.move_to_end(identity)
+            return entry[0]
+    return None
+
+
+def _remember_session(identity, values):
+    """불러온 내용을 캐시에 저장하고 용량을 넘으면 오래된 항목부터 제거"""
+    global _session_cache_bytes
+    nbytes = metrics.estimate_session_bytes(values)
+    with _session_cache_lock:
+        # 같은 경로의 이전 버전은 다시 쓰이지 않으므로 바로 제거
+        for old in [key for key in _session_cache if key[0] == identity[0] and key != identity]:
+            _session_cache_bytes -= _session_cache.pop(old)[1]
+        if identity in _session_cache:
+            _session_cache.move_to_end(identity)
+            return
+        _session_cache[identity] = (values, nbytes)
+        _session_cache_bytes += nbytes
+        while _session_cache_bytes > SESSION_CACHE_BYTES and len(_session_cache) > 1:
+            _, (_, evicted) = _session_cache.popitem(last=False)
+            _session_cache_bytes -= evicted
+
+
+def clear_session_cache():
+    """불러온 세션 캐시 비우기"""
+    global _session_cache_bytes
+    with _session_cache_lock:
+        _session_cache.clear()
+        _session_cache_bytes = 0
+
+
+def read_session_file(filepath):
+    """세션 파일 내용 {키: 값}과 캐시 사용 여부 - 같은 파일을 최근에 읽었으면 다시 파싱하지 않음"""
+    identity = _file_identity(filepath)
+    values = _cached_session(identity)
+    if values is not None:
+        return _session_view(values), True
+
+    # 한 번에 읽어 둔 내용으로 파싱 (다른 사용자가 저장하며 파일을 교체해도 영향 없음)
+    snapshot = storage.read_snapshot(filepath)
+    profiler.record_size("불러온 세션 파일", snapshot.getbuffer().nbytes)
+    with profiler.span("excel_parse:세션 파일", "io"):
+        values = workbook.read_workbook(snapshot)
+    # 읽는 사이에 파일이 교체됐으면 어느 버전인지 알 수 없으므로 캐시하지 않음
+    if _file_identity(filepath) == identity:
+        _remember_session(identity, values)
+        return _session_view(values), False
+    return values, False
+
+
+@profiler.timed("load_from_excel", "io")
 def load_from_excel(filepath):
     """Excel 파일에서 데이터를 불러와 세션 상태를 복원합니다."""
     try:
-        xls = pd.ExcelFile(filepath)
-        
-        # 1. 사업장개요
-        if "1_사업장개요" in xls.sheet_names:
-            df = pd.read_excel(xls, sheet_name="1_사업장개요")
-            # key-value 쌍으로 st.session_state에 저장
-            # 예: st.session_state["사업장명"] = "A사업장"
-            for _, row in df.iterrows():
-                if pd.notna(row["분류"]) and pd.notna(row["내용"]):
-                     # overview 탭의 key값으로 저장
-                    if row["분류"] == "예비조사일": st.session_state["예비조사"] = row["내용"]
-                    elif row["분류"] == "본조사일": st.session_state["본조사"] = row["내용"]
-                    else: st.session_state[row["분류"]] = row["내용"]
-        
-        # 2. 체크리스트
-        if "2_체크리스트" in xls.sheet_names:
-            st.session_state["checklist_df"] = pd.read_excel(xls, sheet_name="2_체크리스트")
-        else:
-            st.session_state["checklist_df"] = pd.DataFrame()
-
-        # 3, 4, 5. 작업별 데이터
-        for sheet_name in xls.sheet_names:
-            if sheet_name.startswith("3_"):
-                df = pd.read_excel(xls, sheet_name=sheet_name)
-                작업명 = sheet_name.split("_")[1]
-                for _, row in df.iterrows():
-                    key_suffix = row['항목'].replace(" ", "_") # "조사 일시" -> "조사_일시"
-                    state_key = f"{key_suffix}_{작업명}"
-                    st.session_state[state_key] = row['내용']
-            
-            elif sheet_name.startswith("4_") and "작업조건" in sheet_name:
-                 # 작업조건조사 데이터 로드 로직 (필요시 상세 구현)
-                pass
-            
-            elif sheet_name.startswith("4_") and "원인분석" in sheet_name:
-                작업명 = sheet_name.split("_")[1]
-                df_analysis = pd.read_excel(xls, sheet_name=sheet_name)
-                st.session_state[f"원인분석_항목_{작업명}"] = df_analysis.to_dict('records')
-
+        values, cache_hit = read_session_file(filepath)
+        # 이전 세션의 증상조사 누적 집계가 남으면 불러온 증상조사 표를 덮어쓰므로 지움 (파일에 응답 기록이 있으면 다시 들어옴)
+        st.session_state.pop("증상조사_집계", None)
+        for key, value in values.items():
+            st.session_state[key] = value
+        metrics.record_load(True, cache_hit)
         return True
     except Exception as e:
+        metrics.record_load(False)
         st.error(f"파일 로딩 중 오류 발생: {e}")
-        return False
\ No newline at end of file
+        return False
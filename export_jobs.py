@@ -0,0 +1,392 @@
+import os
+import json
+import uuid
+import copy
+import zipfile
+import typing
+import threading
+import collections.abc
+from functools import partial
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from utils import FRAGMENT_AVAILABLE, editor_fragment
+from wmsd_core.storage import SAVE_DIR
+import metrics
+from wmsd_core import storage
+
+# 내보내기 결과물과 작업 목록 저장 위치
+EXPORT_DIR = os.path.join(SAVE_DIR, "exports")
+JOB_INDEX_PATH = os.path.join(EXPORT_DIR, "jobs.json")
+
+# 동시에 실행할 내보내기 작업 수, 세션별로 보관할 완료 작업 수
+EXPORT_WORKERS = int(os.environ.get("WMSD_EXPORT_WORKERS", "2"))
+JOBS_KEPT_PER_SESSION = 10
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+작업종류 = {
+    "xlsx": {"label": "엑셀 내보내기", "ext": "xlsx", "mime": XLSX_MIME},
+    "pdf": {"label": "PDF 보고서", "ext": "pdf", "mime": "application/pdf"},
+    "bundle": {"label": "전체 묶음(엑셀+PDF+사진)", "ext": "zip", "mime": "application/zip"},
+    "columnar": {"label": "분석용 표", "ext": "zip", "mime": "application/zip"},
+}
+
+
+
+def _download_accepts_callable():
+    """st.download_button의 data 형식에 인자 없는 함수가 들어 있는지 (구버전은 bytes/문자열/파일만 받음)"""
+    try:
+        data_type = typing.get_type_hints(st.download_button)["data"]
+    except Exception:
+        return False
+    return any(typing.get_origin(arg) is collections.abc.Callable for arg in typing.get_args(data_type))
+
+
+# 다운로드 버튼에 함수를 넘기면 누를 때만 파일을 읽음 (지원하지 않는 구버전은 선택한 결과물만 미리 읽음)
+DEFERRED_DOWNLOAD = _download_accepts_callable()
+
+상태_표시 = {
+    "queued": "⏳ 대기 중",
+    "running": "⚙️ 진행 중",
+    "done": "✅ 완료",
+    "failed": "❌ 실패",
+    "cancelled": "🚫 취소됨",
+}
+
+_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+_jobs = {}           # job_id -> 작업 정보 dict
+_cancel_events = {}  # job_id -> threading.Event
+_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """사용자가 취소한 내보내기 작업"""
+
+
+def _save_index():
+    """작업 목록을 디스크에 기록 (서버 재시작 후에도 완료된 결과물 조회 가능)"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    tmp_path = f"{JOB_INDEX_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(list(_jobs.values()), fp, ensure_ascii=False)
+    os.replace(tmp_path, JOB_INDEX_PATH)
+
+
+def _load_index():
+    """디스크의 작업 목록 복원 (실행 중이던 작업은 실패로 표시)"""
+    if not os.path.exists(JOB_INDEX_PATH):
+        return
+    try:
+        with open(JOB_INDEX_PATH, encoding="utf-8") as fp:
+            for job in json.load(fp):
+                if job["status"] in ("queued", "running"):
+                    job["status"] = "failed"
+                    job["message"] = "서버가 재시작되어 작업이 중단되었습니다."
+                _jobs[job["id"]] = job
+    except (OSError, ValueError, KeyError):
+        pass
+
+
+_load_index()
+
+
+def _update(job_id, **fields):
+    """작업 정보 갱신 - 상태가 바뀔 때만 디스크에 기록 (진행률은 메모리에만, 다른 세션과 같은 목록 파일을 쓰므로)"""
+    with _lock:
+        _jobs[job_id].update(fields)
+        if "status" in fields:
+            _save_index()
+
+
+def _prune(session_id):
+    """세션별로 최근 작업만 남기고 오래된 결과물 삭제"""
+    finished = sorted(
+        (job for job in _jobs.values()
+         if job["session_id"] == session_id and job["status"] not in ("queued", "running")),
+        key=lambda job: job["created"], reverse=True
+    )
+    for job in finished[JOBS_KEPT_PER_SESSION:]:
+        if job.get("artifact") and os.path.exists(job["artifact"]):
+            try:
+                os.remove(job["artifact"])
+            except OSError:
+                pass
+        del _jobs[job["id"]]
+
+
+def snapshot_state(session_state):
+    """작업 스레드에서 사용할 세션 상태 사본 생성 (스크립트 스레드에서 호출)
+
+    작업 중에 화면에서 데이터를 수정해도 내보내기 결과가 섞이지 않도록 복사하며,
+    업로드된 사진은 (파일명, bytes)로 변환합니다.
+    """
+    snapshot = {}
+    for key, value in list(session_state.items()):
+        if isinstance(value, pd.DataFrame):
+            snapshot[key] = value.copy()
+        elif isinstance(value, (list, dict)):
+            snapshot[key] = copy.deepcopy(value)
+        elif hasattr(value, "getvalue") and hasattr(value, "name"):
+            snapshot[key] = (value.name, value.getvalue())
+        else:
+            snapshot[key] = value
+    return snapshot
+
+
+def _photo_entries(snapshot):
+    """스냅샷에 있는 작업 사진 (작업명, 번호, 파일명, bytes) 목록"""
+    entries = []
+    for key, value in snapshot.items():
+        if key.startswith("사진_") and "_데이터_" in key and isinstance(value, tuple):
+            번호, 작업명 = key[len("사진_"):].split("_데이터_", 1)
+            entries.append((작업명, 번호, value[0], value[1]))
+    return entries
+
+
+def _tmp_path(job):
+    """작업 중 기록하는 임시 파일 경로 (확장자는 결과물과 동일하게 유지)"""
+    directory, filename = os.path.split(job["artifact"])
+    return os.path.join(directory, f".tmp_{filename}")
+
+
+def _run_xlsx(snapshot, job, report):
+    from data_manager import write_workbook
+    tmp_path = _tmp_path(job)
+    write_workbook(snapshot, tmp_path, job["session_id"], job["workplace"], progress=report)
+    os.replace(tmp_path, job["artifact"])
+
+
+def _run_pdf(snapshot, job, report):
+    from report_cache import get_or_build_report
+    report(0.1)
+    pdf_bytes, _, _ = get_or_build_report(snapshot)
+    with storage.atomic_write(job["artifact"]) as fp:
+        fp.write(pdf_bytes)
+
+
+def _run_bundle(snapshot, job, report):
+    from io import BytesIO
+    from data_manager import write_workbook
+    from report_cache import get_or_build_report
+
+    workplace = job["workplace"] or "결과"
+    tmp_path = _tmp_path(job)
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        xlsx_buffer = BytesIO()
+        write_workbook(snapshot, xlsx_buffer, job["session_id"], job["workplace"], progress=lambda p: report(p * 0.4))
+        bundle.writestr(f"{workplace}_유해요인조사.xlsx", xlsx_buffer.getvalue())
+        del xlsx_buffer
+
+        report(0.45)
+        pdf_bytes, _, _ = get_or_build_report(snapshot)
+        bundle.writestr(f"{workplace}_유해요인조사보고서.pdf", pdf_bytes)
+        del pdf_bytes
+
+        photos = _photo_entries(snapshot)
+        for done, (작업명, 번호, filename, data) in enumerate(photos, start=1):
+            safe_작업명 = 작업명.replace("/", "_").replace("\\", "_")
+            # 사진은 이미 압축된 형식이므로 다시 압축하지 않음
+            bundle.writestr(f"사진/{safe_작업명}/{번호}_{filename}", data, compress_type=zipfile.ZIP_STORED)
+            report(0.8 + 0.2 * done / len(photos))
+    os.replace(tmp_path, job["artifact"])
+
+
+def _run_columnar(snapshot, job, report):
+    """표마다 Parquet/Arrow/CSV 파일 하나씩 묶은 zip - 조각을 받는 대로 파일에 기록 (전체를 메모리에 만들지 않음)"""
+    from wmsd_core import columnar
+    with storage.atomic_write(job["artifact"]) as fp:
+        for data in columnar.stream_archive(snapshot, job["format"], progress=report):
+            fp.write(data)
+
+
+_실행함수 = {"xlsx": _run_xlsx, "pdf": _run_pdf, "bundle": _run_bundle, "columnar": _run_columnar}
+
+
+def _run_job(job_id, snapshot):
+    """작업 스레드에서 내보내기 실행"""
+    cancel_event = _cancel_events[job_id]
+    job = dict(_jobs[job_id])
+
+    def report(progress):
+        # 진행률 보고 시점마다 취소 여부 확인
+        if cancel_event.is_set():
+            raise JobCancelled()
+        _update(job_id, progress=round(min(max(progress, 0.0), 1.0), 3))
+
+    try:
+        if cancel_event.is_set():
+            raise JobCancelled()
+        _update(job_id, status="running", started=datetime.now().isoformat(timespec="seconds"))
+        _실행함수[job["kind"]](snapshot, job, report)
+        _update(job_id, status="done", progress=1.0, message="",
+                finished=datetime.now().isoformat(timespec="seconds"))
+    except JobCancelled:
+        _update(job_id, status="cancelled", message="사용자가 취소했습니다.",
+                finished=datetime.now().isoformat(timespec="seconds"))
+    except Exception as e:
+        _update(job_id, status="failed", message=str(e),
+                finished=datetime.now().isoformat(timespec="seconds"))
+    finally:
+        metrics.inc("wmsd_export_jobs_total", kind=job["kind"], status=_jobs[job_id]["status"])
+        for path in (job["artifact"], _tmp_path(job)):
+            if _jobs[job_id]["status"] != "done" and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        _cancel_events.pop(job_id, None)
+
+
+def submit_export(kind, session_state, fmt=None):
+    """내보내기 작업을 작업 풀에 등록하고 job_id를 반환합니다. (fmt: 분석용 표 형식 - parquet, arrow, csv)"""
+    session_id = session_state.get("session_id")
+    workplace = session_state.get("workplace") or ""
+    job_id = uuid.uuid4().hex[:12]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+
+    info = 작업종류[kind]
+    label = f"{info['label']}_{fmt}" if fmt else info["label"]
+    job = {
+        "id": job_id,
+        "kind": kind,
+        "session_id": session_id,
+        "workplace": workplace,
+        "status": "queued",
+        "progress": 0.0,
+        "message": "",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "artifact": os.path.join(EXPORT_DIR, f"{job_id}.{info['ext']}"),
+        "format": fmt,
+        "file_name": f"{workplace or '결과'}_{label}_{datetime.now().strftime('%Y%m%d_%H%M')}.{info['ext']}",
+        "mime": info["mime"],
+    }
+    snapshot = snapshot_state(session_state)
+    with _lock:
+        _jobs[job_id] = job
+        _cancel_events[job_id] = threading.Event()
+        _prune(session_id)
+        _save_index()
+    _executor.submit(_run_job, job_id, snapshot)
+    return job_id
+
+
+def cancel_job(job_id):
+    """대기 중이거나 실행 중인 작업 취소 요청"""
+    event = _cancel_events.get(job_id)
+    if event is not None:
+        event.set()
+        with _lock:
+            if _jobs[job_id]["status"] == "queued":
+                _jobs[job_id]["message"] = "취소 요청됨"
+
+
+def list_jobs(session_id):
+    """세션의 내보내기 작업 목록 (최신순)"""
+    with _lock:
+        jobs = [dict(job) for job in _jobs.values() if job["session_id"] == session_id]
+    return sorted(jobs, key=lambda job: job["created"], reverse=True)
+
+
+def _render_job(job):
+    """작업 하나의 상태, 진행률, 취소 버튼 표시 (다운로드는 _render_download에서 선택한 결과물만)"""
+    label = 작업종류[job["kind"]]["label"] + (f"({job['format']})" if job.get("format") else "")
+    st.markdown(f"**{label}** · {상태_표시[job['status']]} · {job['created'][11:16]}")
+    if job["status"] in ("queued", "running"):
+        st.progress(job["progress"])
+        if st.button("🚫 취소", key=f"cancel_job_{job['id']}", use_container_width=True):
+            cancel_job(job["id"])
+            st.rerun()
+    elif job["status"] in ("failed", "cancelled") and job["message"]:
+        st.caption(job["message"])
+
+
+def _read_artifact(path):
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+def _render_download(session_id):
+    """완료된 결과물 중 사용자가 고른 하나만 다운로드 버튼으로 표시"""
+    jobs = {job["id"]: job for job in list_jobs(session_id)[:5]
+            if job["status"] == "done" and os.path.exists(job["artifact"])}
+    if not jobs:
+        return
+    job_id = st.selectbox(
+        "다운로드할 결과물", list(jobs), key="export_download_job",
+        format_func=lambda i: f"{jobs[i]['created'][11:16]} · {jobs[i]['file_name']}"
+    )
+    job = jobs[job_id]
+    path = job["artifact"]
+    st.download_button(
+        label="📥 다운로드",
+        data=partial(_read_artifact, path) if DEFERRED_DOWNLOAD else _read_artifact(path),
+        file_name=job["file_name"],
+        mime=job["mime"],
+        key=f"download_job_{job['id']}",
+        use_container_width=True
+    )
+
+
+def _render_job_list(session_id):
+    """최근 작업 목록을 표시하고 실행 중인 작업이 있는지 반환"""
+    jobs = list_jobs(session_id)
+    if not jobs:
+        st.caption("내보내기 작업이 없습니다.")
+    for job in jobs[:5]:
+        _render_job(job)
+    return any(job["status"] in ("queued", "running") for job in jobs)
+
+
+def _poll_job_list(session_id):
+    """실행 중인 작업이 모두 끝나면 전체 화면을 한 번 다시 그려 주기적 갱신 중단"""
+    if not _render_job_list(session_id):
+        st.rerun()
+
+
+# 실행 중인 작업이 있으면 작업 목록 영역만 주기적으로 새로 그림
+if FRAGMENT_AVAILABLE:
+    _render_job_list_live = editor_fragment(_poll_job_list, run_every=2)
+else:
+    _render_job_list_live = _render_job_list
+
+
+def render_export_jobs_panel():
+    """사이드바 내보내기 작업 패널 (작업 등록, 상태, 취소, 결과 다운로드)"""
+    session_id = st.session_state.get("session_id")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("📋 엑셀", use_container_width=True, help="엑셀 통합문서 내보내기"):
+            submit_export("xlsx", st.session_state)
+    with col2:
+        if st.button("📑 PDF", use_container_width=True, help="PDF 보고서 내보내기"):
+            submit_export("pdf", st.session_state)
+    with col3:
+        if st.button("📦 묶음", use_container_width=True, help="엑셀 + PDF + 작업 사진 압축파일"):
+            submit_export("bundle", st.session_state)
+
+    # 분석용 표: 체크리스트, 작업조건(긴 표), 원인분석, 증상조사, 개선계획을 표마다 파일 하나로
+    from wmsd_core import columnar
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        fmt = st.selectbox(
+            "분석용 표 형식", columnar.available_formats(),
+            format_func=lambda f: columnar.FORMATS[f]["label"],
+            key="columnar_export_format", label_visibility="collapsed",
+            help=None if columnar.PYARROW_AVAILABLE else "pyarrow가 설치되지 않아 CSV만 사용할 수 있습니다."
+        )
+    with col2:
+        if st.button("📊 분석용", use_container_width=True, help="표마다 Parquet/Arrow/CSV 파일 하나씩 묶은 압축파일"):
+            submit_export("columnar", st.session_state, fmt)
+
+    실행중 = any(job["status"] in ("queued", "running") for job in list_jobs(session_id))
+    if 실행중:
+        _render_job_list_live(session_id)
+    else:
+        _render_job_list(session_id)
+    # 주기적으로 다시 그리는 작업 목록 밖에 두어 진행 상황을 갱신할 때는 결과물을 다시 읽지 않음
+    _render_download(session_id)
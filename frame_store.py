@@ -0,0 +1,92 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils import hash_content
+
+# 세션 사이에 공유하는 표의 최대 크기 (환경변수로 조정 가능)
+FRAME_STORE_BYTES = int(os.environ.get("WMSD_FRAME_STORE_MB", "32")) * 1024 * 1024
+
+# 내용 해시 -> (원본 DataFrame, 메모리 크기), 오래 안 쓴 순서
+# 원본은 읽기 전용으로만 쓰고, 세션에는 항상 view()로 만든 복사본을 넘김
+_frames = OrderedDict()
+_frames_bytes = 0
+_lock = threading.Lock()
+
+
+def copy_on_write_enabled():
+    """pandas Copy-on-Write 사용 여부 (pandas 3은 항상 사용)"""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def view(df):
+    """세션에 넘길 복사본 - Copy-on-Write에서는 데이터를 복제하지 않는 얕은 복사
+
+    한쪽에서 값을 고치면 그 시점에 그쪽만 복사되므로 원본과 다른 세션은 바뀌지 않습니다.
+    """
+    return df.copy(deep=not copy_on_write_enabled())
+
+
+def frame_key(df):
+    """표 내용의 해시 (열 이름/값/열 형식/인덱스가 모두 같으면 같은 키)
+
+    값만 같은 표를 공유하면 나중에 넣은 쪽이 다른 인덱스나 열 형식을 받게 되므로 함께 해시합니다.
+    """
+    hasher = hashlib.sha256()
+    hash_content(hasher, df)
+    hasher.update(repr([str(dtype) for dtype in df.dtypes]).encode())
+    hasher.update(repr((type(df.index).__name__, str(df.index.dtype), list(df.index.names))).encode())
+    try:
+        hashed = pd.util.hash_pandas_object(df.index)
+    except TypeError:
+        hashed = pd.util.hash_pandas_object(df.index.astype("string"))
+    hasher.update(hashed.to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def share(df):
+    """내용이 같은 표가 이미 있으면 그 표를 공유하는 복사본을 반환
+
+    여러 세션이 같은 기본 표나 같은 편집 결과를 가지고 있어도 데이터는 한 벌만 남습니다.
+    Copy-on-Write를 쓸 수 없는 환경에서는 공유하지 않고 그대로 반환합니다.
+    """
+    global _frames_bytes
+    if not copy_on_write_enabled():
+        return df
+    key = frame_key(df)
+    with _lock:
+        entry = _frames.get(key)
+        if entry is not None:
+            _frames.move_to_end(key)
+            return view(entry[0])
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    original = view(df)
+    with _lock:
+        if key not in _frames:
+            _frames[key] = (original, nbytes)
+            _frames_bytes += nbytes
+            while _frames_bytes > FRAME_STORE_BYTES and len(_frames) > 1:
+                _, (_, evicted) = _frames.popitem(last=False)
+                _frames_bytes -= evicted
+    return view(original)
+
+
+def is_shared(df):
+    """같은 내용의 표가 공유 저장소에 있는지"""
+    with _lock:
+        if not _frames:
+            return False
+    key = frame_key(df)
+    with _lock:
+        return key in _frames
+
+
+def stats():
+    """(공유 중인 표 수, 메모리 크기)"""
+    with _lock:
+        return len(_frames), _frames_bytes
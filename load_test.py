@@ -0,0 +1,215 @@
+"""헤드리스 부하 테스트 - 여러 조사자가 동시에 앱을 쓰는 상황에서 다시 실행 지연 측정
+
+사용법:
+    python load_test.py                        # 조사자 4명, 1회씩
+    python load_test.py --users 8 --rounds 3   # 조사자 8명이 흐름을 3번씩 반복
+    python load_test.py --tasks 20 --json result.json
+
+Streamlit AppTest로 main.py를 직접 실행하므로 서버나 네트워크가 필요 없습니다.
+AppTest는 실행 중 프로세스 전역 상태를 바꾸기 때문에 조사자마다 별도 프로세스에서 동시에 실행합니다.
+각 조사자는 임시 디렉토리에서 실행되어 saved_sessions를 건드리지 않습니다.
+
+조사자 흐름 (단계마다 다시 실행 1회 이상):
+    시작화면 → 현장 선택 → 체크리스트 업로드/적용 → 작업조건 편집 → 원인분석 항목 추가
+    → 증상조사/개선계획 확인 → 저장/내보내기
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _rss_mb():
+    """프로세스 최대 RSS (MB, Linux 기준 ru_maxrss는 KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(at, timings, step):
+    started = time.perf_counter()
+    at.run()
+    timings.append((step, time.perf_counter() - started))
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].value}")
+
+
+def _session_bytes(at):
+    """세션이 따로 차지하는 메모리 (다른 세션과 공유하는 표 제외)"""
+    import metrics
+    state = at.session_state
+    report = metrics.session_memory_report({key: state[key] for key in state._state.filtered_state})
+    return sum(row["크기"] for row in report if not row["공유"])
+
+
+def simulate_user(user_id, rounds, scale, seed):
+    """조사자 한 명의 흐름을 실행하고 (단계별 시간 목록, 메모리 정보) 반환 - 자식 프로세스에서 실행"""
+    sys.path.insert(0, APP_DIR)
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix=f"wmsd_load_{user_id}_", ignore_cleanup_errors=True) as workdir:
+        os.chdir(workdir)
+        try:
+            return _user_flow(user_id, rounds, scale, seed)
+        finally:
+            os.chdir(APP_DIR)
+
+
+def _user_flow(user_id, rounds, scale, seed):
+    from io import BytesIO
+    from streamlit.testing.v1 import AppTest
+    from synthetic_data import generate_checklist
+
+    companies, teams, tasks, units = scale
+    checklist = generate_checklist(companies, teams, tasks, units, seed=seed + user_id)
+    buffer = BytesIO()
+    checklist.to_excel(buffer, sheet_name="체크리스트", index=False)
+    upload_bytes = buffer.getvalue()
+    회사 = checklist["회사명"].iloc[0]
+    작업명_목록 = checklist["작업명"].drop_duplicates().tolist()
+    rss_before = _rss_mb()
+
+    timings = []
+    at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=120)
+    _run(at, timings, "시작화면")
+
+    # 사용자마다 다른 현장 (세션 파일이 겹치지 않도록)
+    at.sidebar.selectbox[0].set_value("신규 현장 추가")
+    _run(at, timings, "현장 선택")
+    at.sidebar.text_input(key="새현장명").input(f"부하테스트현장{user_id}")
+    _run(at, timings, "현장 선택")
+
+    for round_no in range(rounds):
+        at.radio(key="active_tab").set_value("근골격계 부담작업 체크리스트")
+        _run(at, timings, "탭 이동")
+        uploader = at.file_uploader[0]
+        if round_no:
+            uploader.clear()
+        uploader.upload("checklist.xlsx", upload_bytes)
+        _run(at, timings, "체크리스트 업로드")
+        [button for button in at.button if button.label == "✅ 데이터 적용하기"][0].click()
+        _run(at, timings, "체크리스트 적용")
+
+        at.radio(key="active_tab").set_value("작업조건조사")
+        _run(at, timings, "탭 이동")
+        at.selectbox(key="작업조건_회사명").set_value(회사)
+        _run(at, timings, "작업 선택")
+        for 작업명 in 작업명_목록[:3]:
+            at.selectbox(key="작업조건_작업명").set_value(작업명)
+            _run(at, timings, "작업 선택")
+
+            # data_editor는 AppTest로 직접 편집할 수 없어 편집 결과를 세션 상태에 넣고 다시 실행
+            key = f"작업조건_data_{작업명}"
+            if key in at.session_state:
+                edited = at.session_state[key].copy()
+                edited["작업부하(A)"] = "힘듦(4)"
+                edited["작업빈도(B)"] = "자주(3)"
+                at.session_state[key] = edited
+                # 편집기가 바뀐 내용에서 다시 시작하도록 기준 데이터 제거
+                del at.session_state[f"작업조건_편집기준_{작업명}"]
+            _run(at, timings, "작업조건 편집")
+
+            at.button(key=f"add_hazard_analysis_{작업명}").click()
+            _run(at, timings, "원인분석 항목 추가")
+            at.button(key=f"add_hazard_analysis_{작업명}").click()
+            _run(at, timings, "원인분석 항목 추가")
+
+        for tab in ("증상조사 분석", "작업환경개선계획서"):
+            at.radio(key="active_tab").set_value(tab)
+            _run(at, timings, "탭 이동")
+
+        [button for button in at.sidebar.button if button.label == "💾 현재 상태 저장"][0].click()
+        _run(at, timings, "저장")
+        [button for button in at.sidebar.button if button.label == "📋 엑셀"][0].click()
+        _run(at, timings, "내보내기")
+
+    # 내보내기 작업이 끝날 때까지 대기 (작업 디렉토리를 벗어난 뒤 파일을 쓰지 않도록)
+    import export_jobs
+    while any(job["status"] in ("queued", "running") for job in export_jobs.list_jobs(at.session_state["session_id"])):
+        time.sleep(0.05)
+
+    return {
+        "user": user_id,
+        "timings": timings,
+        "session_bytes": _session_bytes(at),
+        "rss_growth_mb": _rss_mb() - rss_before,
+        "rss_peak_mb": _rss_mb(),
+    }
+
+
+def _percentile(values, q):
+    """최근접 순위 백분위수"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(results):
+    """단계별/전체 지연 백분위수(ms)와 조사자별 메모리 요약"""
+    by_step = {}
+    for result in results:
+        for step, seconds in result["timings"]:
+            by_step.setdefault(step, []).append(seconds * 1000)
+    all_ms = [ms for values in by_step.values() for ms in values]
+    rows = []
+    for step, values in list(by_step.items()) + [("전체", all_ms)]:
+        rows.append({
+            "단계": step, "횟수": len(values),
+            "p50": _percentile(values, 50), "p95": _percentile(values, 95),
+            "p99": _percentile(values, 99), "최대": max(values, default=0.0),
+        })
+    memory = [{
+        "조사자": result["user"],
+        "세션 상태(MB)": result["session_bytes"] / 1024 / 1024,
+        "RSS 증가(MB)": result["rss_growth_mb"],
+        "최대 RSS(MB)": result["rss_peak_mb"],
+    } for result in results]
+    return rows, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 부하 테스트")
+    parser.add_argument("--users", type=int, default=4, help="동시 조사자 수")
+    parser.add_argument("--rounds", type=int, default=1, help="조사자마다 흐름 반복 횟수")
+    parser.add_argument("--companies", type=int, default=1)
+    parser.add_argument("--teams", type=int, default=2)
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--units", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    scale = (args.companies, args.teams, args.tasks, args.units)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.users) as executor:
+        futures = [executor.submit(simulate_user, user_id, args.rounds, scale, args.seed)
+                   for user_id in range(args.users)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    rows, memory = summarize(results)
+    print(f"조사자 {args.users}명 × {args.rounds}회, 체크리스트 {'×'.join(map(str, scale))}행 구성, 총 {elapsed:.1f}초")
+    print()
+    print(f"  {'단계':<16} {'횟수':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'최대(ms)':>9}")
+    for row in rows:
+        print(f"  {row['단계']:<16} {row['횟수']:>5} {row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f} {row['최대']:>9.1f}")
+    print()
+    print(f"  {'조사자':<6} {'세션 상태(MB)':>14} {'RSS 증가(MB)':>13} {'최대 RSS(MB)':>13}")
+    for item in memory:
+        print(f"  {item['조사자']:<6} {item['세션 상태(MB)']:>14.2f} {item['RSS 증가(MB)']:>13.1f} {item['최대 RSS(MB)']:>13.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump({"users": args.users, "rounds": args.rounds, "scale": scale, "elapsed": elapsed,
+                       "latency_ms": rows, "memory": memory}, fp, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
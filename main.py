@@ -1,50 +1,75 @@
 import streamlit as st  # <-- 이 라인이 누락되어 오류가 발생했습니다.
 from datetime import datetime
 import time
-import pandas as pd
 import os
+from importlib import import_module
 
 # 페이지 설정 (반드시 코드의 맨 처음에 위치해야 합니다)
 st.set_page_config(layout="wide", page_title="근골격계 유해요인조사")
 
-# 모듈 임포트
-from utils import auto_save, get_saved_sessions, SAVE_DIR
-from data_manager import save_to_excel, load_from_excel
-from tab1_overview import render_overview_tab
-from tab2_checklist import render_checklist_tab
-from tab3_hazard_investigation import render_hazard_investigation_tab
-from tab4_work_conditions import render_work_conditions_tab
-from tab5_detailed_investigation import render_detailed_investigation_tab
-from tab6_symptom_analysis import render_symptom_analysis_tab
-from tab7_improvement_plan import render_improvement_plan_tab
+# 모듈 임포트 (pandas, 데이터 관리, 각 탭 모듈은 실제로 필요할 때 불러옴)
+from utils import auto_save, get_saved_sessions, sync_widget_state
+from wmsd_core.storage import SAVE_DIR
+import profiler
+import metrics
 
-# 세션 상태 초기화
-if "checklist_df" not in st.session_state:
-    st.session_state["checklist_df"] = pd.DataFrame()
+import session_spill
 
+# 쉬는 동안 디스크로 내보낸 값이 있으면 다른 코드가 읽기 전에 되돌림
+session_spill.rehydrate()
+profiler.count_rerun()
+# 운영 지표: 실행 횟수/세션 메모리 기록, 지표 파일 갱신, (설정 시) 로컬 지표 서버 시작
+metrics.track_session()
+metrics.write_textfile()
+metrics.start_http_server()
+# 오래 쉬는 세션의 큰 값을 디스크로 내보내는 정리 스레드 (한 번만 시작)
+session_spill.start()
+
+# 세션 상태 초기화
 if "workplace" not in st.session_state:
     st.session_state["workplace"] = None
 
 if "session_id" not in st.session_state:
     st.session_state["session_id"] = None
 
+# 다른 탭에 있는 동안 지워진 위젯 값 복원 (저장/보고서에서 읽을 수 있도록)
+sync_widget_state()
+
 # 사이드바 - 데이터 관리
 with st.sidebar:
     st.title("📊 데이터 관리")
     
     # 작업현장 선택/입력
     st.markdown("### 🏭 작업현장 선택")
-    # 예시 현장 목록 (필요시 수정 또는 데이터베이스 연동)
-    작업현장_옵션 = ["현장 선택...", "A사업장", "B사업장", "C사업장", "신규 현장 추가"]
-    선택된_현장 = st.selectbox("작업현장", 작업현장_옵션)
+    # 현장 등록부에서 앞부분으로 검색 (현장이 많아도 선택 목록은 검색 결과만큼만)
+    import site_registry
+    현장_검색 = st.text_input("현장 검색", key="현장_검색", placeholder="현장명 앞부분 입력")
+    검색_결과 = site_registry.search_sites(현장_검색)
+    현재_현장 = st.session_state.get("workplace")
+    if 현재_현장 and 현재_현장 not in 검색_결과:
+        검색_결과.insert(0, 현재_현장)
+    작업현장_옵션 = ["현장 선택..."] + 검색_결과 + ["신규 현장 추가"]
+    # 검색어가 바뀌어 선택지가 달라져도 고른 현장이 남아 있으면 그대로 유지 (없으면 현재 현장으로)
+    if st.session_state.get("작업현장_선택") not in 작업현장_옵션:
+        st.session_state["작업현장_선택"] = 현재_현장 or "현장 선택..."
+    선택된_현장 = st.selectbox("작업현장", 작업현장_옵션, key="작업현장_선택")
+    if len(검색_결과) >= site_registry.SEARCH_LIMIT:
+        st.caption(f"검색 결과가 많아 {site_registry.SEARCH_LIMIT}개만 표시합니다. 현장명을 더 입력하세요.")
     
     if 선택된_현장 == "신규 현장 추가":
-        새현장명 = st.text_input("새 현장명 입력")
-        if 새현장명:
+        새현장명 = st.text_input("새 현장명 입력", key="새현장명")
+        # 현장이 바뀔 때만 새로고침 (매번 새로고침하면 무한히 다시 실행됨)
+        if 새현장명 and st.session_state.get("workplace") != 새현장명:
+            site_registry.register_site(새현장명)
+            # 이전 현장의 소재지/업종/수행기관이 새 현장 정보로 등록되지 않도록 비움
+            site_registry.apply_site_overview(st.session_state, 새현장명, overwrite=bool(현재_현장))
             st.session_state["workplace"] = 새현장명
             st.session_state["session_id"] = f"{새현장명}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             st.rerun() # 새 현장명 적용을 위해 새로고침
     elif 선택된_현장 != "현장 선택...":
+        if 선택된_현장 != 현재_현장:
+            # 등록부에 있는 현장 정보로 사업장개요 칸 채우기 (다른 현장에서 바꾼 경우 이전 현장의 값은 덮어씀)
+            site_registry.apply_site_overview(st.session_state, 선택된_현장, overwrite=bool(현재_현장))
         st.session_state["workplace"] = 선택된_현장
         if not st.session_state.get("session_id") or 선택된_현장 not in st.session_state.get("session_id", ""):
             st.session_state["session_id"] = f"{선택된_현장}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -58,6 +83,8 @@ with st.sidebar:
         last_save = st.session_state["last_successful_save"]
         save_count = st.session_state.get("save_count", 0)
         st.success(f"✅ 마지막 자동저장: {last_save.strftime('%H:%M:%S')} (총 {save_count}회)")
+    if st.session_state.get("save_error"):
+        st.error(f"⚠️ 자동 저장 실패: {st.session_state['save_error']}")
     
     st.markdown("---")
     st.markdown("### 📥 데이터 내보내기")
@@ -65,6 +92,7 @@ with st.sidebar:
     # 수동 저장 버튼
     if st.button("💾 현재 상태 저장", use_container_width=True):
         if st.session_state.get("session_id") and st.session_state.get("workplace"):
+            from data_manager import save_to_excel
             success, result = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"))
             if success:
                 st.success(f"✅ 현재 상태가 서버에 저장되었습니다!")
@@ -74,26 +102,21 @@ with st.sidebar:
         else:
             st.warning("먼저 작업현장을 선택해주세요!")
 
-    # 다운로드 버튼
+    # 내보내기 작업 (백그라운드 실행, 다시 실행되어도 결과 유지)
     if st.session_state.get("session_id") and st.session_state.get("workplace"):
-        success, filepath = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"))
-        if success:
-            with open(filepath, "rb") as fp:
-                st.download_button(
-                    label="📋 전체 결과 다운로드",
-                    data=fp,
-                    file_name=f"{st.session_state.get('workplace', '결과')}_유해요인조사.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
-        else:
-            st.error("다운로드 파일 생성에 실패했습니다.")
+        from export_jobs import render_export_jobs_panel
+        render_export_jobs_panel()
+
+        # 같은 현장의 다른 조사자와 작업별로 나눠 저장/받기
+        from workspace import render_workspace_panel
+        render_workspace_panel()
     
     # 저장된 세션 목록
     st.markdown("---")
     st.markdown("### 📂 저장된 세션 불러오기")
     
-    saved_sessions = get_saved_sessions()
+    # 현장을 고른 뒤에는 그 현장의 세션만 (등록부 인덱스로 조회)
+    saved_sessions = site_registry.site_sessions(st.session_state["workplace"]) if st.session_state.get("workplace") else get_saved_sessions()
     if saved_sessions:
         selected_session = st.selectbox(
             "불러올 세션 선택",
@@ -106,6 +129,7 @@ with st.sidebar:
             session_info = saved_sessions[session_idx]
             filepath = os.path.join(SAVE_DIR, session_info["filename"])
             
+            from data_manager import load_from_excel
             if load_from_excel(filepath):
                 st.success("✅ 세션을 성공적으로 불러왔습니다!")
                 st.rerun()
@@ -114,6 +138,9 @@ with st.sidebar:
     else:
         st.info("저장된 세션이 없습니다.")
 
+    # 성능 측정 패널 (WMSD_PROFILE=1 일 때만 표시)
+    profiler.render_profiler_panel()
+
 # 자동 저장 실행
 if st.session_state.get("session_id") and st.session_state.get("workplace"):
     auto_save()
@@ -123,41 +150,46 @@ if not st.session_state.get("workplace"):
     st.warning("⚠️ 먼저 사이드바에서 작업현장을 선택하거나 입력해주세요!")
     st.stop()
 
-# 메인 화면 시작
-st.title(f"근골격계 유해요인조사 - {st.session_state.get('workplace', '')}")
-
-# 탭 정의
-tabs = st.tabs([
-    "사업장개요",
-    "근골격계 부담작업 체크리스트",
-    "유해요인조사표",
-    "작업조건조사",
-    "정밀조사",
-    "증상조사 분석",
-    "작업환경개선계획서"
-])
-
-# 각 탭 렌더링
-with tabs[0]:
-    render_overview_tab()
-
-with tabs[1]:
-    render_checklist_tab()
-
-with tabs[2]:
-    render_hazard_investigation_tab()
-
-with tabs[3]:
-    render_work_conditions_tab()
+if "checklist_df" not in st.session_state:
+    import pandas as pd
+    st.session_state["checklist_df"] = pd.DataFrame()
 
-with tabs[4]:
-    render_detailed_investigation_tab()
+# 체크리스트에서 빠진 작업의 입력값/위젯 상태 정리 (체크리스트가 바뀐 실행에서만 검사)
+from wmsd_core.work_model import collect_orphaned_tasks
+정리_결과 = collect_orphaned_tasks(st.session_state)
+if 정리_결과 and 정리_결과[1]:
+    정리된_작업, 정리된_키, 정리된_크기 = 정리_결과
+    metrics.record_purge(정리된_키, 정리된_크기)
+    st.toast(f"🧹 체크리스트에서 빠진 작업 {len(정리된_작업)}개의 입력값 {정리된_키}개를 정리했습니다 ({정리된_크기 / 1024:,.1f} KB)")
 
-with tabs[5]:
-    render_symptom_analysis_tab()
+# 메인 화면 시작
+st.title(f"근골격계 유해요인조사 - {st.session_state.get('workplace', '')}")
 
-with tabs[6]:
-    render_improvement_plan_tab()
+# 탭 정의 - 선택한 탭 하나만 렌더링 (st.tabs는 보이지 않는 탭까지 매번 모두 실행함)
+# (탭 이름, 모듈, 렌더링 함수) - 탭 모듈은 처음 선택될 때 불러옴
+탭_목록 = [
+    ("사업장개요", "tab1_overview", "render_overview_tab"),
+    ("근골격계 부담작업 체크리스트", "tab2_checklist", "render_checklist_tab"),
+    ("유해요인조사표", "tab3_hazard_investigation", "render_hazard_investigation_tab"),
+    ("작업조건조사", "tab4_work_conditions", "render_work_conditions_tab"),
+    ("정밀조사", "tab5_detailed_investigation", "render_detailed_investigation_tab"),
+    ("증상조사 분석", "tab6_symptom_analysis", "render_symptom_analysis_tab"),
+    ("작업환경개선계획서", "tab7_improvement_plan", "render_improvement_plan_tab"),
+]
+탭_렌더링 = {이름: (모듈, 함수) for 이름, 모듈, 함수 in 탭_목록}
+
+선택된_탭 = st.radio(
+    "탭 선택",
+    list(탭_렌더링),
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed"
+)
+
+# 선택된 탭 렌더링
+모듈명, 함수명 = 탭_렌더링[선택된_탭]
+with profiler.span(f"tab:{함수명}"):
+    getattr(import_module(모듈명), 함수명)()
 
 # 푸터
 st.markdown("---")
@@ -168,4 +200,7 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# 정리 스레드가 예산 계산에 쓰는 이 세션의 큰 값 추정치 갱신
+session_spill.finish_run()
\ No newline at end of file
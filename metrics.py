@@ -0,0 +1,273 @@
+import os
+import time
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+from wmsd_core.storage import SAVE_DIR
+from wmsd_core.memory import estimate_bytes as _estimate_bytes, estimate_session_bytes
+
+# 운영 지표 (프로세스 안의 모든 세션 합산) - Prometheus 텍스트 형식으로 내보냄
+#   WMSD_METRICS_FILE: 지표 파일 경로 (node_exporter textfile 수집기 등에서 읽음, 빈 값이면 기록 안 함)
+#   WMSD_METRICS_PORT: 지정하면 127.0.0.1:<port>/metrics 로도 제공
+#   WMSD_METRICS_INTERVAL: 파일 기록 / 세션 메모리 측정 최소 간격(초)
+METRICS_FILE = os.environ.get("WMSD_METRICS_FILE", os.path.join(SAVE_DIR, "metrics.prom"))
+METRICS_PORT = os.environ.get("WMSD_METRICS_PORT", "")
+METRICS_INTERVAL = float(os.environ.get("WMSD_METRICS_INTERVAL", "15"))
+# 세션 메모리 측정 후 이 시간(초) 동안 다시 보이지 않으면 활성 세션에서 제외
+SESSION_IDLE_SECONDS = 600
+
+저장시간_구간 = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+크기_구간 = (16e3, 64e3, 256e3, 1e6, 4e6, 16e6, 64e6, 256e6)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_help = {}
+_session_memory = {}
+_last_written = 0.0
+_save_dir_cache = (0.0, 0, 0)
+_http_started = False
+
+
+def _describe(name, kind, text):
+    _help[name] = (kind, text)
+
+
+_describe("wmsd_reruns_total", "counter", "전체 스크립트 실행 횟수")
+_describe("wmsd_saves_total", "counter", "세션 저장 시도 횟수")
+_describe("wmsd_save_failures_total", "counter", "세션 저장 실패 횟수")
+_describe("wmsd_save_seconds", "histogram", "세션 저장(Excel 기록) 소요 시간")
+_describe("wmsd_loads_total", "counter", "세션 불러오기 횟수")
+_describe("wmsd_load_failures_total", "counter", "세션 불러오기 실패 횟수")
+_describe("wmsd_load_cache_hits_total", "counter", "파싱하지 않고 캐시에서 불러온 횟수")
+_describe("wmsd_session_file_bytes", "histogram", "저장된 세션 파일 크기")
+_describe("wmsd_purged_keys_total", "counter", "체크리스트에서 빠진 작업이라 정리한 세션 키 수")
+_describe("wmsd_purged_bytes_total", "counter", "정리한 세션 키의 메모리 추정치 합계")
+_describe("wmsd_spilled_values_total", "counter", "쉬는 세션에서 디스크로 내보낸 값 수")
+_describe("wmsd_spilled_bytes_total", "counter", "쉬는 세션에서 디스크로 내보낸 값의 메모리 추정치 합계")
+_describe("wmsd_rehydrated_values_total", "counter", "세션이 돌아와 디스크에서 다시 불러온 값 수")
+_describe("wmsd_export_jobs_total", "counter", "내보내기 작업 종료 횟수")
+_describe("wmsd_session_memory_sample_bytes", "histogram", "세션 상태 메모리 추정치 (측정 시점별)")
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    """카운터 증가"""
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[_key(labels)] = series.get(_key(labels), 0) + amount
+
+
+def observe(name, value, buckets=저장시간_구간, **labels):
+    """히스토그램에 값 기록"""
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        hist = series.get(_key(labels))
+        if hist is None:
+            hist = series[_key(labels)] = {"buckets": tuple(buckets), "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+        index = bisect.bisect_left(hist["buckets"], value)
+        if index < len(hist["counts"]):
+            hist["counts"][index] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+
+
+def record_save(seconds, ok, trigger, nbytes=None):
+    """세션 저장 결과 기록 (trigger: auto, manual, upload)"""
+    inc("wmsd_saves_total", trigger=trigger)
+    if not ok:
+        inc("wmsd_save_failures_total", trigger=trigger)
+        return
+    observe("wmsd_save_seconds", seconds, trigger=trigger)
+    if nbytes is not None:
+        observe("wmsd_session_file_bytes", nbytes, buckets=크기_구간)
+
+
+def record_load(ok, cache_hit=False):
+    inc("wmsd_loads_total")
+    if not ok:
+        inc("wmsd_load_failures_total")
+    elif cache_hit:
+        inc("wmsd_load_cache_hits_total")
+
+
+def record_purge(keys, nbytes):
+    """지난 작업의 세션 키 정리 결과 기록"""
+    inc("wmsd_purged_keys_total", keys)
+    inc("wmsd_purged_bytes_total", nbytes)
+
+
+def record_spill(count, nbytes):
+    """쉬는 세션의 값을 디스크로 내보낸 결과 기록"""
+    inc("wmsd_spilled_values_total", count)
+    inc("wmsd_spilled_bytes_total", nbytes)
+
+
+def record_rehydrate(count):
+    inc("wmsd_rehydrated_values_total", count)
+
+
+def session_memory_report(state):
+    """세션 상태 항목별 메모리 [{키, 종류, 크기, 공유}] - 큰 항목부터
+
+    공유는 다른 세션과 데이터를 같이 쓰는 표(frame_store)로, 세션마다 따로 차지하지 않습니다.
+    """
+    import frame_store
+    rows = []
+    for key in list(state.keys()):
+        try:
+            value = state[key]
+        except KeyError:
+            continue
+        공유 = hasattr(value, "columns") and frame_store.is_shared(value)
+        rows.append({"키": str(key), "종류": type(value).__name__, "크기": _estimate_bytes(value), "공유": 공유})
+    rows.sort(key=lambda row: row["크기"], reverse=True)
+    return rows
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def track_session():
+    """전체 실행마다 호출 - 실행 횟수와 (간격마다) 세션 메모리를 기록"""
+    inc("wmsd_reruns_total")
+    sid = _session_id()
+    if sid is None:
+        return
+    now = time.time()
+    with _lock:
+        previous = _session_memory.get(sid)
+        if previous is not None and now - previous[0] < METRICS_INTERVAL:
+            _session_memory[sid] = (previous[0], previous[1], now)
+            return
+    nbytes = estimate_session_bytes(st.session_state)
+    with _lock:
+        _session_memory[sid] = (now, nbytes, now)
+    observe("wmsd_session_memory_sample_bytes", nbytes, buckets=크기_구간)
+
+
+def _save_dir_usage():
+    """SAVE_DIR 전체 파일 수와 크기 (간격마다 한 번만 다시 계산)"""
+    global _save_dir_cache
+    checked, files, nbytes = _save_dir_cache
+    if time.time() - checked < METRICS_INTERVAL:
+        return files, nbytes
+    files = nbytes = 0
+    for root, _, filenames in os.walk(SAVE_DIR):
+        for filename in filenames:
+            try:
+                nbytes += os.path.getsize(os.path.join(root, filename))
+                files += 1
+            except OSError:
+                continue
+    _save_dir_cache = (time.time(), files, nbytes)
+    return files, nbytes
+
+
+def _labels_text(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def render_prometheus():
+    """Prometheus 텍스트 형식 문자열"""
+    now = time.time()
+    lines = []
+    with _lock:
+        for name in sorted(_counters):
+            kind, text = _help.get(name, ("counter", name))
+            lines += [f"# HELP {name} {text}", f"# TYPE {name} counter"]
+            for labels, value in sorted(_counters[name].items()):
+                lines.append(f"{name}{_labels_text(labels)} {value}")
+        for name in sorted(_histograms):
+            kind, text = _help.get(name, ("histogram", name))
+            lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+            for labels, hist in sorted(_histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(hist["buckets"], hist["counts"]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{_labels_text(labels, [('le', '+Inf')])} {hist['count']}")
+                lines.append(f"{name}_sum{_labels_text(labels)} {hist['sum']}")
+                lines.append(f"{name}_count{_labels_text(labels)} {hist['count']}")
+
+        # 최근에 실행된 세션만 활성으로 집계
+        for sid in [sid for sid, (_, _, seen) in _session_memory.items() if now - seen > SESSION_IDLE_SECONDS]:
+            del _session_memory[sid]
+        sizes = [nbytes for _, nbytes, _ in _session_memory.values()]
+
+    files, nbytes = _save_dir_usage()
+    gauges = [
+        ("wmsd_sessions_active", "최근 실행된 세션 수", len(sizes)),
+        ("wmsd_session_memory_bytes", "활성 세션 상태 메모리 추정치 합계", sum(sizes)),
+        ("wmsd_session_memory_bytes_max", "활성 세션 중 가장 큰 세션 상태 메모리 추정치", max(sizes, default=0)),
+        ("wmsd_save_dir_bytes", "저장 디렉토리 전체 크기", nbytes),
+        ("wmsd_save_dir_files", "저장 디렉토리 파일 수", files),
+    ]
+    for name, text, value in gauges:
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(force=False):
+    """지표 파일 기록 (간격마다 한 번, 임시 파일에 쓴 뒤 교체)"""
+    global _last_written
+    if not METRICS_FILE:
+        return
+    now = time.time()
+    if not force and now - _last_written < METRICS_INTERVAL:
+        return
+    _last_written = now
+    try:
+        os.makedirs(os.path.dirname(METRICS_FILE) or ".", exist_ok=True)
+        tmp_path = f"{METRICS_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            fp.write(render_prometheus())
+        os.replace(tmp_path, METRICS_FILE)
+    except OSError:
+        # 지표 기록 실패가 앱 동작을 막지 않도록 무시
+        pass
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("/metrics", ""):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server():
+    """WMSD_METRICS_PORT가 있으면 로컬 지표 서버를 한 번만 시작"""
+    global _http_started
+    if not METRICS_PORT or _http_started:
+        return
+    with _lock:
+        if _http_started:
+            return
+        _http_started = True
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), _MetricsHandler)
+    except (OSError, ValueError):
+        # 포트를 쓸 수 없으면 파일 기록만 사용
+        return
+    threading.Thread(target=server.serve_forever, name="wmsd-metrics", daemon=True).start()
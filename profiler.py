@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import threading
+from functools import wraps
+from collections import deque, defaultdict
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+# 기본은 꺼짐 - WMSD_PROFILE=1 로 실행하면 구간별 시간 측정과 사이드바 디버그 패널 사용
+ENABLED = os.environ.get("WMSD_PROFILE", "").strip() not in ("", "0", "false", "False")
+# 보관할 최대 이벤트 수 (오래된 것부터 버림)
+MAX_EVENTS = int(os.environ.get("WMSD_PROFILE_EVENTS", "20000"))
+
+_events = deque(maxlen=MAX_EVENTS)
+_lock = threading.Lock()
+_rerun_counts = defaultdict(int)
+_origin = time.perf_counter()
+_꺼짐 = nullcontext()
+
+
+def _run_ctx():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    try:
+        return get_script_run_ctx(suppress_warning=True)
+    except TypeError:
+        # 구버전 Streamlit은 suppress_warning 인자가 없음
+        return get_script_run_ctx()
+
+
+def _session_id():
+    """현재 스크립트 실행의 세션 ID (백그라운드 스레드면 'background')"""
+    ctx = _run_ctx()
+    return ctx.session_id if ctx is not None else "background"
+
+
+def _now_us():
+    return (time.perf_counter() - _origin) * 1e6
+
+
+def _record(event):
+    with _lock:
+        _events.append(event)
+
+
+@contextmanager
+def _span(name, category, args):
+    started = _now_us()
+    try:
+        yield args
+    finally:
+        _record({
+            "name": name, "cat": category, "ph": "X",
+            "ts": started, "dur": _now_us() - started,
+            "tid": threading.get_ident(), "sid": _session_id(), "args": args,
+        })
+
+
+def span(name, category="render", **args):
+    """구간 시간 측정 (with profiler.span("이름"): ...). 꺼져 있으면 아무 일도 하지 않음
+
+    with 블록에서 받은 dict에 값을 넣으면 (예: 크기) 이벤트 인자로 함께 기록됩니다.
+    """
+    if not ENABLED:
+        return _꺼짐
+    return _span(name, category, args)
+
+
+def timed(name=None, category="render"):
+    """함수 실행 시간을 측정하는 데코레이터 (꺼져 있으면 원래 함수를 그대로 반환)"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__name__
+
+        # wraps로 __module__/__qualname__을 유지해야 st.fragment가 함수별로 구분함
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _span(label, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def track_fragment(func):
+    """fragment 함수의 실행 시간과 부분 실행 횟수를 기록하는 데코레이터"""
+    if not ENABLED:
+        return func
+    label = f"fragment:{func.__name__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # 전체 실행 중 함께 그려진 경우는 부분 실행 횟수에 넣지 않음
+        if getattr(_run_ctx(), "fragment_ids_this_run", None):
+            count_rerun(label)
+        with _span(label, "fragment", {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_size(name, nbytes, category="io"):
+    """데이터 크기(bytes) 기록 - 추적 파일에서는 카운터로 표시"""
+    if not ENABLED:
+        return
+    _record({
+        "name": name, "cat": category, "ph": "C", "ts": _now_us(),
+        "tid": threading.get_ident(), "sid": _session_id(), "args": {"bytes": int(nbytes)},
+    })
+
+
+def count_rerun(kind="script"):
+    """다시 실행 횟수 기록 (kind: 'script' 전체 실행, 'fragment:<이름>' 부분 실행)"""
+    if not ENABLED:
+        return
+    sid = _session_id()
+    with _lock:
+        _rerun_counts[(sid, kind)] += 1
+    _record({"name": kind, "cat": "rerun", "ph": "i", "s": "t", "ts": _now_us(),
+             "tid": threading.get_ident(), "sid": sid, "args": {}})
+
+
+def events(session_id=None):
+    """기록된 이벤트 목록 (session_id를 주면 해당 세션과 백그라운드 이벤트만)"""
+    with _lock:
+        snapshot = list(_events)
+    if session_id is None:
+        return snapshot
+    return [e for e in snapshot if e["sid"] in (session_id, "background")]
+
+
+def rerun_counts(session_id):
+    """세션의 다시 실행 횟수 {종류: 횟수}"""
+    with _lock:
+        return {kind: n for (sid, kind), n in _rerun_counts.items() if sid == session_id}
+
+
+def clear():
+    """기록 초기화"""
+    with _lock:
+        _events.clear()
+        _rerun_counts.clear()
+
+
+def summarize(event_list):
+    """구간 이벤트를 이름별로 집계 (횟수, 합계/평균/최대 ms, 최근 크기)"""
+    import pandas as pd
+    rows = {}
+    for e in event_list:
+        if e["ph"] == "X":
+            row = rows.setdefault(e["name"], {"구간": e["name"], "분류": e["cat"], "횟수": 0,
+                                             "합계(ms)": 0.0, "최대(ms)": 0.0, "크기(KB)": None})
+            ms = e["dur"] / 1000
+            row["횟수"] += 1
+            row["합계(ms)"] += ms
+            row["최대(ms)"] = max(row["최대(ms)"], ms)
+            if "bytes" in e["args"]:
+                row["크기(KB)"] = e["args"]["bytes"] / 1024
+        elif e["ph"] == "C":
+            row = rows.setdefault(e["name"], {"구간": e["name"], "분류": e["cat"], "횟수": 0,
+                                             "합계(ms)": 0.0, "최대(ms)": 0.0, "크기(KB)": None})
+            row["크기(KB)"] = e["args"]["bytes"] / 1024
+    df = pd.DataFrame(list(rows.values()), columns=["구간", "분류", "횟수", "합계(ms)", "평균(ms)", "최대(ms)", "크기(KB)"])
+    if not df.empty:
+        df["평균(ms)"] = df["합계(ms)"] / df["횟수"].where(df["횟수"] > 0)
+        df = df.sort_values("합계(ms)", ascending=False)
+    return df.round(1)
+
+
+def chrome_trace(event_list):
+    """Chrome 추적 형식(JSON) bytes - chrome://tracing 또는 Perfetto에서 열 수 있음"""
+    sessions = {}
+    trace = []
+    for e in event_list:
+        pid = sessions.setdefault(e["sid"], len(sessions) + 1)
+        item = {k: v for k, v in e.items() if k != "sid"}
+        item["pid"] = pid
+        trace.append(item)
+    for sid, pid in sessions.items():
+        trace.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"session {sid}"}})
+    return json.dumps({"traceEvents": trace, "displayTimeUnit": "ms"}, ensure_ascii=False).encode("utf-8")
+
+
+def render_profiler_panel():
+    """사이드바 디버그 패널 (WMSD_PROFILE이 켜져 있을 때만 표시)"""
+    if not ENABLED:
+        return
+    sid = _session_id()
+    with st.expander("🐞 성능 측정", expanded=False):
+        counts = rerun_counts(sid)
+        전체 = counts.get("script", 0)
+        부분 = sum(n for kind, n in counts.items() if kind != "script")
+        st.caption(f"전체 실행 {전체}회 · 부분 실행 {부분}회 · 이벤트 {len(_events):,}개")
+
+        session_events = events(sid)
+        summary = summarize(session_events)
+        if summary.empty:
+            st.info("아직 측정된 구간이 없습니다.")
+        else:
+            st.dataframe(summary, use_container_width=True, hide_index=True)
+
+        # 세션 상태 항목별 메모리 (공유 표는 여러 세션이 한 벌을 같이 씀)
+        import metrics
+        import frame_store
+        report = metrics.session_memory_report(st.session_state)
+        개별 = sum(row["크기"] for row in report if not row["공유"])
+        공유 = sum(row["크기"] for row in report if row["공유"])
+        공유_표, 공유_크기 = frame_store.stats()
+        st.caption(f"세션 메모리 {개별 / 1024:,.0f} KB (공유 표 {공유 / 1024:,.0f} KB 별도) · "
+                   f"프로세스 공유 표 {공유_표}개 {공유_크기 / 1024:,.0f} KB")
+        if report:
+            st.dataframe(report[:50], use_container_width=True, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📥 추적 파일",
+                data=chrome_trace(session_events),
+                file_name=f"wmsd_trace_{time.strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                use_container_width=True,
+                key="profiler_trace_download"
+            )
+        with col2:
+            if st.button("🧹 초기화", use_container_width=True, key="profiler_clear"):
+                clear()
+                st.rerun()
@@ -0,0 +1,125 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils import hash_content
+from wmsd_core.storage import SAVE_DIR
+import profiler
+from report_engine import build_report_pdf, report_input_keys, report_date
+
+# 보고서 양식이 바뀌면 올려서 이전 캐시를 무효화
+REPORT_FORMAT_VERSION = 1
+
+# 캐시 크기 제한 (환경변수로 조정 가능)
+MEMORY_CACHE_BYTES = int(os.environ.get("WMSD_REPORT_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+DISK_CACHE_BYTES = int(os.environ.get("WMSD_REPORT_CACHE_DISK_MB", "512")) * 1024 * 1024
+REPORT_CACHE_DIR = os.path.join(SAVE_DIR, "report_cache")
+
+# 프로세스 전체에서 공유하는 메모리 캐시 (해시 -> PDF bytes, 오래 안 쓴 순서)
+_memory_cache = OrderedDict()
+_memory_bytes = 0
+_lock = threading.Lock()
+
+
+def report_cache_key(state, 작성일):
+    """보고서가 참조하는 입력값과 작성일의 해시 (입력과 작성일이 같으면 같은 키)"""
+    hasher = hashlib.sha256(f"report-v{REPORT_FORMAT_VERSION}\0{작성일}".encode())
+    for key in report_input_keys(state):
+        hasher.update(key.encode())
+        hasher.update(b"\0")
+        hash_content(hasher, state.get(key))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _remember(key, pdf_bytes):
+    """메모리 캐시에 저장하고 용량을 넘으면 오래된 항목부터 제거"""
+    global _memory_bytes
+    with _lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return
+        _memory_cache[key] = pdf_bytes
+        _memory_bytes += len(pdf_bytes)
+        while _memory_bytes > MEMORY_CACHE_BYTES and len(_memory_cache) > 1:
+            _, evicted = _memory_cache.popitem(last=False)
+            _memory_bytes -= len(evicted)
+
+
+def _disk_path(key):
+    return os.path.join(REPORT_CACHE_DIR, f"{key}.pdf")
+
+
+def _evict_disk():
+    """디스크 캐시가 용량을 넘으면 오래 사용하지 않은 파일부터 삭제"""
+    entries = []
+    for filename in os.listdir(REPORT_CACHE_DIR):
+        if filename.endswith(".pdf"):
+            try:
+                stat = os.stat(os.path.join(REPORT_CACHE_DIR, filename))
+                entries.append((stat.st_mtime, stat.st_size, filename))
+            except OSError:
+                continue
+    total = sum(size for _, size, _ in entries)
+    for _, size, filename in sorted(entries):
+        if total <= DISK_CACHE_BYTES:
+            break
+        try:
+            os.remove(os.path.join(REPORT_CACHE_DIR, filename))
+            total -= size
+        except OSError:
+            continue
+
+
+def _store_disk(key, pdf_bytes):
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{_disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(pdf_bytes)
+    os.replace(tmp_path, _disk_path(key))
+    _evict_disk()
+
+
+def get_cached_report(key):
+    """캐시된 보고서 bytes 반환 (메모리 -> 디스크 순으로 확인, 없으면 None)"""
+    with _lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+
+    path = _disk_path(key)
+    try:
+        with open(path, "rb") as fp:
+            pdf_bytes = fp.read()
+        # 최근 사용 시각 갱신 (디스크 캐시 제거 순서에 사용)
+        os.utime(path, None)
+    except OSError:
+        return None
+    _remember(key, pdf_bytes)
+    return pdf_bytes
+
+
+def get_or_build_report(state):
+    """입력이 바뀌지 않았으면 캐시된 보고서를, 아니면 새로 생성한 보고서를 반환합니다.
+
+    반환값은 (PDF bytes, 캐시 키, 캐시 사용 여부)입니다.
+    """
+    # 작성일이 PDF에 찍히므로 키에 포함 (날짜가 바뀌면 전날 만든 보고서를 쓰지 않음)
+    작성일 = report_date()
+    with profiler.span("report_cache_key", "report"):
+        key = report_cache_key(state, 작성일)
+    pdf_bytes = get_cached_report(key)
+    if pdf_bytes is not None:
+        return pdf_bytes, key, True
+
+    with profiler.span("build_report_pdf", "report"):
+        pdf_bytes = build_report_pdf(state, 작성일)
+    profiler.record_size("PDF 보고서", len(pdf_bytes), "report")
+    _remember(key, pdf_bytes)
+    try:
+        _store_disk(key, pdf_bytes)
+    except OSError:
+        # 디스크 캐시 실패는 보고서 생성 결과에 영향을 주지 않음
+        pass
+    return pdf_bytes, key, False
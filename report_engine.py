@@ -0,0 +1,358 @@
+import os
+import re
+from io import BytesIO
+from datetime import datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+import pandas as pd
+
+from wmsd_core.work_model import build_site, hazard_entries, task_names, task_key, 작업조건_키, 원인분석_키
+
+# PDF 관련 imports (선택사항)
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import mm
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer, PageBreak
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+# 한글 TTF 폰트 후보 (WMSD_REPORT_FONT 환경변수로 직접 지정 가능)
+_폰트_후보 = [
+    "NanumGothic.ttf",
+    "fonts/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/Library/Fonts/NanumGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+# TTF 폰트가 없을 때 사용하는 reportlab 내장 한글 CID 폰트
+_내장_한글_폰트 = "HYGothic-Medium"
+
+# 긴 문자열만 Paragraph로 감싸 줄바꿈 (짧은 셀은 문자열 그대로 두어 레이아웃 비용 절감)
+_줄바꿈_기준_길이 = 12
+
+# 표 셀 글자 크기/줄 간격과 여백 (행 높이를 미리 계산할 때도 같은 값 사용)
+_셀_글자_크기 = 8
+_셀_줄_간격 = 12
+_셀_좌우_여백 = 6
+_셀_상하_여백 = 3
+
+개요_항목 = [
+    ("사업장명", "사업장명"), ("소재지", "소재지"), ("업종", "업종"),
+    ("예비조사일", "예비조사"), ("본조사일", "본조사"), ("수행기관", "수행기관"), ("성명", "성명"),
+]
+
+증상조사_표 = [
+    ("기초현황", "기초현황_data"),
+    ("작업기간별 인원현황", "작업기간_data"),
+    ("육체적 부담정도", "육체적부담_data"),
+    ("통증호소자 현황", "통증호소자_data"),
+]
+
+부담작업_컬럼 = [f"부담작업_{i}호" for i in range(1, 13)]
+
+
+@lru_cache(maxsize=None)
+def register_fonts():
+    """한글 폰트를 프로세스당 한 번만 등록하고 폰트 이름을 반환합니다."""
+    후보 = [os.environ.get("WMSD_REPORT_FONT", "")] + _폰트_후보
+    for path in 후보:
+        if path and os.path.exists(path):
+            try:
+                pdfmetrics.registerFont(TTFont("KoreanFont", path))
+                return "KoreanFont"
+            except Exception:
+                continue
+    pdfmetrics.registerFont(UnicodeCIDFont(_내장_한글_폰트))
+    return _내장_한글_폰트
+
+
+@lru_cache(maxsize=None)
+def _styles(font_name):
+    """보고서 문단 스타일 (폰트별로 한 번만 생성)"""
+    base = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            "ReportTitle", parent=base["Heading1"], fontName=font_name,
+            fontSize=22, leading=28, textColor=colors.HexColor("#1f77b4"),
+            spaceAfter=20, alignment=TA_CENTER
+        ),
+        "h1": ParagraphStyle("ReportH1", parent=base["Heading2"], fontName=font_name, fontSize=15, leading=20, spaceBefore=6, spaceAfter=8),
+        "h2": ParagraphStyle("ReportH2", parent=base["Heading3"], fontName=font_name, fontSize=12, leading=16, spaceBefore=10, spaceAfter=4),
+        "body": ParagraphStyle("ReportBody", parent=base["Normal"], fontName=font_name, fontSize=9, leading=13),
+        "cell": ParagraphStyle("ReportCell", parent=base["Normal"], fontName=font_name, fontSize=8, leading=10),
+    }
+
+
+def _cell_text(value):
+    """표 셀 값을 문자열로 변환 (결측값은 빈칸)"""
+    if value is None:
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _row_height(row, col_widths):
+    """표 한 행의 높이 (reportlab이 셀 높이를 재는 방식과 같음)"""
+    height = 0
+    for cell, col_width in zip(row, col_widths):
+        if isinstance(cell, str):
+            cell_height = _셀_줄_간격 * (cell.count("\n") + 1)
+        else:
+            cell_height = cell.wrap(col_width - 2 * _셀_좌우_여백, 72000)[1]
+        height = max(height, cell_height)
+    return height + 2 * _셀_상하_여백
+
+
+def _rows_table(columns, rows, font_name, width, col_weights=None):
+    """행 목록을 머리행이 매 페이지 반복되는 LongTable로 변환합니다."""
+    styles = _styles(font_name)
+    weights = col_weights or [1] * len(columns)
+    # 열 너비를 고정해 reportlab이 모든 셀의 너비를 측정하지 않도록 함
+    col_widths = [width * w / sum(weights) for w in weights]
+
+    cells = [[str(col) for col in columns]] + [
+        [Paragraph(escape(text), styles["cell"]) if len(text) > _줄바꿈_기준_길이 else text for text in row]
+        for row in rows
+    ]
+    # 행 높이도 미리 넘겨, 표가 페이지마다 나뉠 때 reportlab이 남은 행의 높이를 매번 다시 재지 않도록 함
+    # (높이를 모르면 나눌 때마다 남은 행 전체를 훑어 행 수의 제곱에 비례하는 시간이 걸림)
+    row_heights = [_row_height(row, col_widths) for row in cells]
+
+    table = LongTable(cells, colWidths=col_widths, rowHeights=row_heights, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), font_name),
+        ("FONTSIZE", (0, 0), (-1, -1), _셀_글자_크기),
+        ("LEADING", (0, 0), (-1, -1), _셀_줄_간격),
+        ("LEFTPADDING", (0, 0), (-1, -1), _셀_좌우_여백),
+        ("RIGHTPADDING", (0, 0), (-1, -1), _셀_좌우_여백),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4a5568")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f5f0")]),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("TOPPADDING", (0, 0), (-1, -1), _셀_상하_여백),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), _셀_상하_여백),
+    ]))
+    return table
+
+
+def _table(df, font_name, width, col_weights=None):
+    """DataFrame을 LongTable로 변환 (iterrows 대신 컬럼 단위로 문자열 변환)"""
+    text_columns = [[_cell_text(v) for v in df[col].tolist()] for col in df.columns]
+    return _rows_table(list(df.columns), list(zip(*text_columns)), font_name, width, col_weights)
+
+
+def _non_empty(df):
+    """모든 값이 비어있는 행을 제외"""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    filled = df.astype("string").fillna("").apply(lambda col: col.str.strip() != "")
+    return df.loc[filled.any(axis=1)]
+
+
+_점수_패턴 = re.compile(r"\((\d+)\)")
+
+
+def _score(value):
+    """"힘듦(4)" 형식의 값에서 점수 추출 (작업별 소형 표용)"""
+    match = _점수_패턴.search(value) if isinstance(value, str) else None
+    return int(match.group(1)) if match else 0
+
+
+def _overview_section(state, font_name, width):
+    styles = _styles(font_name)
+    story = [Paragraph("1. 사업장 개요", styles["h1"])]
+    overview = pd.DataFrame({
+        "분류": [label for label, _ in 개요_항목],
+        "내용": [_cell_text(state.get(key, "")) for _, key in 개요_항목],
+    })
+    story.append(_table(overview, font_name, width, [1, 3]))
+    return story
+
+
+def _checklist_section(checklist_df, font_name, width):
+    styles = _styles(font_name)
+    story = [Paragraph("2. 근골격계 부담작업 체크리스트 요약", styles["h1"])]
+    burden_columns = [col for col in 부담작업_컬럼 if col in checklist_df.columns]
+    if checklist_df.empty or not burden_columns:
+        story.append(Paragraph("체크리스트 데이터가 없습니다.", styles["body"]))
+        return story
+
+    values = checklist_df[burden_columns].astype("string")
+    해당 = values.eq("O(해당)")
+    잠재 = values.eq("△(잠재위험)")
+
+    summary = pd.DataFrame({
+        "부담작업": [col.replace("부담작업_", "") for col in burden_columns],
+        "해당(O)": 해당.sum().to_numpy(),
+        "잠재위험(△)": 잠재.sum().to_numpy(),
+    })
+    story.append(Paragraph("부담작업별 해당 건수", styles["h2"]))
+    story.append(_table(summary, font_name, width * 0.6))
+
+    # 단위작업별 해당 호 목록
+    # 행마다 불리언 색인을 하므로 Series 대신 배열 사용 (Series 색인은 행마다 수십 μs)
+    labels = pd.Series([col.replace("부담작업_", "") for col in burden_columns], dtype=object).to_numpy()
+    해당_호 = 해당.to_numpy(dtype=bool, na_value=False)
+    잠재_호 = 잠재.to_numpy(dtype=bool, na_value=False)
+    호_목록 = [
+        ", ".join(list(labels[h]) + [f"{label}(잠재)" for label in labels[p]]) or "미해당"
+        for h, p in zip(해당_호, 잠재_호)
+    ]
+    info_columns = [col for col in ["회사명", "소속", "작업명", "단위작업명"] if col in checklist_df.columns]
+    detail = checklist_df[info_columns].copy()
+    detail["부담작업(호)"] = 호_목록
+    story.append(Paragraph("단위작업별 부담작업", styles["h2"]))
+    story.append(_table(detail, font_name, width, [1] * len(info_columns) + [2]))
+    return story
+
+
+def _task_section(site, font_name, width):
+    styles = _styles(font_name)
+    story = [Paragraph("3. 작업별 작업조건 및 유해요인 평가", styles["h1"])]
+    if not site.작업:
+        story.append(Paragraph("작업 데이터가 없습니다.", styles["body"]))
+        return story
+
+    원인분석_목록 = hazard_entries(site.원인분석)
+    for 번호, (작업명, task) in enumerate(site.작업.items(), start=1):
+        story.append(Paragraph(f"3-{번호}. {escape(작업명)}", styles["h2"]))
+
+        # 작업마다 만드는 소형 표는 DataFrame 생성 비용을 피해 행 목록으로 바로 구성
+        info_rows = [
+            ("작업공정", _cell_text(task.작업공정)),
+            ("작업내용", _cell_text(task.작업내용)),
+            ("근로자수", _cell_text(task.근로자수)),
+            ("조사일시", _cell_text(task.조사일시)),
+            ("조사자", _cell_text(task.조사자)),
+        ]
+        story.append(_rows_table(["항목", "내용"], info_rows, font_name, width, [1, 4]))
+
+        work_cond = task.작업조건
+        if work_cond is not None and not work_cond.empty:
+            columns = list(work_cond.columns)
+            records = work_cond.to_dict("records")
+            if "작업부하(A)" in columns and "작업빈도(B)" in columns:
+                if "총점" not in columns:
+                    columns.append("총점")
+                for record in records:
+                    record["총점"] = _score(record["작업부하(A)"]) * _score(record["작업빈도(B)"])
+            rows = [[_cell_text(record.get(col)) for col in columns] for record in records]
+            story.append(Spacer(1, 4))
+            story.append(_rows_table(columns, rows, font_name, width))
+
+        원인분석 = 원인분석_목록.get(작업명)
+        if 원인분석:
+            columns = ["유형", "부담작업", "부담작업자세"]
+            rows = [[_cell_text(entry.get(col, "")) for col in columns] for entry in 원인분석]
+            rows = [row for row in rows if any(text.strip() for text in row)]
+            if rows:
+                story.append(Spacer(1, 4))
+                story.append(_rows_table(columns, rows, font_name, width, [1, 3, 3]))
+    return story
+
+
+def _symptom_section(state, font_name, width):
+    styles = _styles(font_name)
+    story = [Paragraph("4. 증상조사 분석", styles["h1"])]
+    있음 = False
+    for 제목, key in 증상조사_표:
+        df = state.get(key)
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            story.append(Paragraph(제목, styles["h2"]))
+            story.append(_table(df, font_name, width))
+            있음 = True
+    if not 있음:
+        story.append(Paragraph("증상조사 데이터가 없습니다.", styles["body"]))
+    return story
+
+
+def _improvement_section(state, font_name, width):
+    styles = _styles(font_name)
+    story = [Paragraph("5. 작업환경개선계획", styles["h1"])]
+    개선계획 = _non_empty(state.get("개선계획_data"))
+    if 개선계획.empty:
+        story.append(Paragraph("개선계획 데이터가 없습니다.", styles["body"]))
+    else:
+        story.append(_table(개선계획, font_name, width, [1.2, 1.2, 2, 2, 1, 1, 1, 1.2][:len(개선계획.columns)]))
+    return story
+
+
+def report_input_keys(state):
+    """보고서 내용에 영향을 주는 st.session_state 키 목록 (보고서 캐시 키 계산용)"""
+    keys = [key for _, key in 개요_항목] + ["checklist_df", "개선계획_data"]
+    keys += [key for _, key in 증상조사_표]
+    for 작업명 in task_names(state):
+        keys += [task_key(필드, 작업명) for 필드 in ("작업공정", "작업내용", "근로자수", "조사일시", "조사자")]
+        keys += [작업조건_키.format(작업명), 원인분석_키.format(작업명)]
+    return keys
+
+
+def report_date():
+    """보고서에 찍는 작성일 (오늘 날짜)"""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _draw_page_number(canvas, doc):
+    """페이지 하단에 쪽번호 표시"""
+    canvas.saveState()
+    canvas.setFont(register_fonts(), 8)
+    canvas.drawCentredString(doc.pagesize[0] / 2, 10 * mm, f"- {doc.page} -")
+    canvas.restoreState()
+
+
+def build_report_pdf(state, 작성일=None):
+    """사업장개요부터 개선계획까지 모든 섹션을 담은 PDF 보고서를 생성해 bytes로 반환합니다.
+
+    state는 st.session_state 또는 같은 키를 가진 dict입니다.
+    작성일("YYYY-MM-DD")을 주지 않으면 오늘 날짜를 씁니다.
+    """
+    font_name = register_fonts()
+    styles = _styles(font_name)
+
+    pdf_buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        pdf_buffer, pagesize=landscape(A4),
+        leftMargin=15 * mm, rightMargin=15 * mm, topMargin=15 * mm, bottomMargin=18 * mm,
+        title="근골격계 유해요인조사 보고서"
+    )
+    width = doc.width
+
+    checklist_df = state.get("checklist_df")
+    if not isinstance(checklist_df, pd.DataFrame):
+        checklist_df = pd.DataFrame()
+
+    story = [
+        Paragraph("근골격계 유해요인조사 보고서", styles["title"]),
+        Paragraph(f"작성일: {작성일 or report_date()}", styles["body"]),
+        Spacer(1, 12),
+    ]
+    story += _overview_section(state, font_name, width)
+    story.append(PageBreak())
+    story += _checklist_section(checklist_df, font_name, width)
+    story.append(PageBreak())
+    story += _task_section(build_site(state), font_name, width)
+    story.append(PageBreak())
+    story += _symptom_section(state, font_name, width)
+    story.append(PageBreak())
+    story += _improvement_section(state, font_name, width)
+
+    doc.build(story, onFirstPage=_draw_page_number, onLaterPages=_draw_page_number)
+    return pdf_buffer.getvalue()
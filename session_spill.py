@@ -0,0 +1,247 @@
+import os
+import re
+import time
+import uuid
+import pickle
+import shutil
+import threading
+
+import streamlit as st
+
+from wmsd_core.storage import SAVE_DIR
+import metrics
+
+# 오래 쉬는 세션의 큰 값(체크리스트, 작업조건 표, 사진)을 디스크로 내보내 서버 메모리 절약
+# 정리 스레드가 마지막 실행 뒤 오래 쉰 세션부터 내보내고, 그 세션의 다음 실행 시작 때 되살림
+# (지금 실행 중인 세션은 건드리지 않으며, 각 세션의 상태는 실행할 때 받은 session_state로만 다룸)
+#   WMSD_SPILL_IDLE_MINUTES: 이 시간 동안 실행이 없던 세션을 내보냄 (0이면 사용 안 함)
+#   WMSD_SPILL_BUDGET_MB: 0보다 크면 모든 세션의 큰 값 합계가 이 크기를 넘을 때만, 합계가 이 아래로 내려갈 때까지 내보냄
+#   WMSD_SPILL_MIN_KB: 이 크기보다 작은 값은 그대로 둠
+IDLE_SECONDS = float(os.environ.get("WMSD_SPILL_IDLE_MINUTES", "15")) * 60
+SPILL_BUDGET_BYTES = int(float(os.environ.get("WMSD_SPILL_BUDGET_MB", "0")) * 1024 * 1024)
+SPILL_MIN_BYTES = int(os.environ.get("WMSD_SPILL_MIN_KB", "64")) * 1024
+SWEEP_INTERVAL_SECONDS = float(os.environ.get("WMSD_SPILL_SWEEP_SECONDS", "60"))
+# 이 시간(초) 동안 실행이 없던 세션은 닫힌 것으로 보고 기록과 디스크 파일을 지움 (닫힘을 알 수 없을 때)
+SESSION_TTL_SECONDS = float(os.environ.get("WMSD_SPILL_SESSION_TTL", "86400"))
+# 프로세스마다 따로 쓰는 디렉토리 (서버가 다시 시작되면 이전 세션은 없으므로 정리)
+SPILL_ROOT = os.path.join(SAVE_DIR, "spill")
+SPILL_DIR = os.path.join(SPILL_ROOT, str(os.getpid()))
+
+# 내보낼 수 있는 데이터 키 (위젯 키는 Streamlit이 관리하므로 제외)
+_대상_키 = re.compile(r"^(checklist_df$|작업조건_data_(?!editor_)|작업조건_편집기준_|사진_\d+_데이터_|정밀_원인분석_data_)")
+
+_sessions = {}         # 세션 ID -> _Session
+_lock = threading.Lock()
+_started = False
+
+
+class SpilledValue:
+    """디스크로 내보낸 세션 값의 자리표시 (다음 실행 시작 때 원래 값으로 바뀜)"""
+    __slots__ = ("path", "nbytes", "type_name")
+
+    def __init__(self, path, nbytes, type_name):
+        self.path = path
+        self.nbytes = nbytes
+        self.type_name = type_name
+
+    def __repr__(self):
+        return f"<디스크 보관 {self.type_name} {self.nbytes / 1024:,.0f} KB>"
+
+
+class _Session:
+    """세션 하나의 기록 - 마지막으로 실행한 session_state, 마지막 실행 시각, 메모리에 있는 큰 값의 추정치"""
+    __slots__ = ("state", "last_active", "nbytes", "spilled", "lock")
+
+    def __init__(self, state, now):
+        self.state = state
+        self.last_active = now
+        self.nbytes = 0
+        self.spilled = False
+        # 정리 스레드가 내보내는 동안 이 세션의 다음 실행이 값을 읽지 않도록
+        self.lock = threading.Lock()
+
+
+def _script_run_ctx():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    return get_script_run_ctx()
+
+
+def _bytes_size(value):
+    """bytes, 또는 bytes가 든 튜플/리스트(사진: (파일 이름, 내용))의 크기 (아니면 None)"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)) and any(isinstance(item, (bytes, bytearray)) for item in value):
+        return sum(len(item) if isinstance(item, (bytes, bytearray)) else len(str(item)) for item in value)
+    return None
+
+
+def _candidates(state):
+    """내보낼 수 있는 (키, 값, 크기) 목록"""
+    result = []
+    for key, value in state.items():
+        if not isinstance(key, str) or not _대상_키.match(key):
+            continue
+        size = _bytes_size(value)
+        if size is None:
+            if not hasattr(value, "columns"):
+                continue
+            size = metrics.estimate_session_bytes({key: value})
+        if size >= SPILL_MIN_BYTES:
+            result.append((key, value, size))
+    return result
+
+
+def _current_session():
+    """지금 실행 중인 세션의 기록 (처음이면 만듦) - 이번 실행의 session_state로 바꾸고 실행 시각 갱신"""
+    ctx = _script_run_ctx()
+    if ctx is None:
+        return None
+    now = time.time()
+    with _lock:
+        session = _sessions.get(ctx.session_id)
+        if session is None:
+            session = _sessions[ctx.session_id] = _Session(ctx.session_state, now)
+    # Streamlit은 실행마다 session_state 감싸개를 새로 만들므로 마지막 것을 보관
+    session.state = ctx.session_state
+    session.last_active = now
+    return session
+
+
+def rehydrate():
+    """디스크로 내보낸 값을 세션 상태에 되돌림 (전체 실행/fragment 실행 시작 때 호출)"""
+    session = _current_session()
+    if session is None:
+        return
+    # 정리 스레드가 이 세션을 내보내는 중이면 끝날 때까지 기다림
+    with session.lock:
+        session.last_active = time.time()
+        if not session.spilled:
+            return
+        session.spilled = False
+        state = st.session_state
+        handles = [(key, value) for key, value in state.items() if isinstance(value, SpilledValue)]
+        for key, handle in handles:
+            try:
+                with open(handle.path, "rb") as fp:
+                    state[key] = pickle.load(fp)
+                os.remove(handle.path)
+                session.nbytes += handle.nbytes
+            except (OSError, pickle.UnpicklingError, EOFError):
+                # 파일이 없어졌으면 값을 지워 탭이 기본값으로 다시 만들도록
+                del state[key]
+    if handles:
+        metrics.record_rehydrate(len(handles))
+
+
+def finish_run():
+    """전체 실행이 끝날 때 호출 - 이 세션의 큰 값 추정치를 갱신 (정리 스레드가 예산 계산에 사용)"""
+    session = _current_session()
+    if session is None:
+        return
+    session.nbytes = sum(size for _, _, size in _candidates(st.session_state.to_dict()))
+
+
+def _spill(session_id, session, now):
+    """쉬고 있는 세션 하나의 큰 값을 디스크로 내보내고 (값 수, 메모리 추정치) 반환
+
+    다른 세션과 공유하는 표(frame_store)는 내보내도 메모리가 줄지 않으므로 그대로 둡니다.
+    """
+    import frame_store
+    count = nbytes = 0
+    with session.lock:
+        # 기다리는 동안 세션이 다시 실행되었으면 내보내지 않음
+        if now - session.last_active < IDLE_SECONDS:
+            return 0, 0
+        state = session.state
+        directory = os.path.join(SPILL_DIR, session_id)
+        for key, value, size in _candidates(state.filtered_state):
+            if hasattr(value, "columns") and frame_store.is_shared(value):
+                continue
+            try:
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"{uuid.uuid4().hex}.pkl")
+                with open(path, "wb") as fp:
+                    pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                # 디스크에 쓸 수 없으면 나머지 값은 메모리에 그대로 둠
+                break
+            # 지우고 다시 넣어야 지난 실행에서 남은 값까지 함께 없어져 메모리가 줄어듦
+            del state[key]
+            state[key] = SpilledValue(path, size, type(value).__name__)
+            session.spilled = True
+            count += 1
+            nbytes += size
+        session.nbytes = max(session.nbytes - nbytes, 0)
+    return count, nbytes
+
+
+def _is_closed(session_id, session, now):
+    """브라우저 탭이 닫힌 세션인지 (Runtime이 없으면 TTL로 판단)"""
+    from streamlit.runtime import Runtime
+    if Runtime.exists():
+        return not Runtime.instance().is_active_session(session_id)
+    return now - session.last_active > SESSION_TTL_SECONDS
+
+
+def sweep():
+    """닫힌 세션 기록을 지우고, 오래 쉰 세션부터 큰 값을 디스크로 내보냄 (정리 스레드에서 주기적으로 호출)"""
+    now = time.time()
+    with _lock:
+        sessions = list(_sessions.items())
+    for session_id, session in sessions:
+        if _is_closed(session_id, session, now):
+            with _lock:
+                _sessions.pop(session_id, None)
+            shutil.rmtree(os.path.join(SPILL_DIR, session_id), ignore_errors=True)
+    sessions = [(session_id, session) for session_id, session in sessions if session_id in _sessions]
+
+    total = sum(session.nbytes for _, session in sessions)
+    idle = sorted(
+        ((session_id, session) for session_id, session in sessions if now - session.last_active >= IDLE_SECONDS),
+        key=lambda item: item[1].last_active,
+    )
+    for session_id, session in idle:
+        if SPILL_BUDGET_BYTES and total <= SPILL_BUDGET_BYTES:
+            break
+        count, nbytes = _spill(session_id, session, now)
+        if count:
+            total -= nbytes
+            metrics.record_spill(count, nbytes)
+
+
+def _sweep_loop():
+    _remove_stale_dirs()
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        try:
+            sweep()
+        except Exception:
+            # 정리에 실패해도 다음 주기에 다시 시도
+            continue
+
+
+def start():
+    """정리 스레드를 프로세스당 한 번만 시작"""
+    global _started
+    if IDLE_SECONDS <= 0:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_sweep_loop, name="wmsd-session-spill", daemon=True).start()
+
+
+def _remove_stale_dirs():
+    """종료된 서버 프로세스가 남긴 디렉토리 삭제"""
+    if not os.path.isdir(SPILL_ROOT):
+        return
+    for name in os.listdir(SPILL_ROOT):
+        if not name.isdigit() or int(name) == os.getpid():
+            continue
+        try:
+            os.kill(int(name), 0)
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(SPILL_ROOT, name), ignore_errors=True)
+        except OSError:
+            continue
@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils import get_saved_sessions
+from wmsd_core.storage import SAVE_DIR
+
+# 작업현장 등록부 (SQLite, 서버 프로세스 여러 개가 같은 파일을 함께 사용)
+# 현장명은 기본 키 인덱스로 앞부분 검색, 저장된 세션은 (현장명, 저장 시각) 인덱스로 현장별 조회
+SITE_DB = os.environ.get("WMSD_SITE_DB", os.path.join(SAVE_DIR, "sites.sqlite3"))
+# 사이드바 검색 결과 최대 수 (현장이 수천 개여도 선택 목록은 이 수만큼만 만듦)
+SEARCH_LIMIT = int(os.environ.get("WMSD_SITE_SEARCH_LIMIT", "100"))
+
+# 사업장개요 탭에서 등록부에 보관하는 항목
+현장_항목 = ("소재지", "업종", "수행기관")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS 현장 (
+    현장명 TEXT PRIMARY KEY,
+    소재지 TEXT NOT NULL DEFAULT '',
+    업종 TEXT NOT NULL DEFAULT '',
+    수행기관 TEXT NOT NULL DEFAULT '',
+    등록일시 TEXT NOT NULL,
+    수정일시 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS 세션 (
+    session_id TEXT PRIMARY KEY,
+    현장명 TEXT NOT NULL REFERENCES 현장(현장명),
+    filename TEXT NOT NULL,
+    saved_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS 세션_현장 ON 세션 (현장명, saved_at);
+"""
+# 스키마 버전 (PRAGMA user_version) - 1: 처음 만들 때 기존 세션 파일을 가져옴
+_SCHEMA_VERSION = 1
+
+# 스레드마다 연결 하나 - Streamlit은 실행(rerun)마다 새 스레드에서 스크립트를 실행하므로
+# 연결은 실행마다 새로 열림 (스레드가 끝나면 함께 정리됨, SQLite 연결 자체는 가벼움)
+# WAL 설정과 스키마 확인은 파일에 남으므로 프로세스에서 DB 경로마다 한 번만 실행
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()    # 준비를 마친 DB 경로
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _connect():
+    # SAVE_DIR는 작업 디렉토리 기준이므로 절대 경로로 연결을 구분
+    path = os.path.abspath(SITE_DB)
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == path:
+        return conn
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        # 파일이 지워졌으면 다시 준비
+        _initialized.discard(path)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    if path not in _initialized:
+        with _init_lock:
+            if path not in _initialized:
+                _initialize(conn)
+                _initialized.add(path)
+    _local.conn, _local.path = conn, path
+    return conn
+
+
+def _initialize(conn):
+    """DB 파일 준비 - WAL 모드(다른 프로세스가 쓰는 동안에도 읽을 수 있도록)와 스키마 생성"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+        with conn:
+            conn.executescript(_SCHEMA)
+            _import_saved_sessions(conn)
+            conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+
+def _import_saved_sessions(conn):
+    """이미 저장된 세션 파일의 현장과 세션을 등록 (등록부를 처음 만들 때 한 번)"""
+    for session in get_saved_sessions():
+        if session["workplace"]:
+            _record(conn, session["session_id"], session["workplace"], session["filename"], session["saved_at"])
+
+
+def _record(conn, session_id, 현장명, filename, saved_at):
+    conn.execute("INSERT OR IGNORE INTO 현장 (현장명, 등록일시, 수정일시) VALUES (?, ?, ?)",
+                 (현장명, saved_at or _now(), saved_at or _now()))
+    conn.execute("INSERT OR REPLACE INTO 세션 (session_id, 현장명, filename, saved_at) VALUES (?, ?, ?, ?)",
+                 (session_id, 현장명, filename, saved_at))
+
+
+def register_site(현장명):
+    """현장 등록 (이미 있으면 그대로)"""
+    conn = _connect()
+    with conn:
+        conn.execute("INSERT OR IGNORE INTO 현장 (현장명, 등록일시, 수정일시) VALUES (?, ?, ?)",
+                     (현장명, _now(), _now()))
+
+
+def update_site(현장명, **항목):
+    """현장 정보(소재지, 업종, 수행기관) 갱신 - 없는 현장이면 등록"""
+    values = {key: str(value or "") for key, value in 항목.items() if key in 현장_항목}
+    register_site(현장명)
+    if not values:
+        return
+    conn = _connect()
+    with conn:
+        conn.execute(
+            f"UPDATE 현장 SET {', '.join(f'{key} = ?' for key in values)}, 수정일시 = ? WHERE 현장명 = ?",
+            (*values.values(), _now(), 현장명)
+        )
+
+
+def get_site(현장명):
+    """현장 정보 dict (없으면 None)"""
+    row = _connect().execute("SELECT * FROM 현장 WHERE 현장명 = ?", (현장명,)).fetchone()
+    return dict(row) if row is not None else None
+
+
+def site_overview(현장명):
+    """등록부의 현장 정보 중 사업장개요 항목 {소재지, 업종, 수행기관} (없으면 빈 문자열)"""
+    row = get_site(현장명) or {}
+    return {key: str(row.get(key) or "") for key in 현장_항목}
+
+
+def apply_site_overview(state, 현장명, overwrite=True):
+    """현장을 바꿀 때 등록부의 현장 정보를 세션 상태의 사업장개요 칸(과 위젯 보관본)에 반영
+
+    overwrite면 이전 현장의 값을 등록부 값(없으면 빈 칸)으로 바꾸고, 아니면 빈 칸만 채웁니다.
+    등록부에서 가져온 값은 사업장개요 탭이 등록부에 다시 쓰지 않도록 기준값으로 기록합니다.
+    """
+    values = site_overview(현장명)
+    보관 = state.setdefault("_위젯_보관", {})
+    for key, value in values.items():
+        if overwrite or (value and not state.get(key)):
+            state[key] = value
+            보관[key] = value
+    state["_현장_정보_기준"] = (현장명, values)
+
+
+def search_sites(prefix="", limit=SEARCH_LIMIT):
+    """현장명이 prefix로 시작하는 현장 이름 (이름 순, 최대 limit개)
+
+    LIKE 대신 범위 조건을 써서 기본 키 인덱스만 읽습니다.
+    """
+    prefix = prefix.strip()
+    if not prefix:
+        rows = _connect().execute("SELECT 현장명 FROM 현장 ORDER BY 현장명 LIMIT ?", (limit,))
+    else:
+        rows = _connect().execute(
+            "SELECT 현장명 FROM 현장 WHERE 현장명 >= ? AND 현장명 < ? ORDER BY 현장명 LIMIT ?",
+            (prefix, prefix + "\U0010ffff", limit)
+        )
+    return [row[0] for row in rows]
+
+
+def site_count():
+    return _connect().execute("SELECT COUNT(*) FROM 현장").fetchone()[0]
+
+
+def record_session(session_id, 현장명, filename, saved_at):
+    """저장한 세션 파일을 현장에 연결"""
+    conn = _connect()
+    with conn:
+        _record(conn, session_id, 현장명, filename, saved_at)
+
+
+def site_sessions(현장명):
+    """현장의 저장된 세션 목록 (최근 저장 순, 파일이 지워진 세션은 제외)
+
+    utils.get_saved_sessions와 같은 형식입니다.
+    """
+    rows = _connect().execute(
+        "SELECT session_id, 현장명, filename, saved_at FROM 세션 WHERE 현장명 = ? ORDER BY saved_at DESC",
+        (현장명,)
+    )
+    return [
+        {"filename": row["filename"], "session_id": row["session_id"],
+         "workplace": row["현장명"], "saved_at": row["saved_at"]}
+        for row in rows if os.path.exists(os.path.join(SAVE_DIR, row["filename"]))
+    ]
@@ -0,0 +1,122 @@
+"""앱 시작 시간 측정 및 시작 예산 검사
+
+사용법:
+    python startup_profile.py                 # 첫 화면까지 걸린 시간과 import 시간 상위 목록 출력
+    python startup_profile.py --check         # 예산 초과 또는 무거운 모듈이 첫 화면 전에 로드되면 종료 코드 1
+    python startup_profile.py --budget 2.5    # 첫 화면 예산(초) 지정 (기본: WMSD_STARTUP_BUDGET 또는 3.0)
+
+장면마다 새 파이썬 프로세스에서 main.py를 Streamlit AppTest로 한 번 실행해 콜드 스타트를 측정합니다.
+- 시작화면: 작업현장을 고르기 전 첫 화면
+- 사업장개요: 작업현장을 고른 뒤 기본 탭
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET = float(os.environ.get("WMSD_STARTUP_BUDGET", "3.0"))
+
+# 장면별 초기 세션 상태와 그 장면을 그리기 전에 로드되면 안 되는 모듈
+# (실제로 쓰는 코드 경로에서만 불러와야 함)
+장면_목록 = {
+    "시작화면": ({}, ["pandas", "reportlab", "openpyxl", "PIL"]),
+    "사업장개요": ({"workplace": "시작시간측정"}, ["reportlab", "openpyxl", "PIL"]),
+}
+
+
+def _child(scene):
+    """자식 프로세스: 장면을 한 번 그리고 측정 결과를 JSON으로 출력"""
+    initial_state, 지연_로드_모듈 = 장면_목록[scene]
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_loaded = time.perf_counter()
+
+    at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=60)
+    for key, value in initial_state.items():
+        at.session_state[key] = value
+    at.run()
+    rendered = time.perf_counter()
+
+    print(json.dumps({
+        "streamlit_import": streamlit_loaded - started,
+        "first_render": rendered - streamlit_loaded,
+        "total": rendered - started,
+        "exceptions": [str(e.value) for e in at.exception],
+        "loaded": [name for name in 지연_로드_모듈 if name in sys.modules],
+    }, ensure_ascii=False))
+
+
+def _parse_importtime(stderr):
+    """-X importtime 출력을 최상위 패키지별 누적 시간(초)으로 집계"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # 들여쓰기가 없는 줄(최상위 import)만 누적 시간을 더함
+        if name.startswith(" ") and not name.startswith("  "):
+            totals[name.strip().split(".")[0]] += int(parts[1]) / 1e6
+    return sorted(totals.items(), key=lambda x: x[1], reverse=True)
+
+
+def measure(scene):
+    """새 프로세스에서 장면의 콜드 스타트 측정 (결과 dict, import 시간 목록)"""
+    env = dict(os.environ, PYTHONPATH=APP_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", scene],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    result_line = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not result_line:
+        raise RuntimeError(proc.stderr[-2000:])
+    return json.loads(result_line[-1]), _parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 시작 시간 측정")
+    parser.add_argument("--check", action="store_true", help="예산을 넘으면 종료 코드 1")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="첫 화면까지 허용 시간(초)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 import 시간 상위 개수")
+    parser.add_argument("--child", choices=list(장면_목록), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        return 0
+
+    problems = []
+    for scene in 장면_목록:
+        result, imports = measure(scene)
+        print(f"[{scene}]")
+        print(f"  streamlit 로드: {result['streamlit_import']:.2f}초")
+        print(f"  첫 화면 실행:   {result['first_render']:.2f}초 (예산 {args.budget:.2f}초)")
+        print(f"  전체:           {result['total']:.2f}초")
+        print("  import 시간 상위 (최상위 패키지, 누적):")
+        for name, seconds in imports[:args.top]:
+            print(f"    {name:<30} {seconds * 1000:8.1f} ms")
+        print()
+
+        if result["exceptions"]:
+            problems.append(f"[{scene}] 예외 발생: {result['exceptions']}")
+        if result["first_render"] > args.budget:
+            problems.append(f"[{scene}] 첫 화면 실행 {result['first_render']:.2f}초가 예산 {args.budget:.2f}초를 넘었습니다")
+        if result["loaded"]:
+            problems.append(f"[{scene}] 화면을 그리기 전에 로드되면 안 되는 모듈: {', '.join(result['loaded'])}")
+
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1 if args.check else 0
+    print("✅ 시작 예산 통과")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""현장 규모의 가상 조사 데이터 생성기
+
+사용법:
+    python synthetic_data.py -o checklist.xlsx --companies 2 --teams 4 --tasks 25 --units 6
+    python synthetic_data.py --session 현장A --tasks 50     # saved_sessions에 세션 파일로 저장
+
+생성한 체크리스트 엑셀은 '근골격계 부담작업 체크리스트' 탭의 엑셀 업로드 양식과 같습니다.
+"""
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from wmsd_core.work_model import task_key, 작업조건_키, 원인분석_키
+
+부담작업_값 = ["O(해당)", "△(잠재위험)", "X(미해당)"]
+부하옵션 = ["매우쉬움(1)", "쉬움(2)", "약간 힘듦(3)", "힘듦(4)", "매우 힘듦(5)"]
+빈도옵션 = ["3개월마다(1)", "가끔(2)", "자주(3)", "계속(4)", "초과근무(5)"]
+작업_이름 = ["조립", "운반", "포장", "검사", "용접", "도장", "가공", "적재", "세척", "출하"]
+단위작업_이름 = ["부품공급", "체결", "이송", "들기", "내리기", "밀기", "정렬", "측정", "표시", "정리"]
+원인분석_유형 = ["반복동작", "부자연스러운 자세", "과도한 힘", "접촉스트레스 또는 기타(진동, 밀고 당기기 등)"]
+
+
+def generate_checklist(companies=1, teams=3, tasks=10, units=4, hazards_per_row=2,
+                       burden_mix=(0.3, 0.1, 0.6), seed=0):
+    """체크리스트 DataFrame 생성
+
+    행 수는 companies × teams × tasks × units 이며, burden_mix는 부담작업 값
+    (해당, 잠재위험, 미해당)의 비율입니다. hazards_per_row개(최대 5)의 유해요인 원인분석 컬럼을 채웁니다.
+    """
+    rng = np.random.default_rng(seed)
+    rows = companies * teams * tasks * units
+    회사 = np.repeat([f"{chr(65 + i % 26)}회사{i // 26 or ''}" for i in range(companies)], teams * tasks * units)
+    소속 = np.tile(np.repeat([f"생산{j + 1}팀" for j in range(teams)], tasks * units), companies)
+    작업 = np.tile(np.repeat([f"{작업_이름[k % len(작업_이름)]}작업{k + 1}" for k in range(tasks)], units), companies * teams)
+    단위 = np.tile([f"{단위작업_이름[u % len(단위작업_이름)]}{u + 1}" for u in range(units)], companies * teams * tasks)
+
+    df = pd.DataFrame({
+        "회사명": 회사,
+        "소속": 소속,
+        "작업명": 작업,
+        "단위작업명": 단위,
+        "작업내용(상세설명)": [f"{w} 공정의 {u} 작업" for w, u in zip(작업, 단위)],
+        "작업자 수": rng.integers(1, 20, rows),
+        "작업자 이름": [f"작업자{i % 500 + 1} 외" for i in range(rows)],
+        "작업형태": rng.choice(["정규직", "계약직", "교대"], rows, p=[0.7, 0.2, 0.1]),
+        "1일 작업시간": rng.choice([8, 9, 10, 12], rows, p=[0.6, 0.2, 0.15, 0.05]),
+    })
+    mix = np.asarray(burden_mix, dtype=float)
+    for i in range(1, 13):
+        df[f"부담작업_{i}호"] = rng.choice(부담작업_값, rows, p=mix / mix.sum())
+
+    for j in range(1, min(hazards_per_row, 5) + 1):
+        유형 = rng.choice(원인분석_유형, rows)
+        df[f"유해요인_원인분석_유형_{j}"] = 유형
+        df[f"유해요인_원인분석_부담작업_{j}_반복"] = np.where(유형 == "반복동작", "(1호)하루 4시간 이상 키보드 작업", "")
+        df[f"유해요인_원인분석_수공구_종류_{j}"] = np.where(유형 == "반복동작", "전동드라이버", "")
+        df[f"유해요인_원인분석_수공구_무게(kg)_{j}"] = np.where(유형 == "반복동작", rng.uniform(0.5, 3, rows).round(1), np.nan)
+        df[f"유해요인_원인분석_부담작업자세_{j}"] = np.where(유형 == "부자연스러운 자세", "(3호)머리 위에 손 작업", "")
+        df[f"유해요인_원인분석_부담작업_{j}_힘"] = np.where(유형 == "과도한 힘", "(8호)25kg 이상 물체 들기", "")
+        df[f"유해요인_원인분석_중량물_무게(kg)_{j}"] = np.where(유형 == "과도한 힘", rng.uniform(5, 40, rows).round(1), np.nan)
+        df[f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{j}"] = np.where(유형 == "과도한 힘", rng.integers(1, 200, rows), 0)
+        df[f"유해요인_원인분석_부담작업_{j}_기타"] = np.where(유형 == 원인분석_유형[3], "(11호)접촉스트레스", "")
+    df["보호구"] = rng.choice(["안전장갑", "안전화", "보안경", ""], rows)
+    df["작성자"] = rng.choice(["김조사", "박조사", "이조사"], rows)
+    return df
+
+
+def generate_responses(count=200, departments=None, seed=0):
+    """증상조사 설문 응답 DataFrame 생성 (증상조사 분석 탭 업로드 양식)"""
+    rng = np.random.default_rng(seed)
+    departments = departments or ["생산1팀/조립", "생산2팀/가공", "물류팀/운반"]
+    부위 = ["목", "어깨", "허리", "팔/팔꿈치", "손/손목/손가락", "다리/발"]
+    통증 = [", ".join(rng.choice(부위, rng.integers(0, 3), replace=False)) for _ in range(count)]
+    return pd.DataFrame({
+        "응답자ID": [f"R{i + 1:05d}" for i in range(count)],
+        "성별": rng.choice(["남", "여"], count, p=[0.7, 0.3]),
+        "나이": rng.integers(20, 65, count),
+        "근무기간(년)": rng.uniform(0, 30, count).round(1),
+        "육체적부담": rng.choice(["매우 쉬움", "쉬움", "약간 힘듦", "힘듦", "매우 힘듦"], count),
+        "부서/공정": rng.choice(departments, count),
+        "통증부위": 통증,
+    })
+
+
+def generate_assessments(count=500, seed=0):
+    """인간공학적 평가 입력 (NIOSH 표, 자세 표) 생성 (정밀조사 탭 입력 양식)"""
+    from wmsd_core import ergonomics
+    rng = np.random.default_rng(seed)
+    작업명 = rng.choice(작업_이름, count)
+    lifting = pd.DataFrame({
+        "작업명": 작업명,
+        "하중(kg)": rng.uniform(1, 30, count).round(1),
+        "수평거리(cm)": rng.uniform(20, 70, count).round(),
+        "수직높이(cm)": rng.uniform(0, 180, count).round(),
+        "이동거리(cm)": rng.uniform(10, 180, count).round(),
+        "비대칭각도(°)": rng.choice([0, 30, 45, 90], count),
+        "빈도(회/분)": rng.uniform(0.1, 16, count).round(2),
+        "작업시간(시간)": rng.choice([1, 2, 8], count),
+        "손잡이": rng.choice(ergonomics.손잡이_종류, count),
+    })
+    postures = pd.DataFrame({"작업명": 작업명})
+    for col, (low, high) in {"상완(°)": (-30, 120), "전완(°)": (30, 140), "손목(°)": (-30, 30), "목(°)": (-15, 45),
+                             "몸통(°)": (-10, 90), "무릎(°)": (0, 100)}.items():
+        postures[col] = rng.uniform(low, high, count).round()
+    for col in ergonomics.자세_입력_열:
+        if col not in postures.columns and col not in ("하중(kg)", "손잡이"):
+            postures[col] = rng.random(count) < 0.2
+    postures["하중(kg)"] = rng.uniform(0, 20, count).round(1)
+    postures["손잡이"] = rng.choice(ergonomics.REBA_손잡이_종류, count)
+    return lifting, postures[ergonomics.자세_입력_열]
+
+
+def generate_session_state(companies=1, teams=3, tasks=10, units=4, hazards_per_row=2,
+                           burden_mix=(0.3, 0.1, 0.6), responses=200, seed=0):
+    """저장/보고서 생성에 쓰이는 세션 상태 dict 생성 (st.session_state와 같은 키)"""
+    from wmsd_core.symptom_survey import normalize_responses, build_symptom_tables
+
+    rng = np.random.default_rng(seed)
+    checklist_df = generate_checklist(companies, teams, tasks, units, hazards_per_row, burden_mix, seed)
+    state = {
+        "checklist_df": checklist_df,
+        "사업장명": "가상사업장", "소재지": "가상시 가상구", "업종": "제조업",
+        "예비조사": "2024-01-01", "본조사": "2024-01-15", "수행기관": "가상기관", "성명": "김조사",
+    }
+
+    for 작업명, 작업_df in checklist_df.groupby("작업명", sort=False):
+        단위작업 = 작업_df["단위작업명"].drop_duplicates().tolist()
+        state[작업조건_키.format(작업명)] = pd.DataFrame({
+            "단위작업명": 단위작업,
+            "부담작업(호)": ["1호, 3호"] * len(단위작업),
+            "작업부하(A)": rng.choice(부하옵션, len(단위작업)),
+            "작업빈도(B)": rng.choice(빈도옵션, len(단위작업)),
+            "총점": [0] * len(단위작업),
+        })
+        state[원인분석_키.format(작업명)] = [
+            {"유형": 유형, "부담작업": "", "부담작업자세": ""}
+            for 유형 in rng.choice(원인분석_유형, hazards_per_row)
+        ]
+        state[task_key("조사일시", 작업명)] = "2024-01-15"
+        state[task_key("부서명", 작업명)] = 작업_df["소속"].iloc[0]
+
+    departments = [f"{c}/{w}" for c, w in checklist_df[["소속", "작업명"]].drop_duplicates().head(20).itertuples(index=False)]
+    normalized, _ = normalize_responses(generate_responses(responses, departments, seed))
+    state.update(build_symptom_tables(normalized))
+
+    작업목록 = checklist_df["작업명"].drop_duplicates().tolist()
+    state["개선계획_data"] = pd.DataFrame({
+        "작업공정": 작업목록,
+        "단위작업": ["전체"] * len(작업목록),
+        "유해요인": ["반복동작"] * len(작업목록),
+        "개선대책": ["작업대 높이 조절"] * len(작업목록),
+        "추진일정": ["2024-06"] * len(작업목록),
+        "소요예산": ["100만원"] * len(작업목록),
+        "담당자": ["안전팀"] * len(작업목록),
+        "비고": [""] * len(작업목록),
+    })
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 조사 데이터 생성")
+    parser.add_argument("-o", "--output", help="체크리스트 엑셀 파일 경로")
+    parser.add_argument("--session", help="지정한 작업현장 이름으로 saved_sessions에 세션 파일 저장")
+    parser.add_argument("--companies", type=int, default=1)
+    parser.add_argument("--teams", type=int, default=3)
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--units", type=int, default=4)
+    parser.add_argument("--hazards", type=int, default=2, help="행마다 채울 원인분석 항목 수 (최대 5)")
+    parser.add_argument("--burden-mix", type=float, nargs=3, default=(0.3, 0.1, 0.6),
+                        metavar=("해당", "잠재", "미해당"), help="부담작업 값 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.output and not args.session:
+        parser.error("-o 또는 --session 중 하나를 지정하세요.")
+
+    scale = dict(companies=args.companies, teams=args.teams, tasks=args.tasks, units=args.units,
+                 hazards_per_row=args.hazards, burden_mix=args.burden_mix, seed=args.seed)
+    if args.output:
+        df = generate_checklist(**scale)
+        df.to_excel(args.output, sheet_name="체크리스트", index=False)
+        print(f"✅ 체크리스트 {len(df):,}행을 {args.output}에 저장했습니다.")
+    if args.session:
+        import os
+        from wmsd_core.workbook import save_session
+        import site_registry
+        state = generate_session_state(**scale)
+        session_id = f"{args.session}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        filepath, metadata = save_session(state, session_id, args.session)
+        site_registry.record_session(session_id, args.session, os.path.basename(filepath), metadata["saved_at"])
+        print(f"✅ 세션 파일을 {filepath}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,31 @@
 import streamlit as st
+from utils import keep_widget
 
 def render_overview_tab():
     """사업장개요 탭 렌더링"""
     st.title("사업장 개요")
     
-    사업장명 = st.text_input("사업장명", key="사업장명", value=st.session_state.get("workplace", ""))
-    소재지 = st.text_input("소재지", key="소재지")
-    업종 = st.text_input("업종", key="업종")
+    사업장명 = st.text_input("사업장명", key=keep_widget("사업장명", st.session_state.get("workplace", "")))
+    소재지 = st.text_input("소재지", key=keep_widget("소재지"))
+    업종 = st.text_input("업종", key=keep_widget("업종"))
     
     col1, col2 = st.columns(2)
     with col1:
-        예비조사 = st.text_input("예비조사일 (YYYY-MM-DD)", key="예비조사", placeholder="2024-01-01")
-        수행기관 = st.text_input("수행기관", key="수행기관")
+        예비조사 = st.text_input("예비조사일 (YYYY-MM-DD)", key=keep_widget("예비조사"), placeholder="2024-01-01")
+        수행기관 = st.text_input("수행기관", key=keep_widget("수행기관"))
     with col2:
-        본조사 = st.text_input("본조사일 (YYYY-MM-DD)", key="본조사", placeholder="2024-01-01")
-        성명 = st.text_input("성명", key="성명")
\ No newline at end of file
+        본조사 = st.text_input("본조사일 (YYYY-MM-DD)", key=keep_widget("본조사"), placeholder="2024-01-01")
+        성명 = st.text_input("성명", key=keep_widget("성명"))
+
+    # 현장 등록부의 현장 정보 갱신 (이 현장에서 사용자가 고친 칸만, 빈 칸은 등록부 값을 지우지 않음)
+    workplace = st.session_state.get("workplace")
+    if workplace:
+        import site_registry
+        기준 = st.session_state.get("_현장_정보_기준")
+        if not 기준 or 기준[0] != workplace:
+            기준 = (workplace, site_registry.site_overview(workplace))
+        현장_정보 = {"소재지": 소재지, "업종": 업종, "수행기관": 수행기관}
+        바뀐_항목 = {key: value for key, value in 현장_정보.items() if value and value != 기준[1].get(key, "")}
+        if 바뀐_항목:
+            site_registry.update_site(workplace, **바뀐_항목)
+        st.session_state["_현장_정보_기준"] = (workplace, {**기준[1], **바뀐_항목})
@@ -1,10 +1,21 @@
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-from utils import safe_convert
+from utils import editor_fragment, rerun_fragment
+from wmsd_core import checklist
+import profiler
 import time
 from datetime import datetime
 
+@st.cache_data(show_spinner=False)
+def _sample_excel_bytes(sample_data):
+    """샘플 엑셀 파일 bytes (처음 한 번만 openpyxl로 생성)"""
+    sample_output = BytesIO()
+    with pd.ExcelWriter(sample_output, engine='openpyxl') as writer:
+        sample_data.to_excel(writer, sheet_name='체크리스트', index=False)
+    return sample_output.getvalue()
+
+
 def render_checklist_tab():
     """근골격계 부담작업 체크리스트 탭 렌더링"""
     st.subheader("근골격계 부담작업 체크리스트")
@@ -14,7 +25,7 @@ def render_checklist_tab():
         st.info("""
         📌 **엑셀 파일 양식 가이드:**
         - **필수 컬럼:** `회사명`, `소속`, `작업명`, `단위작업명`, `작업내용(상세설명)`, `작업자 수`, `작업자 이름`, `작업형태`, `1일 작업시간`, `부담작업_1호` ~ `부담작업_12호`가 반드시 포함되어야 합니다.
-        - **선택 컬럼:** 유해요인 원인분석, 보호구, 작성자 등 관련 데이터를 추가할 수 있습니다.
+        - **선택 컬럼:** 유해요인 원인분석, 보호구, 작성자 등 관련 데이터를 추가할 수 있습니다. `작업부하(A)`, `작업빈도(B)`가 있으면 작업조건조사 2단계에 미리 채워집니다.
         - **부담작업 값:** `O(해당)`, `X(미해당)`, `△(잠재위험)` 또는 `O`, `X`, `△`로 입력해주세요. (자동으로 변환됩니다)
         
         💡 샘플 엑셀 파일을 다운로드하여 양식을 확인하세요.
@@ -25,8 +36,9 @@ def render_checklist_tab():
         if uploaded_excel is not None:
             try:
                 # 엑셀 파일 읽기
-                with st.spinner("📊 엑셀 파일을 읽는 중..."):
+                with st.spinner("📊 엑셀 파일을 읽는 중..."), profiler.span("excel_parse:체크리스트 업로드", "io"):
                     df_excel = pd.read_excel(uploaded_excel, engine='openpyxl')
+                profiler.record_size("체크리스트 업로드", uploaded_excel.size)
                 
                 # 파일 정보 표시
                 file_size = len(uploaded_excel.getvalue()) / 1024  # KB
@@ -34,42 +46,19 @@ def render_checklist_tab():
 
                 # --- 여기부터 수정된 부분 ---
 
-                # 1. 필수 컬럼 목록 정의
-                required_columns = [
-                    "회사명", "소속", "작업명", "단위작업명", "작업내용(상세설명)", 
-                    "작업자 수", "작업자 이름", "작업형태", "1일 작업시간"
-                ] + [f"부담작업_{i}호" for i in range(1, 13)]
-
-                # 2. 업로드된 파일에 필수 컬럼이 모두 있는지 확인
-                actual_columns = df_excel.columns.tolist()
-                missing_columns = [col for col in required_columns if col not in actual_columns]
+                # 1. 업로드된 파일에 필수 컬럼이 모두 있는지 확인 (필수 컬럼 목록은 wmsd_core.checklist.필수_열)
+                missing_columns = checklist.missing_columns(df_excel)
 
                 if missing_columns:
                     # 필수 컬럼이 없으면 에러 메시지 표시
                     st.error(f"❌ 엑셀 파일에 필수 컬럼이 누락되었습니다: **{', '.join(missing_columns)}**")
                     st.warning("📥 샘플 엑셀 파일을 다운로드하여 양식을 확인해주세요.")
                 else:
-                    # 3. 필수 컬럼이 모두 있으면 데이터 처리 진행
+                    # 2. 필수 컬럼이 모두 있으면 데이터 처리 진행
                     st.success("✅ 필수 컬럼이 모두 확인되었습니다. 데이터 처리를 진행합니다.")
                     
                     # 부담작업 컬럼 값 변환 (O, X, △ -> O(해당), X(미해당), △(잠재위험))
-                    burden_columns = [f"부담작업_{i}호" for i in range(1, 13)]
-                    for col in burden_columns:
-                        if col in df_excel.columns:
-                            def convert_burden_value(x):
-                                if pd.isna(x) or x == "":
-                                    return "X(미해당)"
-                                x_str = str(x).strip()
-                                if x_str in ["O", "o", "O(해당)"]:
-                                    return "O(해당)"
-                                elif x_str in ["X", "x", "X(미해당)"]:
-                                    return "X(미해당)"
-                                elif x_str in ["△", "△(잠재)", "△(잠재위험)"]:
-                                    return "△(잠재위험)"
-                                else:
-                                    return "X(미해당)"
-                            
-                            df_excel[col] = df_excel[col].apply(convert_burden_value)
+                    df_excel = checklist.normalize_checklist(df_excel)
                     
                     # 미리보기
                     st.markdown("#### 📋 데이터 미리보기 (상위 20개)")
@@ -82,7 +71,7 @@ def render_checklist_tab():
                             # 즉시 Excel 파일로 저장
                             if st.session_state.get("session_id") and st.session_state.get("workplace"):
                                 from data_manager import save_to_excel
-                                success, _ = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"))
+                                success, _ = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"), trigger="upload")
                                 if success:
                                     st.session_state["last_save_time"] = time.time()
                                     st.session_state["last_successful_save"] = datetime.now()
@@ -117,20 +106,21 @@ def render_checklist_tab():
         st.markdown("##### 샘플 데이터 구조:")
         st.dataframe(sample_data, use_container_width=True)
         
-        sample_output = BytesIO()
-        with pd.ExcelWriter(sample_output, engine='openpyxl') as writer:
-            sample_data.to_excel(writer, sheet_name='체크리스트', index=False)
-        sample_output.seek(0)
-        
         st.download_button(
             label="📥 샘플 엑셀 다운로드",
-            data=sample_output,
+            data=_sample_excel_bytes(sample_data),
             file_name="체크리스트_샘플.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
     
     st.markdown("---")
     
+    render_checklist_editor()
+
+
+@editor_fragment
+def render_checklist_editor():
+    """체크리스트 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
     # 체크리스트 테이블용 컬럼 (기본 정보만)
     checklist_columns = ["회사명", "소속", "작업명", "단위작업명"] + [f"부담작업_{i}호" for i in range(1, 13)]
     
@@ -149,7 +139,7 @@ def render_checklist_tab():
     st.markdown("### 📝 부담작업 체크리스트 입력/수정")
 
     # 표시할 데이터 (전체 데이터에서 체크리스트에 필요한 컬럼만 선택)
-    display_data = data[checklist_columns].copy()
+    display_data = data[checklist_columns]
 
     # 편집 가능한 데이터프레임으로 표시
     edited_data = st.data_editor(
@@ -176,7 +166,8 @@ def render_checklist_tab():
     # 편집된 데이터를 세션 상태에 저장
     if not edited_data.equals(display_data):
         # 원본 데이터에 변경사항 병합 (다른 탭의 데이터 유지를 위해)
-        updated_df = st.session_state["checklist_df"].copy()
+        # 열 단위로 바꿔 넣기만 하므로 얕은 복사로 충분 (원본 데이터는 복제하지 않음)
+        updated_df = st.session_state["checklist_df"].copy(deep=False)
         
         # 행 개수가 달라졌을 경우 처리
         if len(edited_data) > len(updated_df): # 행 추가
@@ -191,19 +182,10 @@ def render_checklist_tab():
                 updated_df[col] = edited_data[col]
 
         st.session_state["checklist_df"] = updated_df
+        # 파일 저장은 다음 전체 실행 때 auto_save에서 처리
         st.session_state["data_changed"] = True
         st.success("✅ 데이터가 업데이트되었습니다!")
-        st.rerun()
+        rerun_fragment()
 
     # 편집 가이드
     st.info("💡 **편집 가이드:** 셀을 클릭하여 직접 수정하거나, 표 하단의 `+` 버튼으로 행을 추가할 수 있습니다.")
-
-    # 세션 상태에 저장 및 실시간 동기화
-    if st.session_state.get("data_changed", False):
-        if st.session_state.get("session_id") and st.session_state.get("workplace"):
-            try:
-                from data_manager import save_to_excel
-                save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"))
-            except Exception:
-                pass
-        st.session_state["data_changed"] = False
\ No newline at end of file
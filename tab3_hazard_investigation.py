@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
-from utils import get_사업장명_목록, get_팀_목록, get_작업명_목록, get_단위작업명_목록
+from utils import get_사업장명_목록, get_팀_목록, get_작업명_목록, get_단위작업명_목록, keep_widget
+from wmsd_core.work_model import task_key, situation_key, 상황조사_항목
 
 def render_hazard_investigation_tab():
     """유해요인조사표 탭 렌더링"""
@@ -15,10 +16,11 @@ def render_hazard_investigation_tab():
             st.warning("먼저 체크리스트에 데이터를 입력하세요.")
             selected_회사명 = None
         else:
+            회사명_옵션 = ["선택하세요"] + 회사명_목록
             selected_회사명 = st.selectbox(
                 "회사명 선택",
-                ["선택하세요"] + 회사명_목록,
-                key="유해요인_회사명"
+                회사명_옵션,
+                key=keep_widget("유해요인_회사명", "선택하세요", 회사명_옵션)
             )
             if selected_회사명 == "선택하세요":
                 selected_회사명 = None
@@ -26,10 +28,11 @@ def render_hazard_investigation_tab():
     with col2:
         if selected_회사명:
             소속_목록 = get_팀_목록(selected_회사명)
+            소속_옵션 = ["전체"] + 소속_목록
             selected_소속 = st.selectbox(
                 "소속 선택",
-                ["전체"] + 소속_목록,
-                key="유해요인_소속"
+                소속_옵션,
+                key=keep_widget("유해요인_소속", "전체", 소속_옵션)
             )
             if selected_소속 == "전체":
                 selected_소속 = None
@@ -44,7 +47,7 @@ def render_hazard_investigation_tab():
                 selected_작업명_유해 = st.selectbox(
                     "작업명 선택",
                     작업명_목록,
-                    key="유해요인_작업명"
+                    key=keep_widget("유해요인_작업명", 작업명_목록[0], 작업명_목록)
                 )
             else:
                 st.warning("해당 조건에 맞는 작업이 없습니다.")
@@ -63,12 +66,12 @@ def render_hazard_investigation_tab():
             st.markdown("#### 가. 조사개요")
             col1, col2 = st.columns(2)
             with col1:
-                조사일시 = st.text_input("조사일시", key=f"조사일시_{selected_작업명_유해}")
-                부서명 = st.text_input("부서명", key=f"부서명_{selected_작업명_유해}")
+                조사일시 = st.text_input("조사일시", key=keep_widget(task_key("조사일시", selected_작업명_유해)))
+                부서명 = st.text_input("부서명", key=keep_widget(task_key("부서명", selected_작업명_유해)))
             with col2:
-                조사자 = st.text_input("조사자", key=f"조사자_{selected_작업명_유해}")
-                작업공정명 = st.text_input("작업공정명", value=selected_작업명_유해, key=f"작업공정명_{selected_작업명_유해}")
-            작업명_유해 = st.text_input("작업명", value=selected_작업명_유해, key=f"작업명_{selected_작업명_유해}")
+                조사자 = st.text_input("조사자", key=keep_widget(task_key("조사자", selected_작업명_유해)))
+                작업공정명 = st.text_input("작업공정명", key=keep_widget(task_key("작업공정명", selected_작업명_유해), selected_작업명_유해))
+            작업명_유해 = st.text_input("작업명", key=keep_widget(task_key("조사_작업명", selected_작업명_유해), selected_작업명_유해))
             
             # 단위작업명 표시
             if 단위작업명_목록:
@@ -85,21 +88,21 @@ def render_hazard_investigation_tab():
                     상태 = st.radio(
                         label="",
                         options=["변화없음", "감소", "증가", "기타"],
-                        key=f"{항목명}_상태_{작업명}",
+                        key=keep_widget(situation_key(항목명, "상태", 작업명), "변화없음"),
                         horizontal=True,
                         label_visibility="collapsed"
                     )
                 with cols[2]:
                     if 상태 == "감소":
-                        st.text_input("감소 - 언제부터", key=f"{항목명}_감소_시작_{작업명}", placeholder="언제부터", label_visibility="collapsed")
+                        st.text_input("감소 - 언제부터", key=keep_widget(situation_key(항목명, "감소_시작", 작업명)), placeholder="언제부터", label_visibility="collapsed")
                     elif 상태 == "증가":
-                        st.text_input("증가 - 언제부터", key=f"{항목명}_증가_시작_{작업명}", placeholder="언제부터", label_visibility="collapsed")
+                        st.text_input("증가 - 언제부터", key=keep_widget(situation_key(항목명, "증가_시작", 작업명)), placeholder="언제부터", label_visibility="collapsed")
                     elif 상태 == "기타":
-                        st.text_input("기타 - 내용", key=f"{항목명}_기타_내용_{작업명}", placeholder="내용", label_visibility="collapsed")
+                        st.text_input("기타 - 내용", key=keep_widget(situation_key(항목명, "기타_내용", 작업명)), placeholder="내용", label_visibility="collapsed")
                     else:
                         st.markdown("&nbsp;", unsafe_allow_html=True)
 
-            for 항목 in ["작업설비", "작업량", "작업속도", "업무변화"]:
+            for 항목 in 상황조사_항목:
                 상황조사행(항목, selected_작업명_유해)
                 st.markdown("<hr style='margin:0.5em 0;'>", unsafe_allow_html=True)
             
@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-from utils import get_사업장명_목록, get_팀_목록, get_작업명_목록, safe_convert, extract_number, calculate_total_score
+from utils import get_사업장명_목록, get_팀_목록, get_작업명_목록, keep_widget, editor_fragment, store_editor_result
+import profiler
+from wmsd_core.work_model import task_key, 작업조건_키, 원인분석_키
+from wmsd_core.checklist import task_rows, first_value, work_conditions_table, total_scores, parse_value
+from wmsd_core.hazards import hazard_columns, extract_hazard_entries, 빈_항목
 
 def render_work_conditions_tab():
     """작업조건조사 탭 렌더링"""
@@ -15,10 +19,11 @@ def render_work_conditions_tab():
             st.warning("먼저 체크리스트에 데이터를 입력하세요.")
             selected_회사명_조건 = None
         else:
+            회사명_옵션_조건 = ["선택하세요"] + 회사명_목록_조건
             selected_회사명_조건 = st.selectbox(
                 "회사명 선택",
-                ["선택하세요"] + 회사명_목록_조건,
-                key="작업조건_회사명"
+                회사명_옵션_조건,
+                key=keep_widget("작업조건_회사명", "선택하세요", 회사명_옵션_조건)
             )
             if selected_회사명_조건 == "선택하세요":
                 selected_회사명_조건 = None
@@ -26,10 +31,11 @@ def render_work_conditions_tab():
     with col2:
         if selected_회사명_조건:
             소속_목록_조건 = get_팀_목록(selected_회사명_조건)
+            소속_옵션_조건 = ["전체"] + 소속_목록_조건
             selected_소속_조건 = st.selectbox(
                 "소속 선택",
-                ["전체"] + 소속_목록_조건,
-                key="작업조건_소속"
+                소속_옵션_조건,
+                key=keep_widget("작업조건_소속", "전체", 소속_옵션_조건)
             )
             if selected_소속_조건 == "전체":
                 selected_소속_조건 = None
@@ -44,7 +50,7 @@ def render_work_conditions_tab():
                 selected_작업명 = st.selectbox(
                     "작업명 선택",
                     작업명_목록_조건,
-                    key="작업조건_작업명"
+                    key=keep_widget("작업조건_작업명", 작업명_목록_조건[0], 작업명_목록_조건)
                 )
             else:
                 st.warning("해당 조건에 맞는 작업이 없습니다.")
@@ -63,132 +69,29 @@ def render_work_conditions_tab():
             # 1단계: 유해요인 기본조사
             st.subheader(f"1단계: 유해요인 기본조사 - [{selected_작업명}]")
             
-            # 엑셀에서 작업내용(상세설명) 가져오기
-            작업내용_상세설명 = ""
-            if not st.session_state["checklist_df"].empty:
-                작업_데이터 = st.session_state["checklist_df"][
-                    (st.session_state["checklist_df"]["작업명"] == selected_작업명) &
-                    (st.session_state["checklist_df"]["회사명"] == selected_회사명_조건)
-                ]
-                if selected_소속_조건:
-                    작업_데이터 = 작업_데이터[작업_데이터["소속"] == selected_소속_조건]
-                
-                if not 작업_데이터.empty and "작업내용(상세설명)" in 작업_데이터.columns:
-                    # 첫 번째 행의 작업내용(상세설명) 사용
-                    raw_value = 작업_데이터.iloc[0].get("작업내용(상세설명)", "")
-                    작업내용_상세설명 = safe_convert(raw_value, str, "")
-                    if 작업내용_상세설명:
-                        st.success(f"✅ 작업내용 자동 로드됨")
+            # 선택된 작업의 체크리스트 행 (작업내용, 2단계 표, 근로자수, 원인분석 기본값에 사용)
+            작업_데이터 = task_rows(st.session_state["checklist_df"], selected_작업명, selected_회사명_조건, selected_소속_조건)
+
+            # 엑셀에서 작업내용(상세설명) 가져오기 (첫 번째 행)
+            작업내용_상세설명 = first_value(작업_데이터, "작업내용(상세설명)")
+            if 작업내용_상세설명:
+                st.success(f"✅ 작업내용 자동 로드됨")
             
             col1, col2 = st.columns(2)
             with col1:
-                작업공정 = st.text_input("작업공정", value=selected_작업명, key=f"1단계_작업공정_{selected_작업명}")
+                작업공정 = st.text_input("작업공정", key=keep_widget(task_key("작업공정", selected_작업명), selected_작업명))
             with col2:
-                작업내용 = st.text_input("작업내용", value=작업내용_상세설명, key=f"1단계_작업내용_{selected_작업명}")
+                작업내용 = st.text_input("작업내용", key=keep_widget(task_key("작업내용", selected_작업명), 작업내용_상세설명))
             
             st.markdown("---")
             
             # 2단계: 작업별 작업부하 및 작업빈도
             st.subheader(f"2단계: 작업별 작업부하 및 작업빈도 - [{selected_작업명}]")
             
-            # 선택된 작업명에 해당하는 체크리스트 데이터 가져오기
-            checklist_data = []
-            if not st.session_state["checklist_df"].empty:
-                작업_체크리스트 = st.session_state["checklist_df"][
-                    (st.session_state["checklist_df"]["작업명"] == selected_작업명) &
-                    (st.session_state["checklist_df"]["회사명"] == selected_회사명_조건)
-                ]
-                if selected_소속_조건:
-                    작업_체크리스트 = 작업_체크리스트[작업_체크리스트["소속"] == selected_소속_조건]
-                
-                for idx, row in 작업_체크리스트.iterrows():
-                    if row["단위작업명"]:
-                        부담작업호 = []
-                        for i in range(1, 13):
-                            if row[f"부담작업_{i}호"] == "O(해당)":
-                                부담작업호.append(f"{i}호")
-                            elif row[f"부담작업_{i}호"] == "△(잠재위험)":
-                                부담작업호.append(f"{i}호(잠재)")
-                        
-                        checklist_data.append({
-                            "단위작업명": row["단위작업명"],
-                            "부담작업(호)": ", ".join(부담작업호) if 부담작업호 else "미해당",
-                            "작업부하(A)": "",
-                            "작업빈도(B)": "",
-                            "총점": 0
-                        })
-            
-            # 데이터프레임 생성
-            if checklist_data:
-                data = pd.DataFrame(checklist_data)
-            else:
-                data = pd.DataFrame({
-                    "단위작업명": ["" for _ in range(3)],
-                    "부담작업(호)": ["" for _ in range(3)],
-                    "작업부하(A)": ["" for _ in range(3)],
-                    "작업빈도(B)": ["" for _ in range(3)],
-                    "총점": [0 for _ in range(3)],
-                })
-
-            부하옵션 = [
-                "",
-                "매우쉬움(1)", 
-                "쉬움(2)", 
-                "약간 힘듦(3)", 
-                "힘듦(4)", 
-                "매우 힘듦(5)"
-            ]
-            빈도옵션 = [
-                "",
-                "3개월마다(1)", 
-                "가끔(2)", 
-                "자주(3)", 
-                "계속(4)", 
-                "초과근무(5)"
-            ]
+            # 선택된 작업명에 해당하는 체크리스트 데이터로 표 생성 (단위작업명이 없으면 빈 행 3개)
+            data = work_conditions_table(작업_데이터)
 
-            column_config = {
-                "작업부하(A)": st.column_config.SelectboxColumn("작업부하(A)", options=부하옵션, required=False),
-                "작업빈도(B)": st.column_config.SelectboxColumn("작업빈도(B)", options=빈도옵션, required=False),
-                "단위작업명": st.column_config.TextColumn("단위작업명"),
-                "부담작업(호)": st.column_config.TextColumn("부담작업(호)"),
-                "총점": st.column_config.TextColumn("총점(자동계산)", disabled=True),
-            }
-
-            # 데이터 편집
-            edited_df = st.data_editor(
-                data,
-                num_rows="dynamic",
-                use_container_width=True,
-                hide_index=True,
-                column_config=column_config,
-                key=f"작업조건_data_editor_{selected_작업명}"
-            )
-            
-            # 편집된 데이터를 세션 상태에 저장
-            st.session_state[f"작업조건_data_{selected_작업명}"] = edited_df
-            
-            # 총점 자동 계산 후 다시 표시
-            if not edited_df.empty:
-                display_df = edited_df.copy()
-                for idx in range(len(display_df)):
-                    display_df.at[idx, "총점"] = calculate_total_score(display_df.iloc[idx])
-                
-                st.markdown("##### 계산 결과")
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "단위작업명": st.column_config.TextColumn("단위작업명"),
-                        "부담작업(호)": st.column_config.TextColumn("부담작업(호)"),
-                        "작업부하(A)": st.column_config.TextColumn("작업부하(A)"),
-                        "작업빈도(B)": st.column_config.TextColumn("작업빈도(B)"),
-                        "총점": st.column_config.NumberColumn("총점(자동계산)", format="%d"),
-                    }
-                )
-                
-                st.info("💡 총점은 작업부하(A) × 작업빈도(B)로 자동 계산됩니다.")
+            render_workload_editor(selected_작업명, data)
             
             # 3단계: 유해요인평가
             st.markdown("---")
@@ -197,32 +100,20 @@ def render_work_conditions_tab():
             # 작업명과 근로자수 입력
             col1, col2 = st.columns(2)
             with col1:
-                평가_작업명 = st.text_input("작업명", value=selected_작업명, key=f"3단계_작업명_{selected_작업명}")
+                평가_작업명 = st.text_input("작업명", key=keep_widget(task_key("평가_작업명", selected_작업명), selected_작업명))
             with col2:
-                # 엑셀에서 근로자수 가져오기
-                근로자수_값 = ""
-                if not st.session_state["checklist_df"].empty:
-                    작업_데이터 = st.session_state["checklist_df"][
-                        (st.session_state["checklist_df"]["작업명"] == selected_작업명) &
-                        (st.session_state["checklist_df"]["회사명"] == selected_회사명_조건)
-                    ]
-                    if selected_소속_조건:
-                        작업_데이터 = 작업_데이터[작업_데이터["소속"] == selected_소속_조건]
-                    
-                    if not 작업_데이터.empty and "작업자 수" in 작업_데이터.columns:
-                        # 첫 번째 행의 작업자수 사용
-                        raw_value = 작업_데이터.iloc[0].get("작업자 수", "")
-                        근로자수_값 = safe_convert(raw_value, str, "")
-                        if 근로자수_값:
-                            st.success(f"✅ 작업자수 자동 로드됨")
+                # 엑셀에서 근로자수 가져오기 (첫 번째 행의 작업자수)
+                근로자수_값 = first_value(작업_데이터, "작업자 수")
+                if 근로자수_값:
+                    st.success(f"✅ 작업자수 자동 로드됨")
                 
-                평가_근로자수 = st.text_input("근로자수", value=근로자수_값, key=f"3단계_근로자수_{selected_작업명}")
+                평가_근로자수 = st.text_input("근로자수", key=keep_widget(task_key("근로자수", selected_작업명), 근로자수_값))
             
             # 사진 업로드 및 설명 입력
             st.markdown("#### 작업 사진 및 설명")
             
             # 사진 개수 선택
-            num_photos = st.number_input("사진 개수", min_value=1, max_value=10, value=3, key=f"사진개수_{selected_작업명}")
+            num_photos = st.number_input("사진 개수", min_value=1, max_value=10, key=keep_widget(f"사진개수_{selected_작업명}", 3))
             
             # 각 사진별로 업로드와 설명 입력
             for i in range(num_photos):
@@ -230,132 +121,142 @@ def render_work_conditions_tab():
                 col1, col2 = st.columns([1, 2])
                 
                 with col1:
+                    # 업로드 위젯은 다른 탭에 있는 동안 초기화되므로 파일 내용은 별도 키에 보관
+                    사진_키 = f"사진_{i+1}_데이터_{selected_작업명}"
                     uploaded_file = st.file_uploader(
                         f"사진 {i+1} 업로드",
                         type=['png', 'jpg', 'jpeg'],
                         key=f"사진_{i+1}_업로드_{selected_작업명}"
                     )
                     if uploaded_file:
-                        st.image(uploaded_file, caption=f"사진 {i+1}", use_column_width=True)
+                        st.session_state[사진_키] = (uploaded_file.name, uploaded_file.getvalue())
+                    if st.session_state.get(사진_키):
+                        st.image(st.session_state[사진_키][1], caption=f"사진 {i+1}", use_column_width=True)
+                        if not uploaded_file and st.button("🗑️ 사진 삭제", key=f"사진_{i+1}_삭제_{selected_작업명}"):
+                            st.session_state.pop(사진_키, None)
+                            st.rerun()
                 
                 with col2:
                     photo_description = st.text_area(
                         f"사진 {i+1} 설명",
                         height=150,
-                        key=f"사진_{i+1}_설명_{selected_작업명}",
+                        key=keep_widget(f"사진_{i+1}_설명_{selected_작업명}"),
                         placeholder="이 사진에 대한 설명을 입력하세요..."
                     )
                 
                 st.markdown("---")
             
             # 작업별로 관련된 유해요인에 대한 원인분석 섹션 추가
-            render_hazard_analysis_section(selected_작업명, selected_회사명_조건, selected_소속_조건)
+            render_hazard_analysis_section(selected_작업명, 작업_데이터)
+
+
+@editor_fragment
+def render_workload_editor(selected_작업명, data):
+    """2단계 작업부하/작업빈도 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    부하옵션 = [
+        "",
+        "매우쉬움(1)", 
+        "쉬움(2)", 
+        "약간 힘듦(3)", 
+        "힘듦(4)", 
+        "매우 힘듦(5)"
+    ]
+    빈도옵션 = [
+        "",
+        "3개월마다(1)", 
+        "가끔(2)", 
+        "자주(3)", 
+        "계속(4)", 
+        "초과근무(5)"
+    ]
+
+    column_config = {
+        "작업부하(A)": st.column_config.SelectboxColumn("작업부하(A)", options=부하옵션, required=False),
+        "작업빈도(B)": st.column_config.SelectboxColumn("작업빈도(B)", options=빈도옵션, required=False),
+        "단위작업명": st.column_config.TextColumn("단위작업명"),
+        "부담작업(호)": st.column_config.TextColumn("부담작업(호)"),
+        "총점": st.column_config.TextColumn("총점(자동계산)", disabled=True),
+    }
 
+    # 편집기를 새로 그릴 때는 저장된(불러온/받은) 내용에서 시작하고, 편집 중에는 같은 기준 데이터 유지
+    # (편집기 상태는 기준 데이터에 대한 변경분이므로 기준이 바뀌면 행이 중복되거나 사라짐)
+    editor_key = f"작업조건_data_editor_{selected_작업명}"
+    기준_키 = f"작업조건_편집기준_{selected_작업명}"
+    if editor_key not in st.session_state or 기준_키 not in st.session_state:
+        저장된 = st.session_state.get(작업조건_키.format(selected_작업명))
+        st.session_state[기준_키] = 저장된 if isinstance(저장된, pd.DataFrame) and not 저장된.empty else data
 
-def render_hazard_analysis_section(selected_작업명, selected_회사명_조건, selected_소속_조건):
+    # 데이터 편집
+    edited_df = st.data_editor(
+        st.session_state[기준_키],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config=column_config,
+        key=editor_key
+    )
+
+    # 편집된 데이터를 세션 상태에 저장
+    store_editor_result(작업조건_키.format(selected_작업명), edited_df)
+
+    # 총점 자동 계산 후 다시 표시
+    if not edited_df.empty:
+        display_df = edited_df.assign(총점=total_scores(edited_df))
+
+        st.markdown("##### 계산 결과")
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "단위작업명": st.column_config.TextColumn("단위작업명"),
+                "부담작업(호)": st.column_config.TextColumn("부담작업(호)"),
+                "작업부하(A)": st.column_config.TextColumn("작업부하(A)"),
+                "작업빈도(B)": st.column_config.TextColumn("작업빈도(B)"),
+                "총점": st.column_config.NumberColumn("총점(자동계산)", format="%d"),
+            }
+        )
+
+        st.info("💡 총점은 작업부하(A) × 작업빈도(B)로 자동 계산됩니다.")
+
+
+@profiler.timed("tab4:원인분석")
+def render_hazard_analysis_section(selected_작업명, 작업_데이터):
     """작업별 유해요인 원인분석 섹션"""
     st.markdown("---")
     st.subheader(f"작업별로 관련된 유해요인에 대한 원인분석 - [{selected_작업명}]")
     
     # 원인분석 데이터 초기화 - 엑셀에서 자동 로드
-    원인분석_key = f"원인분석_항목_{selected_작업명}"
+    원인분석_key = 원인분석_키.format(selected_작업명)
     if 원인분석_key not in st.session_state:
         # 엑셀에서 해당 작업의 원인분석 데이터 가져오기
         엑셀_원인분석_데이터 = []
         
-        if not st.session_state["checklist_df"].empty:
-            # 해당 작업의 데이터 필터링
-            작업_데이터 = st.session_state["checklist_df"][
-                (st.session_state["checklist_df"]["작업명"] == selected_작업명) &
-                (st.session_state["checklist_df"]["회사명"] == selected_회사명_조건)
-            ]
-            if selected_소속_조건:
-                작업_데이터 = 작업_데이터[작업_데이터["소속"] == selected_소속_조건]
-            
-            # 디버깅 정보
-            if not 작업_데이터.empty:
-                원인분석_컬럼들 = [col for col in 작업_데이터.columns if "유해요인_원인분석" in col]
-                if 원인분석_컬럼들:
-                    st.info(f"🔍 원인분석 관련 컬럼 {len(원인분석_컬럼들)}개 발견")
-                    # 처음 몇 개 컬럼명 표시
-                    st.info(f"🔍 컬럼 예시: {원인분석_컬럼들[:3]}")
-                else:
-                    st.warning("⚠️ 원인분석 관련 컬럼을 찾을 수 없습니다.")
-                    # 전체 컬럼명 중 일부 표시
-                    전체_컬럼들 = list(작업_데이터.columns)
-                    st.info(f"🔍 전체 컬럼 수: {len(전체_컬럼들)}개")
-                    st.info(f"🔍 컬럼 예시: {전체_컬럼들[:10]}")
+        # 디버깅 정보
+        if not 작업_데이터.empty:
+            원인분석_컬럼들 = hazard_columns(작업_데이터)
+            if 원인분석_컬럼들:
+                st.info(f"🔍 원인분석 관련 컬럼 {len(원인분석_컬럼들)}개 발견")
+                # 처음 몇 개 컬럼명 표시
+                st.info(f"🔍 컬럼 예시: {원인분석_컬럼들[:3]}")
+            else:
+                st.warning("⚠️ 원인분석 관련 컬럼을 찾을 수 없습니다.")
+                # 전체 컬럼명 중 일부 표시
+                전체_컬럼들 = list(작업_데이터.columns)
+                st.info(f"🔍 전체 컬럼 수: {len(전체_컬럼들)}개")
+                st.info(f"🔍 컬럼 예시: {전체_컬럼들[:10]}")
             
-            # 각 행에서 원인분석 데이터 추출
-            st.info(f"🔍 {len(작업_데이터)}개 행에서 원인분석 데이터 검색 중...")
-            for idx, row in 작업_데이터.iterrows():
-                # 최대 5개의 원인분석 항목 확인
-                for j in range(5):
-                    유형_컬럼 = f"유해요인_원인분석_유형_{j+1}"
-                    # 컬럼이 존재하고 값이 있는지 확인
-                    if 유형_컬럼 in row and pd.notna(row[유형_컬럼]) and str(row[유형_컬럼]).strip() != "":
-                        유형_값 = str(row[유형_컬럼]).strip()
-                        st.info(f"🔍 원인분석 항목 {j+1} 발견: {유형_값}")
-                        
-                        hazard_entry = {"유형": 유형_값}
-                        
-                        if hazard_entry["유형"] == "반복동작":
-                            hazard_entry["부담작업"] = safe_convert(row.get(f"유해요인_원인분석_부담작업_{j+1}_반복", ""), str, "")
-                            hazard_entry["수공구 종류"] = safe_convert(row.get(f"유해요인_원인분석_수공구_종류_{j+1}", ""), str, "")
-                            hazard_entry["수공구 용도"] = safe_convert(row.get(f"유해요인_원인분석_수공구_용도_{j+1}", ""), str, "")
-                            hazard_entry["수공구 무게(kg)"] = safe_convert(row.get(f"유해요인_원인분석_수공구_무게(kg)_{j+1}", ""), float, 0.0)
-                            hazard_entry["수공구 사용시간(분)"] = safe_convert(row.get(f"유해요인_원인분석_수공구_사용시간(분)_{j+1}", ""), str, "")
-                            hazard_entry["부담부위"] = safe_convert(row.get(f"유해요인_원인분석_부담부위_{j+1}", ""), str, "")
-                            hazard_entry["회당 반복시간(초/회)"] = safe_convert(row.get(f"유해요인_원인분석_반복_회당시간(초/회)_{j+1}", ""), str, "")
-                            hazard_entry["작업시간동안 반복횟수(회/일)"] = safe_convert(row.get(f"유해요인_원인분석_반복_총횟수(회/일)_{j+1}", ""), str, "")
-                            hazard_entry["총 작업시간(분)"] = safe_convert(row.get(f"유해요인_원인분석_반복_총시간(분)_{j+1}", ""), str, "")
-                            # 10호 관련 필드
-                            hazard_entry["물체 무게(kg)_10호"] = safe_convert(row.get(f"유해요인_원인분석_반복_물체무게_10호(kg)_{j+1}", ""), float, 0.0)
-                            hazard_entry["분당 반복횟수(회/분)_10호"] = safe_convert(row.get(f"유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{j+1}", ""), str, "")
-                            # 12호 정적자세 관련 필드
-                            hazard_entry["작업내용_12호_정적"] = safe_convert(row.get(f"유해요인_원인분석_반복_작업내용_12호_정적_{j+1}", ""), str, "")
-                            hazard_entry["작업시간(분)_12호_정적"] = safe_convert(row.get(f"유해요인_원인분석_반복_작업시간_12호_정적_{j+1}", ""), int, 0)
-                            hazard_entry["휴식시간(분)_12호_정적"] = safe_convert(row.get(f"유해요인_원인분석_반복_휴식시간_12호_정적_{j+1}", ""), int, 0)
-                            hazard_entry["인체부담부위_12호_정적"] = safe_convert(row.get(f"유해요인_원인분석_반복_인체부담부위_12호_정적_{j+1}", ""), str, "")
-                            
-                        elif hazard_entry["유형"] == "부자연스러운 자세":
-                            hazard_entry["부담작업자세"] = safe_convert(row.get(f"유해요인_원인분석_부담작업자세_{j+1}", ""), str, "")
-                            hazard_entry["회당 반복시간(초/회)"] = safe_convert(row.get(f"유해요인_원인분석_자세_회당시간(초/회)_{j+1}", ""), str, "")
-                            hazard_entry["작업시간동안 반복횟수(회/일)"] = safe_convert(row.get(f"유해요인_원인분석_자세_총횟수(회/일)_{j+1}", ""), str, "")
-                            hazard_entry["총 작업시간(분)"] = safe_convert(row.get(f"유해요인_원인분석_자세_총시간(분)_{j+1}", ""), str, "")
-                            
-                        elif hazard_entry["유형"] == "과도한 힘":
-                            hazard_entry["부담작업"] = safe_convert(row.get(f"유해요인_원인분석_부담작업_{j+1}_힘", ""), str, "")
-                            hazard_entry["중량물 명칭"] = safe_convert(row.get(f"유해요인_원인분석_힘_중량물_명칭_{j+1}", ""), str, "")
-                            hazard_entry["중량물 용도"] = safe_convert(row.get(f"유해요인_원인분석_힘_중량물_용도_{j+1}", ""), str, "")
-                            hazard_entry["중량물 무게(kg)"] = safe_convert(row.get(f"유해요인_원인분석_중량물_무게(kg)_{j+1}", ""), float, 0.0)
-                            hazard_entry["하루 8시간동안 중량물을 드는 횟수(회)"] = safe_convert(row.get(f"유해요인_원인분석_하루8시간_중량물_횟수(회)_{j+1}", ""), int, 0)
-                            hazard_entry["취급방법"] = safe_convert(row.get(f"유해요인_원인분석_힘_취급방법_{j+1}", ""), str, "")
-                            hazard_entry["중량물 이동방법"] = safe_convert(row.get(f"유해요인_원인분석_힘_이동방법_{j+1}", ""), str, "")
-                            hazard_entry["작업자가 직접 밀고/당기기"] = safe_convert(row.get(f"유해요인_원인분석_힘_직접_밀당_{j+1}", ""), str, "")
-                            hazard_entry["기타_밀당_설명"] = safe_convert(row.get(f"유해요인_원인분석_힘_기타_밀당_설명_{j+1}", ""), str, "")
-                            hazard_entry["작업시간동안 작업횟수(회/일)"] = safe_convert(row.get(f"유해요인_원인분석_힘_총횟수(회/일)_{j+1}", ""), str, "")
-                            
-                        elif hazard_entry["유형"] == "접촉스트레스 또는 기타(진동, 밀고 당기기 등)":
-                            hazard_entry["부담작업"] = safe_convert(row.get(f"유해요인_원인분석_부담작업_{j+1}_기타", ""), str, "")
-                            if hazard_entry["부담작업"] == "(11호)접촉스트레스":
-                                hazard_entry["작업시간(분)"] = safe_convert(row.get(f"유해요인_원인분석_기타_작업시간(분)_{j+1}", ""), str, "")
-                            elif hazard_entry["부담작업"] == "(12호)진동작업(그라인더, 임팩터 등)":
-                                hazard_entry["진동수공구명"] = safe_convert(row.get(f"유해요인_원인분석_기타_진동수공구명_{j+1}", ""), str, "")
-                                hazard_entry["진동수공구 용도"] = safe_convert(row.get(f"유해요인_원인분석_기타_진동수공구_용도_{j+1}", ""), str, "")
-                                hazard_entry["작업시간(분)_진동"] = safe_convert(row.get(f"유해요인_원인분석_기타_작업시간_진동_{j+1}", ""), str, "")
-                                hazard_entry["작업빈도(초/회)_진동"] = safe_convert(row.get(f"유해요인_원인분석_기타_작업빈도_진동_{j+1}", ""), str, "")
-                                hazard_entry["작업량(회/일)_진동"] = safe_convert(row.get(f"유해요인_원인분석_기타_작업량_진동_{j+1}", ""), str, "")
-                                hazard_entry["수공구사용시 지지대가 있는가?"] = safe_convert(row.get(f"유해요인_원인분석_기타_지지대_여부_{j+1}", ""), str, "")
-                        
-                        엑셀_원인분석_데이터.append(hazard_entry)
+            # 각 행에서 원인분석 데이터 추출 (행마다 최대 5개 항목)
+            엑셀_원인분석_데이터 = extract_hazard_entries(작업_데이터)
+            if 엑셀_원인분석_데이터:
+                st.info(f"🔍 {len(작업_데이터)}개 행에서 원인분석 항목 발견: {', '.join(entry['유형'] for entry in 엑셀_원인분석_데이터)}")
         
         # 엑셀에서 데이터를 가져왔으면 사용, 없으면 기본값
         if 엑셀_원인분석_데이터:
             st.session_state[원인분석_key] = 엑셀_원인분석_데이터
             st.success(f"✅ 엑셀에서 {len(엑셀_원인분석_데이터)}개의 원인분석 항목을 자동으로 로드했습니다!")
         else:
-            st.session_state[원인분석_key] = [{"유형": "", "부담작업": "", "부담작업자세": ""}]
+            st.session_state[원인분석_key] = [dict(빈_항목)]
             st.warning("⚠️ 엑셀에서 원인분석 데이터를 찾을 수 없습니다.")
             st.info("💡 원인분석 데이터는 '유해요인_원인분석_유형_1', '유해요인_원인분석_유형_2' 등의 컬럼명으로 저장되어야 합니다.")
     else:
@@ -368,7 +269,7 @@ def render_hazard_analysis_section(selected_작업명, selected_회사명_조건
         st.markdown("**유해요인 원인분석**")
     with col_hazard_add_btn:
         if st.button(f"항목 추가", key=f"add_hazard_analysis_{selected_작업명}"):
-            st.session_state[원인분석_key].append({"유형": "", "부담작업": "", "부담작업자세": ""})
+            st.session_state[원인분석_key].append(dict(빈_항목))
             st.rerun()
     
     current_hazard_analysis_data = st.session_state[원인분석_key]
@@ -421,7 +322,6 @@ def render_hazard_analysis_section(selected_작업명, selected_회사명_조건
             # 총 작업시간(분) 자동 계산
             calculated_total_work_time = 0.0
             try:
-                from utils import parse_value
                 parsed_회당_반복시간 = parse_value(회당_반복시간_초_회, val_type=float)
                 parsed_작업시간동안_반복횟수 = parse_value(작업시간동안_반복횟수_회_일, val_type=float)
                 
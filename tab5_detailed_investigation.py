@@ -1,63 +1,171 @@
 import streamlit as st
-import pandas as pd
+from utils import keep_widget, editor_fragment, store_editor_result
+from wmsd_core.investigations import (investigation_ids, add_investigation, delete_investigation,
+                            investigation_key, empty_cause_table, 평가_키, 평가_편집기_키)
 
 def render_detailed_investigation_tab():
     """정밀조사 탭 렌더링"""
     st.title("정밀조사")
     
-    if "정밀조사_목록" not in st.session_state:
-        st.session_state["정밀조사_목록"] = []
-    
+    조사_목록 = investigation_ids(st.session_state)
+
     col1, col2 = st.columns([0.7, 0.3])
     with col1:
         st.subheader("정밀조사 항목 관리")
     with col2:
         if st.button("➕ 새 정밀조사 추가", use_container_width=True):
-            조사명 = f"정밀조사_{len(st.session_state['정밀조사_목록'])+1}"
-            st.session_state["정밀조사_목록"].append(조사명)
+            add_investigation(st.session_state)
             st.rerun()
     
-    if st.session_state["정밀조사_목록"]:
-        for 조사명 in st.session_state["정밀조사_목록"]:
+    if 조사_목록:
+        for 조사명 in 조사_목록:
             with st.expander(f"📋 {조사명}", expanded=True):
                 col1, col2, col3 = st.columns([0.3, 0.3, 0.4])
                 with col1:
-                    작업공정명 = st.text_input("작업공정명", key=f"정밀_작업공정명_{조사명}")
+                    작업공정명 = st.text_input("작업공정명", key=keep_widget(investigation_key("작업공정명", 조사명)))
                 with col2:
-                    작업명 = st.text_input("작업명", key=f"정밀_작업명_{조사명}")
+                    작업명 = st.text_input("작업명", key=keep_widget(investigation_key("작업명", 조사명)))
                 with col3:
                     if st.button(f"🗑️ {조사명} 삭제", key=f"delete_{조사명}"):
-                        st.session_state["정밀조사_목록"].remove(조사명)
-                        # 관련 데이터도 삭제
-                        keys_to_delete = [k for k in st.session_state.keys() if 조사명 in k]
-                        for key in keys_to_delete:
-                            del st.session_state[key]
+                        # 관련 데이터도 삭제 (이 조사의 키만)
+                        delete_investigation(st.session_state, 조사명)
                         st.rerun()
                 
-                # 원인분석 섹션
-                원인분석_key = f"정밀_원인분석_data_{조사명}"
-                if 원인분석_key not in st.session_state:
-                    st.session_state[원인분석_key] = pd.DataFrame({
-                        "작업내용": [""],
-                        "유해요인": [""],
-                        "개선방안": [""]
-                    })
-                
-                st.markdown("#### 원인분석")
-                
-                원인분석_data = st.data_editor(
-                    st.session_state[원인분석_key],
-                    num_rows="dynamic",
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "작업내용": st.column_config.TextColumn("작업내용", width="medium"),
-                        "유해요인": st.column_config.TextColumn("유해요인", width="medium"),
-                        "개선방안": st.column_config.TextColumn("개선방안", width="medium"),
-                    },
-                    key=f"정밀_원인분석_editor_{조사명}"
-                )
-                
-                st.session_state[원인분석_key] = 원인분석_data
+                render_cause_analysis_editor(조사명)
     else:
-        st.info("아직 정밀조사 항목이 없습니다. 위의 '새 정밀조사 추가' 버튼을 클릭하여 추가하세요.")
\ No newline at end of file
+        st.info("아직 정밀조사 항목이 없습니다. 위의 '새 정밀조사 추가' 버튼을 클릭하여 추가하세요.")
+
+    st.markdown("---")
+    render_ergonomic_assessment()
+
+
+def _fill_from_work_conditions():
+    """작업조건조사(tab4)의 '과도한 힘', '부자연스러운 자세' 항목으로 평가 입력 표 채우기"""
+    from wmsd_core import ergonomics
+    from wmsd_core.work_model import build_site
+
+    hazards = build_site(st.session_state).원인분석
+    st.session_state[평가_키["NIOSH"]] = ergonomics.prefill_lifting(hazards)
+    st.session_state[평가_키["자세평가"]] = ergonomics.prefill_postures(hazards)
+    # 이전 표 기준의 편집 내용이 새 표에 덮어쓰이지 않도록
+    for key in 평가_편집기_키.values():
+        st.session_state.pop(key, None)
+    st.session_state["data_changed"] = True
+
+
+def render_ergonomic_assessment():
+    """인간공학적 평가 (NIOSH 들기 작업 식, RULA, REBA)"""
+    col1, col2 = st.columns([0.7, 0.3])
+    with col1:
+        st.subheader("인간공학적 평가 (NIOSH / RULA / REBA)")
+    with col2:
+        if st.button("📥 작업조건조사에서 불러오기", use_container_width=True,
+                     help="작업조건조사의 '과도한 힘', '부자연스러운 자세' 항목으로 입력 표를 다시 채웁니다 (현재 입력은 바뀝니다)"):
+            _fill_from_work_conditions()
+            st.rerun()
+
+    # 처음 열 때는 작업조건조사 내용으로 채움
+    if any(key not in st.session_state for key in 평가_키.values()):
+        _fill_from_work_conditions()
+
+    niosh_tab, posture_tab = st.tabs(["NIOSH 들기 작업", "RULA / REBA 자세 평가"])
+    with niosh_tab:
+        render_lifting_editor()
+    with posture_tab:
+        render_posture_editor()
+
+
+@editor_fragment
+def render_lifting_editor():
+    """NIOSH 입력 편집과 결과 (셀 편집 시 이 영역만 다시 실행)"""
+    from wmsd_core import ergonomics
+
+    st.caption("하중상수 23kg 기준 개정 NIOSH 식입니다. 들기지수(LI)가 1 이하면 적정, 3 이하면 위험 증가, 3 초과면 고위험입니다.")
+    data = st.data_editor(
+        st.session_state[평가_키["NIOSH"]],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "작업명": st.column_config.TextColumn("작업명"),
+            "하중(kg)": st.column_config.NumberColumn("하중(kg)", min_value=0.0, format="%.1f"),
+            "수평거리(cm)": st.column_config.NumberColumn("수평거리(cm)", min_value=0.0, help="발목 중앙에서 손까지의 수평 거리"),
+            "수직높이(cm)": st.column_config.NumberColumn("수직높이(cm)", min_value=0.0, help="바닥에서 손까지의 높이 (들기 시작점)"),
+            "이동거리(cm)": st.column_config.NumberColumn("이동거리(cm)", min_value=0.0, help="들기 시작점과 끝점의 수직 거리"),
+            "비대칭각도(°)": st.column_config.NumberColumn("비대칭각도(°)", min_value=0.0, max_value=180.0),
+            "빈도(회/분)": st.column_config.NumberColumn("빈도(회/분)", min_value=0.0, format="%.3f"),
+            "작업시간(시간)": st.column_config.NumberColumn("작업시간(시간)", min_value=0.0, max_value=24.0),
+            "손잡이": st.column_config.SelectboxColumn("손잡이", options=ergonomics.손잡이_종류),
+        },
+        key=평가_편집기_키["NIOSH"]
+    )
+    store_editor_result(평가_키["NIOSH"], data)
+
+    if data.empty:
+        st.info("평가할 들기 작업이 없습니다. 행을 추가하거나 작업조건조사에서 불러오세요.")
+        return
+    result = ergonomics.niosh_lifting(data)
+    판정 = result["판정"].value_counts()
+    cols = st.columns(4)
+    for col, 이름 in zip(cols, ["적정", "위험 증가", "고위험", "입력 필요"]):
+        col.metric(이름, f"{판정.get(이름, 0)}건")
+    st.dataframe(result[["작업명", "HM", "VM", "DM", "AM", "FM", "CM", "RWL(kg)", "LI", "판정"]],
+                 use_container_width=True, hide_index=True)
+
+
+@editor_fragment
+def render_posture_editor():
+    """RULA/REBA 자세 입력 편집과 결과 (셀 편집 시 이 영역만 다시 실행)"""
+    from wmsd_core import ergonomics
+
+    st.caption("각도는 굽힘이 +, 폄이 - 입니다. 같은 입력으로 RULA(1~7)와 REBA(1~15)를 함께 계산합니다.")
+    각도 = {col: st.column_config.NumberColumn(col, min_value=-180.0, max_value=180.0)
+            for col in ["상완(°)", "전완(°)", "손목(°)", "목(°)", "몸통(°)", "무릎(°)"]}
+    data = st.data_editor(
+        st.session_state[평가_키["자세평가"]],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "작업명": st.column_config.TextColumn("작업명"),
+            **각도,
+            "하중(kg)": st.column_config.NumberColumn("하중(kg)", min_value=0.0, format="%.1f"),
+            "정적/반복": st.column_config.CheckboxColumn("정적/반복", help="1분 넘게 같은 자세를 유지하거나 분당 4회 넘게 반복"),
+            "손잡이": st.column_config.SelectboxColumn("손잡이", options=ergonomics.REBA_손잡이_종류),
+        },
+        key=평가_편집기_키["자세평가"]
+    )
+    store_editor_result(평가_키["자세평가"], data)
+
+    if data.empty:
+        st.info("평가할 자세가 없습니다. 행을 추가하거나 작업조건조사에서 불러오세요.")
+        return
+    result = ergonomics.posture_scores(data)
+    st.dataframe(result[["작업명", "RULA", "RULA 조치수준", "REBA", "REBA 위험수준"]],
+                 use_container_width=True, hide_index=True)
+
+
+@editor_fragment
+def render_cause_analysis_editor(조사명):
+    """정밀조사 원인분석 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    # 원인분석 섹션
+    원인분석_key = investigation_key("원인분석", 조사명)
+    if 원인분석_key not in st.session_state:
+        st.session_state[원인분석_key] = empty_cause_table()
+
+    st.markdown("#### 원인분석")
+
+    원인분석_data = st.data_editor(
+        st.session_state[원인분석_key],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "작업내용": st.column_config.TextColumn("작업내용", width="medium"),
+            "유해요인": st.column_config.TextColumn("유해요인", width="medium"),
+            "개선방안": st.column_config.TextColumn("개선방안", width="medium"),
+        },
+        key=f"정밀_원인분석_editor_{조사명}"
+    )
+
+    store_editor_result(원인분석_key, 원인분석_data)
@@ -1,187 +1,318 @@
 import streamlit as st
 import pandas as pd
+from io import BytesIO
+from wmsd_core.symptom_survey import (
+    normalize_responses, sample_responses, empty_aggregates, fold_batch,
+    retract_responses, materialize_tables, aggregates_from_tables,
+    finalize_sex_table, finalize_burden_table, finalize_pain_table,
+    설문_필수_컬럼, 설문_선택_컬럼, 통증부위_목록
+)
+from utils import editor_fragment, store_editor_result
+from frame_store import share
+import profiler
+
+
+def render_survey_upload_section():
+    """개인별 증상조사 설문 업로드 섹션"""
+    with st.expander("📤 개인별 설문 응답 업로드"):
+        st.info(f"""
+        📌 **설문 응답 파일 양식 가이드:**
+        - **필수 컬럼:** {', '.join(f'`{col}`' for col in 설문_필수_컬럼)}
+        - **선택 컬럼:** {', '.join(f'`{col}`' for col in 설문_선택_컬럼)} (또는 `부서`, `공정`)
+        - **통증부위:** `통증부위` 컬럼에 `목, 어깨`처럼 쉼표로 구분하여 입력하거나, {', '.join(f'`{부위}`' for 부위 in 통증부위_목록)} 컬럼에 `O`/`X`로 입력해주세요.
+        - **육체적부담:** `매우 쉬움` ~ `매우 힘듦` 또는 `1` ~ `5`로 입력해주세요.
+
+        💡 업로드하면 기초현황, 작업기간, 육체적부담, 통증호소자 표가 자동으로 집계됩니다.
+        💡 교대조별로 나누어 받은 설문은 **누적 반영**하세요. 이미 반영된 `응답자ID`가 다시 들어오면 정정으로 처리됩니다.
+        """)
+
+        uploaded_survey = st.file_uploader("설문 응답 파일 선택", type=['xlsx', 'xls', 'csv'], key="증상조사_설문_업로드")
+
+        if uploaded_survey is not None:
+            try:
+                profiler.record_size("설문 응답 업로드", uploaded_survey.size)
+                with st.spinner("📊 설문 응답을 읽는 중..."), profiler.span("excel_parse:설문 응답", "io"):
+                    if uploaded_survey.name.lower().endswith(".csv"):
+                        raw_df = pd.read_csv(uploaded_survey)
+                    else:
+                        raw_df = pd.read_excel(uploaded_survey, engine='openpyxl')
+                    responses, missing_columns = normalize_responses(raw_df)
+
+                if missing_columns:
+                    st.error(f"❌ 설문 응답 파일에 필수 컬럼이 누락되었습니다: **{', '.join(missing_columns)}**")
+                else:
+                    분류_누락 = int(responses[["성별", "연령대", "근무기간", "육체적부담"]].isna().any(axis=1).sum())
+                    st.success(f"✅ 응답 {len(responses):,}건을 확인했습니다.")
+                    if 분류_누락:
+                        st.warning(f"⚠️ 성별/나이/근무기간/육체적부담 값을 인식하지 못한 응답 {분류_누락:,}건은 해당 표에서 제외됩니다.")
+
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        누적_반영 = st.button("➕ 누적 반영", use_container_width=True)
+                    with col2:
+                        전체_교체 = st.button("🔄 전체 교체", use_container_width=True)
+
+                    if 누적_반영 or 전체_교체:
+                        if 전체_교체:
+                            st.session_state["증상조사_집계"] = empty_aggregates()
+                        elif "증상조사_집계" not in st.session_state:
+                            # 직접 입력했거나 응답 기록 없이 불러온 표가 있으면 그 건수에 이어서 누적
+                            st.session_state["증상조사_집계"] = aggregates_from_tables(st.session_state)
+                        신규, 정정 = fold_batch(st.session_state["증상조사_집계"], responses)
+                        st.session_state["증상조사_반영결과"] = f"✅ 신규 {신규:,}건, 정정 {정정:,}건을 반영했습니다!"
+                        st.rerun()
+            except Exception as e:
+                st.error(f"❌ 파일 읽기 오류: {str(e)}")
+
+        if "증상조사_반영결과" in st.session_state:
+            st.success(st.session_state.pop("증상조사_반영결과"))
+
+        집계 = st.session_state.get("증상조사_집계")
+        if 집계 is not None:
+            st.markdown("##### 응답 철회 / 집계 해제")
+            철회_ID = st.text_area(
+                "철회할 응답자ID (줄바꿈 또는 쉼표로 구분)",
+                key="증상조사_철회_ID",
+                placeholder="R0001, R0002"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("↩️ 응답 철회", use_container_width=True):
+                    ids = [rid.strip() for rid in 철회_ID.replace(",", "\n").splitlines() if rid.strip()]
+                    철회 = retract_responses(집계, ids)
+                    st.session_state["증상조사_반영결과"] = f"✅ 응답 {철회:,}건을 철회했습니다!"
+                    st.rerun()
+            with col2:
+                if st.button("🗑️ 집계 해제 (직접 입력)", use_container_width=True):
+                    # 현재 집계값을 편집표의 초기값으로 남기고 직접 입력 모드로 전환
+                    for key, table in materialize_tables(집계).items():
+                        st.session_state[key] = table
+                        st.session_state.pop(key.replace("_data", "_editor"), None)
+                    del st.session_state["증상조사_집계"]
+                    st.rerun()
+
+        sample_output = BytesIO()
+        with pd.ExcelWriter(sample_output, engine='openpyxl') as writer:
+            sample_responses().to_excel(writer, sheet_name='설문응답', index=False)
+        sample_output.seek(0)
+
+        st.download_button(
+            label="📥 설문 응답 샘플 다운로드",
+            data=sample_output,
+            file_name="증상조사_설문응답_샘플.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+
+def render_aggregate_views(집계):
+    """누적 집계로부터 계산한 증상조사 표 표시 (설문 업로드 모드)"""
+    tables = materialize_tables(집계)
+    # 저장/보고서에서 사용하는 키에 집계 결과 반영
+    for key, table in tables.items():
+        st.session_state[key] = table
+
+    st.info(f"📊 설문 응답 {len(집계['records']):,}건의 누적 집계 결과입니다. 직접 입력하려면 위에서 집계를 해제하세요.")
+
+    sub_tabs = st.tabs(["기초현황", "작업기간", "육체적부담", "통증호소자"])
+    for sub_tab, 제목, key in zip(
+        sub_tabs,
+        ["기초현황", "작업기간별 인원현황", "육체적 부담정도", "통증호소자 현황"],
+        ["기초현황_data", "작업기간_data", "육체적부담_data", "통증호소자_data"]
+    ):
+        with sub_tab:
+            st.subheader(제목)
+            st.dataframe(tables[key], use_container_width=True, hide_index=True)
+
 
 def render_symptom_analysis_tab():
     """증상조사 분석 탭 렌더링"""
     st.title("증상조사 분석")
     
+    render_survey_upload_section()
+    
+    if st.session_state.get("증상조사_집계") is not None:
+        render_aggregate_views(st.session_state["증상조사_집계"])
+        return
+    
     # 서브탭 생성
     sub_tabs = st.tabs(["기초현황", "작업기간", "육체적부담", "통증호소자"])
     
     # 6-1. 기초현황
     with sub_tabs[0]:
-        st.subheader("기초현황")
-        
-        if "기초현황_data" not in st.session_state:
-            st.session_state["기초현황_data"] = pd.DataFrame({
-                "구분": ["남", "여", "계"],
-                "20대": [0, 0, 0],
-                "30대": [0, 0, 0],
-                "40대": [0, 0, 0],
-                "50대": [0, 0, 0],
-                "60대 이상": [0, 0, 0],
-                "계": [0, 0, 0]
-            })
-        
-        기초현황_data = st.data_editor(
-            st.session_state["기초현황_data"],
-            use_container_width=True,
-            hide_index=True,
-            disabled=["구분"],
-            column_config={
-                "구분": st.column_config.TextColumn("구분", disabled=True),
-                "20대": st.column_config.NumberColumn("20대", min_value=0, max_value=1000, step=1),
-                "30대": st.column_config.NumberColumn("30대", min_value=0, max_value=1000, step=1),
-                "40대": st.column_config.NumberColumn("40대", min_value=0, max_value=1000, step=1),
-                "50대": st.column_config.NumberColumn("50대", min_value=0, max_value=1000, step=1),
-                "60대 이상": st.column_config.NumberColumn("60대 이상", min_value=0, max_value=1000, step=1),
-                "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
-            },
-            key="기초현황_editor"
-        )
-        
-        # 자동 계산
-        for idx in range(2):  # 남, 여
-            기초현황_data.at[idx, "계"] = sum(기초현황_data.iloc[idx, 1:6])
-        
-        # 계 행 자동 계산
-        for col in ["20대", "30대", "40대", "50대", "60대 이상", "계"]:
-            기초현황_data.at[2, col] = 기초현황_data.iloc[0:2][col].sum()
-        
-        st.session_state["기초현황_data"] = 기초현황_data
-        st.session_state["기초현황_data_저장"] = 기초현황_data.copy()
-        
-        # 계산된 결과 표시
-        st.markdown("##### 계산 결과")
-        st.dataframe(기초현황_data, use_container_width=True, hide_index=True)
+        render_basic_status_editor()
     
     # 6-2. 작업기간
     with sub_tabs[1]:
-        st.subheader("작업기간별 인원현황")
-        
-        if "작업기간_data" not in st.session_state:
-            st.session_state["작업기간_data"] = pd.DataFrame({
-                "구분": ["남", "여", "계"],
-                "1년 미만": [0, 0, 0],
-                "1~5년": [0, 0, 0],
-                "5~10년": [0, 0, 0],
-                "10년 이상": [0, 0, 0],
-                "계": [0, 0, 0]
-            })
-        
-        작업기간_data = st.data_editor(
-            st.session_state["작업기간_data"],
-            use_container_width=True,
-            hide_index=True,
-            disabled=["구분"],
-            column_config={
-                "구분": st.column_config.TextColumn("구분", disabled=True),
-                "1년 미만": st.column_config.NumberColumn("1년 미만", min_value=0, max_value=1000, step=1),
-                "1~5년": st.column_config.NumberColumn("1~5년", min_value=0, max_value=1000, step=1),
-                "5~10년": st.column_config.NumberColumn("5~10년", min_value=0, max_value=1000, step=1),
-                "10년 이상": st.column_config.NumberColumn("10년 이상", min_value=0, max_value=1000, step=1),
-                "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
-            },
-            key="작업기간_editor"
-        )
-        
-        # 자동 계산
-        for idx in range(2):  # 남, 여
-            작업기간_data.at[idx, "계"] = sum(작업기간_data.iloc[idx, 1:5])
-        
-        # 계 행 자동 계산
-        for col in ["1년 미만", "1~5년", "5~10년", "10년 이상", "계"]:
-            작업기간_data.at[2, col] = 작업기간_data.iloc[0:2][col].sum()
-        
-        st.session_state["작업기간_data"] = 작업기간_data
-        st.session_state["작업기간_data_저장"] = 작업기간_data.copy()
-        
-        # 계산된 결과 표시
-        st.markdown("##### 계산 결과")
-        st.dataframe(작업기간_data, use_container_width=True, hide_index=True)
+        render_work_period_editor()
     
     # 6-3. 육체적부담
     with sub_tabs[2]:
-        st.subheader("육체적 부담정도")
-        
-        if "육체적부담_data" not in st.session_state:
-            st.session_state["육체적부담_data"] = pd.DataFrame({
-                "구분": ["매우 쉬움", "쉬움", "약간 힘듦", "힘듦", "매우 힘듦", "계"],
-                "남": [0, 0, 0, 0, 0, 0],
-                "여": [0, 0, 0, 0, 0, 0],
-                "계": [0, 0, 0, 0, 0, 0]
-            })
-        
-        육체적부담_data = st.data_editor(
-            st.session_state["육체적부담_data"],
-            use_container_width=True,
-            hide_index=True,
-            disabled=["구분"],
-            column_config={
-                "구분": st.column_config.TextColumn("구분", disabled=True),
-                "남": st.column_config.NumberColumn("남", min_value=0, max_value=1000, step=1),
-                "여": st.column_config.NumberColumn("여", min_value=0, max_value=1000, step=1),
-                "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
-            },
-            key="육체적부담_editor"
-        )
-        
-        # 자동 계산
-        for idx in range(5):  # 각 부담 정도
-            육체적부담_data.at[idx, "계"] = 육체적부담_data.iloc[idx, 1:3].sum()
-        
-        # 계 행 자동 계산
-        for col in ["남", "여", "계"]:
-            육체적부담_data.at[5, col] = 육체적부담_data.iloc[0:5][col].sum()
-        
-        st.session_state["육체적부담_data"] = 육체적부담_data
-        st.session_state["육체적부담_data_저장"] = 육체적부담_data.copy()
-        
-        # 계산된 결과 표시
-        st.markdown("##### 계산 결과")
-        st.dataframe(육체적부담_data, use_container_width=True, hide_index=True)
+        render_burden_editor()
     
     # 6-4. 통증호소자
     with sub_tabs[3]:
-        st.subheader("통증호소자 현황")
-        
-        # 부위별 컬럼 정의
-        부위_columns = ["목", "어깨", "등/허리", "팔/팔꿈치", "손/손목/손가락", "다리/발", "계"]
-        
-        if "통증호소자_data" not in st.session_state:
-            st.session_state["통증호소자_data"] = pd.DataFrame({
-                "부서/공정": [""],
-                **{부위: [0] for 부위 in 부위_columns}
-            })
-        
-        통증호소자_data = st.data_editor(
-            st.session_state["통증호소자_data"],
-            num_rows="dynamic",
-            use_container_width=True,
-            hide_index=True,
-            column_config={
-                "부서/공정": st.column_config.TextColumn("부서/공정", width="medium"),
-                **{부위: st.column_config.NumberColumn(부위, min_value=0, max_value=1000, step=1) 
-                   for 부위 in 부위_columns}
-            },
-            key="통증호소자_editor"
-        )
-        
-        # 계 열 자동 계산
-        for idx in range(len(통증호소자_data)):
-            통증호소자_data.at[idx, "계"] = sum(통증호소자_data.iloc[idx, 1:7])
-        
-        st.session_state["통증호소자_data"] = 통증호소자_data
-        st.session_state["통증호소자_data_저장"] = 통증호소자_data.copy()
-        
-        # 합계 행 추가
-        if len(통증호소자_data) > 0:
-            합계_row = {"부서/공정": "합계"}
-            for 부위 in 부위_columns:
-                합계_row[부위] = 통증호소자_data[부위].sum()
-            
-            # 합계를 포함한 전체 데이터 표시
-            display_data = pd.concat([통증호소자_data, pd.DataFrame([합계_row])], ignore_index=True)
-            
-            st.markdown("##### 계산 결과 (합계 포함)")
-            st.dataframe(display_data, use_container_width=True, hide_index=True)
\ No newline at end of file
+        render_pain_editor()
+
+
+@editor_fragment
+def render_basic_status_editor():
+    """기초현황 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    st.subheader("기초현황")
+
+    if "기초현황_data" not in st.session_state:
+        st.session_state["기초현황_data"] = share(pd.DataFrame({
+            "구분": ["남", "여", "계"],
+            "20대": [0, 0, 0],
+            "30대": [0, 0, 0],
+            "40대": [0, 0, 0],
+            "50대": [0, 0, 0],
+            "60대 이상": [0, 0, 0],
+            "계": [0, 0, 0]
+        }))
+
+    기초현황_data = st.data_editor(
+        st.session_state["기초현황_data"],
+        use_container_width=True,
+        hide_index=True,
+        disabled=["구분"],
+        column_config={
+            "구분": st.column_config.TextColumn("구분", disabled=True),
+            "20대": st.column_config.NumberColumn("20대", min_value=0, max_value=1000, step=1),
+            "30대": st.column_config.NumberColumn("30대", min_value=0, max_value=1000, step=1),
+            "40대": st.column_config.NumberColumn("40대", min_value=0, max_value=1000, step=1),
+            "50대": st.column_config.NumberColumn("50대", min_value=0, max_value=1000, step=1),
+            "60대 이상": st.column_config.NumberColumn("60대 이상", min_value=0, max_value=1000, step=1),
+            "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
+        },
+        key="기초현황_editor"
+    )
+
+    # 계 컬럼, 계 행 자동 계산
+    기초현황_data = finalize_sex_table(기초현황_data, ["20대", "30대", "40대", "50대", "60대 이상"])
+
+    store_editor_result("기초현황_data", 기초현황_data)
+
+    # 계산된 결과 표시
+    st.markdown("##### 계산 결과")
+    st.dataframe(기초현황_data, use_container_width=True, hide_index=True)
+
+
+@editor_fragment
+def render_work_period_editor():
+    """작업기간별 인원현황 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    st.subheader("작업기간별 인원현황")
+
+    if "작업기간_data" not in st.session_state:
+        st.session_state["작업기간_data"] = share(pd.DataFrame({
+            "구분": ["남", "여", "계"],
+            "1년 미만": [0, 0, 0],
+            "1~5년": [0, 0, 0],
+            "5~10년": [0, 0, 0],
+            "10년 이상": [0, 0, 0],
+            "계": [0, 0, 0]
+        }))
+
+    작업기간_data = st.data_editor(
+        st.session_state["작업기간_data"],
+        use_container_width=True,
+        hide_index=True,
+        disabled=["구분"],
+        column_config={
+            "구분": st.column_config.TextColumn("구분", disabled=True),
+            "1년 미만": st.column_config.NumberColumn("1년 미만", min_value=0, max_value=1000, step=1),
+            "1~5년": st.column_config.NumberColumn("1~5년", min_value=0, max_value=1000, step=1),
+            "5~10년": st.column_config.NumberColumn("5~10년", min_value=0, max_value=1000, step=1),
+            "10년 이상": st.column_config.NumberColumn("10년 이상", min_value=0, max_value=1000, step=1),
+            "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
+        },
+        key="작업기간_editor"
+    )
+
+    # 계 컬럼, 계 행 자동 계산
+    작업기간_data = finalize_sex_table(작업기간_data, ["1년 미만", "1~5년", "5~10년", "10년 이상"])
+
+    store_editor_result("작업기간_data", 작업기간_data)
+
+    # 계산된 결과 표시
+    st.markdown("##### 계산 결과")
+    st.dataframe(작업기간_data, use_container_width=True, hide_index=True)
+
+
+@editor_fragment
+def render_burden_editor():
+    """육체적 부담정도 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    st.subheader("육체적 부담정도")
+
+    if "육체적부담_data" not in st.session_state:
+        st.session_state["육체적부담_data"] = share(pd.DataFrame({
+            "구분": ["매우 쉬움", "쉬움", "약간 힘듦", "힘듦", "매우 힘듦", "계"],
+            "남": [0, 0, 0, 0, 0, 0],
+            "여": [0, 0, 0, 0, 0, 0],
+            "계": [0, 0, 0, 0, 0, 0]
+        }))
+
+    육체적부담_data = st.data_editor(
+        st.session_state["육체적부담_data"],
+        use_container_width=True,
+        hide_index=True,
+        disabled=["구분"],
+        column_config={
+            "구분": st.column_config.TextColumn("구분", disabled=True),
+            "남": st.column_config.NumberColumn("남", min_value=0, max_value=1000, step=1),
+            "여": st.column_config.NumberColumn("여", min_value=0, max_value=1000, step=1),
+            "계": st.column_config.NumberColumn("계", min_value=0, max_value=1000, step=1)
+        },
+        key="육체적부담_editor"
+    )
+
+    # 계 컬럼, 계 행 자동 계산
+    육체적부담_data = finalize_burden_table(육체적부담_data)
+
+    store_editor_result("육체적부담_data", 육체적부담_data)
+
+    # 계산된 결과 표시
+    st.markdown("##### 계산 결과")
+    st.dataframe(육체적부담_data, use_container_width=True, hide_index=True)
+
+
+@editor_fragment
+def render_pain_editor():
+    """통증호소자 현황 편집 영역 (셀 편집 시 이 영역만 다시 실행)"""
+    st.subheader("통증호소자 현황")
+
+    # 부위별 컬럼 정의
+    부위_columns = ["목", "어깨", "등/허리", "팔/팔꿈치", "손/손목/손가락", "다리/발", "계"]
+
+    if "통증호소자_data" not in st.session_state:
+        st.session_state["통증호소자_data"] = share(pd.DataFrame({
+            "부서/공정": [""],
+            **{부위: [0] for 부위 in 부위_columns}
+        }))
+
+    통증호소자_data = st.data_editor(
+        st.session_state["통증호소자_data"],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "부서/공정": st.column_config.TextColumn("부서/공정", width="medium"),
+            **{부위: st.column_config.NumberColumn(부위, min_value=0, max_value=1000, step=1) 
+               for 부위 in 부위_columns}
+        },
+        key="통증호소자_editor"
+    )
+
+    # 계 열 자동 계산
+    통증호소자_data = finalize_pain_table(통증호소자_data)
+
+    store_editor_result("통증호소자_data", 통증호소자_data)
+
+    # 합계 행 추가
+    if len(통증호소자_data) > 0:
+        합계_row = {"부서/공정": "합계", **통증호소자_data[부위_columns].sum().to_dict()}
+
+        # 합계를 포함한 전체 데이터 표시
+        display_data = pd.concat([통증호소자_data, pd.DataFrame([합계_row])], ignore_index=True)
+
+        st.markdown("##### 계산 결과 (합계 포함)")
+        st.dataframe(display_data, use_container_width=True, hide_index=True)
@@ -1,54 +1,16 @@
 import streamlit as st
-import pandas as pd
 import time
 from datetime import datetime
-import os
-
-# 저장 디렉토리
-SAVE_DIR = "saved_sessions"
-if not os.path.exists(SAVE_DIR):
-    os.makedirs(SAVE_DIR)
-
-def parse_value(value, val_type=float):
-    """문자열 값을 숫자로 변환"""
-    try:
-        if isinstance(value, str):
-            value = value.strip()
-            if value == "":
-                return 0
-            value = value.replace(",", "")
-            return val_type(value)
-        return val_type(value) if value else 0
-    except:
-        return 0
-
-def safe_convert(value, target_type, default_value):
-    """안전한 타입 변환 함수"""
-    if pd.isna(value) or str(value).strip() == "":
-        return default_value
-    try:
-        if target_type == str:
-            return str(value)
-        elif target_type == float:
-            return float(value)
-        elif target_type == int:
-            return int(float(value))
-        else:
-            return value
-    except (ValueError, TypeError):
-        return default_value
-
-def extract_number(value):
-    """작업부하와 작업빈도에서 숫자 추출하는 함수"""
-    if value and "(" in value and ")" in value:
-        return int(value.split("(")[1].split(")")[0])
-    return 0
-
-def calculate_total_score(row):
-    """총점 계산 함수"""
-    부하값 = extract_number(row["작업부하(A)"])
-    빈도값 = extract_number(row["작업빈도(B)"])
-    return 부하값 * 빈도값
+import json
+from functools import wraps
+
+import profiler
+# 계산과 파일 형식은 Streamlit과 무관한 wmsd_core에 있고, 여기서는 세션 상태에 연결만 함
+from wmsd_core import storage
+
+# 부분 재실행 (fragment) 지원 여부 - 구버전은 experimental_fragment, 없으면 일반 함수로 실행
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+FRAGMENT_AVAILABLE = _fragment is not None
 
 def auto_save():
     """자동 저장 기능"""
@@ -56,101 +18,147 @@ def auto_save():
         st.session_state["last_save_time"] = time.time()
     
     current_time = time.time()
-    # 10초마다 자동 저장
-    if current_time - st.session_state["last_save_time"] > 10:
+    # 10초마다, 또는 편집 영역에서 변경이 표시된 뒤 처음 전체 실행될 때 자동 저장
+    if st.session_state.get("data_changed") or current_time - st.session_state["last_save_time"] > 10:
         if st.session_state.get("session_id") and st.session_state.get("workplace"):
             try:
                 from data_manager import save_to_excel
-                success, _ = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"))
+                success, result = save_to_excel(st.session_state["session_id"], st.session_state.get("workplace"), trigger="auto")
                 if success:
                     st.session_state["last_save_time"] = current_time
                     st.session_state["last_successful_save"] = datetime.now()
                     st.session_state["save_count"] = st.session_state.get("save_count", 0) + 1
+                    st.session_state["data_changed"] = False
+                    st.session_state.pop("save_error", None)
+                else:
+                    st.session_state["save_error"] = result
             except Exception as e:
                 st.session_state["save_error"] = str(e)
 
+def _rehydrating(f):
+    """fragment만 다시 실행될 때도 디스크로 내보낸 값을 먼저 되돌림 (전체 실행은 main.py에서 처리)"""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        from session_spill import rehydrate
+        rehydrate()
+        return f(*args, **kwargs)
+    return wrapper
+
+def editor_fragment(func=None, run_every=None):
+    """편집 영역을 fragment로 감쌉니다.
+
+    fragment 안의 위젯을 조작하면 해당 함수만 다시 실행되므로 사이드바, 내보내기,
+    자동 저장 같은 전체 작업은 다음 전체 실행까지 미뤄집니다.
+    """
+    def decorate(f):
+        f = profiler.track_fragment(f)
+        if _fragment is None:
+            return f
+        f = _rehydrating(f)
+        return _fragment(f, run_every=run_every) if run_every else _fragment(f)
+    return decorate(func) if func is not None else decorate
+
+def rerun_fragment():
+    """현재 fragment만 다시 실행 (지원하지 않는 버전에서는 전체 재실행)"""
+    if _fragment is not None:
+        try:
+            st.rerun(scope="fragment")
+        except (TypeError, st.errors.StreamlitAPIException):
+            # 전체 실행 중에 호출된 경우
+            pass
+    st.rerun()
+
+def store_editor_result(key, df):
+    """편집 결과를 세션에 반영하고, 내용이 바뀌었으면 다음 전체 실행 때 저장되도록 표시
+
+    내용이 같으면 기존 표를 그대로 두고, 바뀐 표는 다른 세션과 공유되는 저장소를 거쳐 보관합니다.
+    """
+    import pandas as pd
+    이전 = st.session_state.get(key)
+    if isinstance(이전, pd.DataFrame) and df.equals(이전):
+        return
+    from frame_store import share
+    st.session_state["data_changed"] = True
+    st.session_state[key] = share(df)
+
+def keep_widget(key, default="", options=None):
+    """탭을 옮겨 다녀도 값이 유지되는 위젯 키를 준비합니다.
+
+    위젯에는 value 대신 이 함수가 반환한 key만 전달합니다. options를 주면
+    보관된 값이 선택지에 없을 때 default로 되돌립니다.
+    """
+    보관 = st.session_state.setdefault("_위젯_보관", {})
+    if key not in st.session_state:
+        value = 보관.get(key, default)
+        if options is not None and value not in options:
+            value = default
+        st.session_state[key] = value
+    elif options is not None and st.session_state[key] not in options:
+        st.session_state[key] = default
+    보관[key] = st.session_state[key]
+    return key
+
+
+def sync_widget_state():
+    """보관 중인 위젯 값을 세션 상태와 동기화 (매 실행 시작 시 호출)
+
+    화면에 그려지지 않은 위젯의 값은 Streamlit이 지우므로, 지워진 값은 보관본으로
+    되살리고 남아있는 값은 보관본에 반영합니다.
+    """
+    보관 = st.session_state.get("_위젯_보관")
+    if not 보관:
+        return
+    for key, value in 보관.items():
+        if key in st.session_state:
+            보관[key] = st.session_state[key]
+        else:
+            st.session_state[key] = value
+
+
+# 이 행 수 이상인 DataFrame은 pandas 해시 사용 (작은 표는 값 목록을 직접 해시하는 편이 빠름)
+_대형_표_기준_행수 = 1000
+
+
+def hash_content(hasher, value):
+    """값의 내용을 해시(hashlib 객체)에 반영 - 내용이 같으면 객체가 달라도 같은 해시"""
+    import pandas as pd
+    if isinstance(value, pd.DataFrame):
+        hasher.update(json.dumps([str(col) for col in value.columns], ensure_ascii=False).encode())
+        if len(value) < _대형_표_기준_행수:
+            hasher.update(repr(value.to_numpy().tolist()).encode())
+            return
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=False)
+        except TypeError:
+            hashed = pd.util.hash_pandas_object(value.astype("string"), index=False)
+        hasher.update(hashed.to_numpy().tobytes())
+    elif isinstance(value, (list, dict)):
+        hasher.update(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode())
+    else:
+        hasher.update(repr(value).encode())
+
+
+@profiler.timed("get_saved_sessions", "io")
 def get_saved_sessions():
     """저장된 Excel 세션 파일 목록 반환"""
-    sessions = []
-    if os.path.exists(SAVE_DIR):
-        for filename in os.listdir(SAVE_DIR):
-            if filename.endswith('.xlsx'):
-                filepath = os.path.join(SAVE_DIR, filename)
-                try:
-                    metadata_df = pd.read_excel(filepath, sheet_name='메타데이터')
-                    if not metadata_df.empty:
-                        metadata = metadata_df.iloc[0].to_dict()
-                        sessions.append({
-                            "filename": filename,
-                            "session_id": metadata.get("session_id", ""),
-                            "workplace": metadata.get("workplace", ""),
-                            "saved_at": metadata.get("saved_at", "")
-                        })
-                except:
-                    continue
-    return sorted(sessions, key=lambda x: x["saved_at"], reverse=True)
-
-# 작업명 목록 관련 함수들
+    return storage.saved_sessions()
+
+# 작업명 목록 관련 함수들 (세션의 체크리스트로 wmsd_core.checklist 호출, pandas는 처음 쓸 때 불러옴)
 def get_사업장명_목록():
-    if st.session_state["checklist_df"].empty:
-        return []
-    
-    df = st.session_state["checklist_df"]
-    if "회사명" in df.columns:
-        사업장명_목록 = df["회사명"].dropna().unique().tolist()
-        return [str(item) for item in 사업장명_목록 if item is not None]
-    else:
-        return []
+    from wmsd_core import checklist
+    return checklist.사업장명_목록(st.session_state["checklist_df"])
 
 def get_팀_목록(사업장명=None):
-    if st.session_state["checklist_df"].empty:
-        return []
-    
-    df = st.session_state["checklist_df"]
-    if 사업장명:
-        df = df[df["회사명"] == 사업장명]
-    
-    if "소속" in df.columns:
-        팀_목록 = df["소속"].dropna().unique().tolist()
-        return [str(item) for item in 팀_목록 if item is not None]
-    else:
-        return []
+    from wmsd_core import checklist
+    return checklist.팀_목록(st.session_state["checklist_df"], 사업장명)
 
 def get_작업명_목록(사업장명=None, 팀=None, 반=None):
-    if st.session_state["checklist_df"].empty:
-        return []
-    
-    df = st.session_state["checklist_df"]
-    
-    if 사업장명:
-        df = df[df["회사명"] == 사업장명]
-    if 팀:
-        df = df[df["소속"] == 팀]
-    
-    if "작업명" in df.columns:
-        작업명_목록 = df["작업명"].dropna().unique().tolist()
-        return [str(item) for item in 작업명_목록 if item is not None]
-    else:
-        return []
+    from wmsd_core import checklist
+    return checklist.작업명_목록(st.session_state["checklist_df"], 사업장명, 팀)
 
 def get_단위작업명_목록(작업명=None, 사업장명=None, 팀=None, 반=None):
-    if st.session_state["checklist_df"].empty:
-        return []
-    
-    df = st.session_state["checklist_df"]
-    
-    if 사업장명:
-        df = df[df["회사명"] == 사업장명]
-    if 팀:
-        df = df[df["소속"] == 팀]
-    if 작업명:
-        df = df[df["작업명"] == 작업명]
-    
-    if "단위작업명" in df.columns:
-        단위작업명_목록 = df["단위작업명"].dropna().unique().tolist()
-        return [str(item) for item in 단위작업명_목록 if item is not None]
-    else:
-        return []
+    from wmsd_core import checklist
+    return checklist.단위작업명_목록(st.session_state["checklist_df"], 작업명, 사업장명, 팀)
 
 # 부담작업 설명 (전역 변수)
 부담작업_설명 = {
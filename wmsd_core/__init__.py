@@ -0,0 +1,17 @@
+"""근골격계 유해요인조사 핵심 기능 (Streamlit 없이 사용 가능)
+
+세션 상태 대신 DataFrame과 dict를 직접 주고받으므로 배치 작업에서도 그대로 쓸 수 있습니다.
+Streamlit 앱의 탭과 data_manager는 이 패키지를 세션 상태에 연결하는 어댑터입니다.
+
+    checklist     체크리스트 표 계산 (목록, 작업 행, 2단계 표, 총점)
+    hazards       체크리스트 -> 유해요인 원인분석 항목
+    session       체크리스트 -> 세션 상태 dict (모든 작업을 한 번씩 연 것과 같은 값)
+    workbook      세션 상태 <-> 세션 Excel 파일
+    columnar      분석용 표 내보내기 (Parquet, Arrow IPC, CSV - 조각 단위로 스트리밍)
+    work_model    작업별 데이터 모델과 세션 상태 키 형식
+    investigations, ergonomics, symptom_survey   정밀조사, 인간공학 평가, 증상조사
+    storage       파일 잠금, 원자적 쓰기, 저장 디렉토리
+    memory        세션 값 메모리 추정
+
+첫 화면을 빠르게 띄우기 위해 패키지를 불러올 때는 하위 모듈을 불러오지 않습니다.
+"""
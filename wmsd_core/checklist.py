@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+
+# 체크리스트 표(2_체크리스트 시트, tab2에서 검증한 형식)만으로 계산하는 함수
+# 세션 상태 대신 표를 직접 받으므로 Streamlit 없이 배치 작업에서도 그대로 사용
+
+부담작업_호수 = range(1, 13)
+부담작업_열 = [f"부담작업_{호}호" for 호 in 부담작업_호수]
+부담작업_해당 = "O(해당)"
+부담작업_미해당 = "X(미해당)"
+부담작업_잠재 = "△(잠재위험)"
+# 업로드 파일의 필수 열 (유해요인 원인분석, 보호구 등은 선택)
+필수_열 = [
+    "회사명", "소속", "작업명", "단위작업명", "작업내용(상세설명)",
+    "작업자 수", "작업자 이름", "작업형태", "1일 작업시간"
+] + 부담작업_열
+# 부담작업 값 표기 -> 표준 값 (그 밖의 값과 빈 칸은 미해당)
+_부담작업_표기 = {
+    "O": 부담작업_해당, "o": 부담작업_해당, 부담작업_해당: 부담작업_해당,
+    "X": 부담작업_미해당, "x": 부담작업_미해당, 부담작업_미해당: 부담작업_미해당,
+    "△": 부담작업_잠재, "△(잠재)": 부담작업_잠재, 부담작업_잠재: 부담작업_잠재,
+}
+
+
+def parse_value(value, val_type=float):
+    """문자열 값을 숫자로 변환"""
+    try:
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                return 0
+            value = value.replace(",", "")
+            return val_type(value)
+        return val_type(value) if value else 0
+    except:
+        return 0
+
+
+def safe_convert(value, target_type, default_value):
+    """안전한 타입 변환 함수"""
+    if pd.isna(value) or str(value).strip() == "":
+        return default_value
+    try:
+        if target_type == str:
+            return str(value)
+        elif target_type == float:
+            return float(value)
+        elif target_type == int:
+            return int(float(value))
+        else:
+            return value
+    except (ValueError, TypeError):
+        return default_value
+
+
+def extract_number(value):
+    """작업부하와 작업빈도에서 숫자 추출하는 함수"""
+    if value and "(" in value and ")" in value:
+        return int(value.split("(")[1].split(")")[0])
+    return 0
+
+
+def calculate_total_score(row):
+    """총점 계산 함수"""
+    부하값 = extract_number(row["작업부하(A)"])
+    빈도값 = extract_number(row["작업빈도(B)"])
+    return 부하값 * 빈도값
+
+
+def missing_columns(df):
+    """체크리스트에 없는 필수 열 목록 (비어 있으면 형식이 맞음)"""
+    return [col for col in 필수_열 if col not in df.columns]
+
+
+def normalize_checklist(df):
+    """부담작업 값을 표준 값으로 바꾼 체크리스트 (O, X, △ -> O(해당), X(미해당), △(잠재위험)) - 원본은 그대로 둠"""
+    return df.assign(**{
+        col: df[col].astype("string").str.strip().map(_부담작업_표기).fillna(부담작업_미해당).astype(object)
+        for col in 부담작업_열 if col in df.columns
+    })
+
+
+def burden_counts(df):
+    """행(단위작업)별 부담작업 해당/잠재위험 호수 표 (열: 해당, 잠재)"""
+    values = df[[col for col in 부담작업_열 if col in df.columns]]
+    return pd.DataFrame({
+        "해당": (values == 부담작업_해당).sum(axis=1),
+        "잠재": (values == 부담작업_잠재).sum(axis=1),
+    }, index=df.index)
+
+
+def _scores(column):
+    """선택지 열의 점수 배열 (빈 칸, 새로 추가한 행의 None/NaN, 점수가 없는 값은 0)"""
+    scores = []
+    for value in column.tolist():
+        try:
+            scores.append(extract_number(value) if isinstance(value, str) else 0)
+        except ValueError:
+            scores.append(0)
+    return np.array(scores, dtype=int)
+
+
+def total_scores(table):
+    """작업조건 표의 총점 열 (작업부하(A) × 작업빈도(B)) - 행(Series)을 만들지 않고 열 값으로 한 번에"""
+    return pd.Series(_scores(table["작업부하(A)"]) * _scores(table["작업빈도(B)"]), index=table.index)
+
+
+def _unique(df, column):
+    if not isinstance(df, pd.DataFrame) or df.empty or column not in df.columns:
+        return []
+    return [str(item) for item in df[column].dropna().unique().tolist() if item is not None]
+
+
+def _filter(df, 사업장명=None, 팀=None, 작업명=None):
+    if 사업장명:
+        df = df[df["회사명"] == 사업장명]
+    if 팀:
+        df = df[df["소속"] == 팀]
+    if 작업명:
+        df = df[df["작업명"] == 작업명]
+    return df
+
+
+def 사업장명_목록(df):
+    return _unique(df, "회사명")
+
+
+def 팀_목록(df, 사업장명=None):
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return []
+    return _unique(_filter(df, 사업장명), "소속")
+
+
+def 작업명_목록(df, 사업장명=None, 팀=None):
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return []
+    return _unique(_filter(df, 사업장명, 팀), "작업명")
+
+
+def 단위작업명_목록(df, 작업명=None, 사업장명=None, 팀=None):
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return []
+    return _unique(_filter(df, 사업장명, 팀, 작업명), "단위작업명")
+
+
+def task_rows(df, 작업명, 회사명, 소속=None):
+    """작업 하나의 체크리스트 행 (소속을 주면 그 팀의 행만)"""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return pd.DataFrame()
+    rows = df[(df["작업명"] == 작업명) & (df["회사명"] == 회사명)]
+    if 소속:
+        rows = rows[rows["소속"] == 소속]
+    return rows
+
+
+def task_groups(checklist_df):
+    """(작업명, 작업 행) - 작업이 처음 나온 순서로, 행은 task_rows(작업명, 작업 첫 행의 회사명)와 같음
+
+    작업마다 전체 표를 다시 거르지 않고 한 번 묶어서 나눕니다.
+    """
+    df = checklist_df.dropna(subset=["작업명"])
+    if "회사명" not in df.columns:
+        df = df.assign(회사명="")
+    for 작업명, rows in df.groupby(df["작업명"].astype(str), sort=False):
+        yield 작업명, rows[rows["회사명"] == rows["회사명"].iloc[0]]
+
+
+def first_value(rows, column):
+    """작업 행 중 첫 행의 값 (작업내용(상세설명), 작업자 수 등 - 없으면 빈 문자열)"""
+    if rows.empty or column not in rows.columns:
+        return ""
+    return safe_convert(rows.iloc[0].get(column, ""), str, "")
+
+
+def burden_labels(rows):
+    """행마다 해당하는 부담작업 호수 (예: "2호, 4호(잠재)", 없으면 "미해당")"""
+    parts = []
+    for 호 in 부담작업_호수:
+        column = rows.get(f"부담작업_{호}호")
+        if column is None:
+            continue
+        parts.append(np.where(column == 부담작업_해당, f"{호}호", np.where(column == 부담작업_잠재, f"{호}호(잠재)", "")))
+    if not parts:
+        return ["미해당"] * len(rows)
+    return [", ".join(p for p in values if p) or "미해당" for values in zip(*parts)]
+
+
+def empty_work_conditions():
+    """2단계 작업조건 입력 표 기본값 (빈 행 3개)"""
+    return pd.DataFrame({
+        "단위작업명": ["" for _ in range(3)],
+        "부담작업(호)": ["" for _ in range(3)],
+        "작업부하(A)": ["" for _ in range(3)],
+        "작업빈도(B)": ["" for _ in range(3)],
+        "총점": [0 for _ in range(3)],
+    })
+
+
+def _choice_values(rows, column):
+    """체크리스트에 선택 열(작업부하(A), 작업빈도(B))이 있으면 그 값, 없으면 빈 칸"""
+    if column not in rows.columns:
+        return ""
+    return [safe_convert(value, str, "") for value in rows[column].tolist()]
+
+
+def work_conditions_table(rows):
+    """작업 행 -> 2단계 작업부하/작업빈도 입력 표 (단위작업명이 있는 행마다 한 줄, 없으면 빈 표)
+
+    체크리스트에 작업부하(A), 작업빈도(B) 열이 있으면 미리 채웁니다.
+    """
+    if rows.empty or "단위작업명" not in rows.columns:
+        return empty_work_conditions()
+    rows = rows[[bool(value) for value in rows["단위작업명"].tolist()]]
+    if rows.empty:
+        return empty_work_conditions()
+    return pd.DataFrame({
+        "단위작업명": rows["단위작업명"].tolist(),
+        "부담작업(호)": burden_labels(rows),
+        "작업부하(A)": _choice_values(rows, "작업부하(A)"),
+        "작업빈도(B)": _choice_values(rows, "작업빈도(B)"),
+        "총점": 0,
+    })
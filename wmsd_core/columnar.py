@@ -0,0 +1,199 @@
+import io
+import os
+import zipfile
+from importlib.util import find_spec
+
+import pandas as pd
+
+from wmsd_core import investigations
+from wmsd_core.checklist import total_scores
+from wmsd_core.work_model import build_site, to_frames
+
+# 분석용 열 형식 내보내기 (Parquet, Arrow IPC, CSV) - 표마다 파일 하나씩 압축파일로 묶음
+# 변환한 결과 전체를 메모리에 만들지 않고 CHUNK_ROWS행씩 변환해 bytes 조각으로 바로 내보냄
+# pyarrow는 선택 설치 - 없으면 CSV만 사용
+
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
+# 한 번에 변환하는 행 수 (Parquet은 조각마다 row group 하나, Arrow는 record batch 하나)
+CHUNK_ROWS = int(os.environ.get("WMSD_EXPORT_CHUNK_ROWS", "50000"))
+
+FORMATS = {
+    "parquet": {"label": "Parquet", "ext": "parquet"},
+    "arrow": {"label": "Arrow IPC", "ext": "arrow"},
+    "csv": {"label": "CSV", "ext": "csv"},
+}
+
+# 증상조사(tab6), 개선계획(tab7) 표 - (파일 이름, 세션 상태 키)
+증상조사_표 = [
+    ("증상조사_기초현황", "기초현황_data"),
+    ("증상조사_작업기간", "작업기간_data"),
+    ("증상조사_육체적부담", "육체적부담_data"),
+    ("증상조사_통증호소자", "통증호소자_data"),
+]
+개선계획_표 = [("개선계획", "개선계획_data")]
+
+
+def available_formats():
+    """지금 환경에서 쓸 수 있는 형식 (pyarrow가 없으면 CSV만)"""
+    return [fmt for fmt in FORMATS if fmt == "csv" or PYARROW_AVAILABLE]
+
+
+def _work_conditions(table):
+    """작업조건 긴 표 - 작업명을 첫 열로, 총점은 작업부하(A) × 작업빈도(B)로 다시 계산"""
+    if table.empty:
+        return table
+    columns = ["작업명"] + [col for col in table.columns if col != "작업명"]
+    table = table[columns]
+    if "작업부하(A)" in table.columns and "작업빈도(B)" in table.columns:
+        table = table.assign(총점=total_scores(table))
+    return table
+
+
+def export_tables(state):
+    """(파일 이름, DataFrame) - 체크리스트, 작업, 작업조건(작업명 열로 구분한 긴 표), 원인분석,
+    정밀조사, 증상조사, 개선계획 순서 (state에 없는 표는 건너뜀)"""
+    checklist_df = state.get("checklist_df")
+    if isinstance(checklist_df, pd.DataFrame):
+        yield "체크리스트", checklist_df
+    frames = to_frames(build_site(state))
+    yield "작업", frames["작업"]
+    yield "작업조건", _work_conditions(frames["작업조건"])
+    yield "원인분석", frames["원인분석"]
+    if investigations.investigation_ids(state):
+        조사_목록, 조사_원인분석 = investigations.to_frames(state)
+        yield "정밀조사", 조사_목록
+        yield "정밀조사_원인분석", 조사_원인분석
+    for 이름, key in 증상조사_표 + 개선계획_표:
+        if isinstance(state.get(key), pd.DataFrame):
+            yield 이름, state[key]
+
+
+class _Sink(io.RawIOBase):
+    """쓰기만 하는 버퍼 - drain()으로 지금까지 쓴 bytes를 꺼내고 비움 (파일 위치 이동 불가)"""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), max(chunk_rows, 1)):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _text(value):
+    return None if pd.isna(value) else str(value)
+
+
+def _is_number(type_, pa):
+    return pa.types.is_integer(type_) or pa.types.is_floating(type_)
+
+
+def _promote(a, b, pa):
+    """두 조각의 열 형식을 모두 담을 수 있는 형식 (빈 열 < 정수 < 실수, 그 밖에 서로 다르면 문자열)"""
+    if a is None or pa.types.is_null(a):
+        return b
+    if pa.types.is_null(b) or a == b:
+        return a
+    if _is_number(a, pa) and _is_number(b, pa):
+        return pa.float64()
+    return pa.string()
+
+
+def _arrow_schema(df, chunk_rows, pa):
+    """(열 형식, 조각마다 문자열로 바꿀 열) - object 열은 값을 봐야 형식을 알 수 있으므로 조각 단위로 형식을 정함
+
+    열 하나의 조각 하나씩만 변환해 보고 _promote 규칙으로 합치므로 표 전체를 한 번에 변환하지 않습니다.
+    문자가 아닌 값이 섞여 문자열이 된 열은 쓰는 조각마다 문자열로 바꿉니다.
+    """
+    schema = pa.Schema.from_pandas(df.head(0), preserve_index=False)
+    text_columns = []
+    for i, col in enumerate(df.columns):
+        if df[col].dtype != object:
+            continue
+        type_, mixed = None, False
+        for chunk in _chunks(df[col], chunk_rows):
+            try:
+                chunk_type = pa.array(chunk, from_pandas=True).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # 한 조각 안에 숫자와 문자가 섞여 있음
+                chunk_type, mixed = pa.string(), True
+            mixed = mixed or not (pa.types.is_string(chunk_type) or pa.types.is_null(chunk_type))
+            type_ = _promote(type_, chunk_type, pa)
+        type_ = type_ or pa.null()
+        if pa.types.is_string(type_) and mixed:
+            text_columns.append(col)
+        schema = schema.set(i, pa.field(col, type_))
+    return schema, text_columns
+
+
+def _arrow_chunk(chunk, schema, text_columns, pa):
+    """조각 하나 -> Arrow 표 (문자열이 된 열은 이 조각만 문자열로 바꿔 변환)"""
+    if text_columns:
+        chunk = chunk.assign(**{col: chunk[col].map(_text).astype(object) for col in text_columns})
+    return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def _arrow_writer(fmt, sink, schema):
+    import pyarrow.ipc
+    import pyarrow.parquet
+    if fmt == "parquet":
+        return pyarrow.parquet.ParquetWriter(sink, schema)
+    return pyarrow.ipc.new_file(sink, schema)
+
+
+def stream_table(df, fmt="parquet", chunk_rows=CHUNK_ROWS):
+    """표 하나 -> fmt 형식 파일의 bytes 조각 (chunk_rows행씩 변환해 바로 내보냄)
+
+    열 형식(schema)은 쓰기 전에 조각 단위로 한 번 정하므로 조각마다 형식이 달라지지 않습니다.
+    CSV는 Excel에서 한글이 깨지지 않도록 첫 조각에 BOM을 붙입니다.
+    """
+    if fmt == "csv":
+        yield df.head(0).to_csv(index=False).encode("utf-8-sig")
+        for chunk in _chunks(df, chunk_rows):
+            yield chunk.to_csv(index=False, header=False).encode("utf-8")
+        return
+
+    import pyarrow as pa
+    df = df.rename(columns=str)
+    schema, text_columns = _arrow_schema(df, chunk_rows, pa)
+    sink = _Sink()
+    with _arrow_writer(fmt, sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(_arrow_chunk(chunk, schema, text_columns, pa))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_archive(state, fmt="parquet", chunk_rows=CHUNK_ROWS, progress=None):
+    """모든 표를 표마다 파일 하나(예: 작업조건.parquet)로 묶은 zip의 bytes 조각
+
+    zip은 파일 위치를 되돌리지 않는 방식으로 기록하므로 조각을 받는 쪽에서 바로 파일이나 응답으로 내보낼 수 있습니다.
+    progress(완료 비율)는 표 하나를 다 쓸 때마다 호출됩니다.
+    """
+    ext = FORMATS[fmt]["ext"]
+    # Parquet은 이미 압축된 형식이므로 다시 압축하지 않음
+    compression = zipfile.ZIP_STORED if fmt == "parquet" else zipfile.ZIP_DEFLATED
+    tables = list(export_tables(state))
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=compression) as archive:
+        for 번호, (이름, df) in enumerate(tables, start=1):
+            with archive.open(f"{이름}.{ext}", "w", force_zip64=True) as entry:
+                for data in stream_table(df, fmt, chunk_rows):
+                    entry.write(data)
+                    yield sink.drain()
+            if progress:
+                progress(번호 / len(tables))
+    yield sink.drain()
@@ -0,0 +1,314 @@
+import numpy as np
+import pandas as pd
+
+# 인간공학적 평가 엔진: NIOSH 들기 작업 식(개정판), RULA, REBA
+# 입력 표의 모든 행을 배열 연산으로 한 번에 계산 (행마다 반복하지 않음)
+# 각도는 굽힘(앞쪽)이 +, 폄(뒤쪽)이 - 입니다.
+
+# --- NIOSH 들기 작업 식 (Waters et al., 1993) ---
+NIOSH_입력_열 = ["작업명", "하중(kg)", "수평거리(cm)", "수직높이(cm)", "이동거리(cm)",
+              "비대칭각도(°)", "빈도(회/분)", "작업시간(시간)", "손잡이"]
+손잡이_종류 = ["양호", "보통", "불량"]
+하중상수 = 23.0
+
+# 빈도계수 표: 행은 빈도(회/분), 열은 (1시간 이하, 2시간 이하, 8시간 이하) x (수직높이 75cm 미만, 이상)
+_빈도 = np.array([0.2, 0.5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15])
+_빈도계수 = np.array([
+    [1.00, 1.00, 0.95, 0.95, 0.85, 0.85],
+    [0.97, 0.97, 0.92, 0.92, 0.81, 0.81],
+    [0.94, 0.94, 0.88, 0.88, 0.75, 0.75],
+    [0.91, 0.91, 0.84, 0.84, 0.65, 0.65],
+    [0.88, 0.88, 0.79, 0.79, 0.55, 0.55],
+    [0.84, 0.84, 0.72, 0.72, 0.45, 0.45],
+    [0.80, 0.80, 0.60, 0.60, 0.35, 0.35],
+    [0.75, 0.75, 0.50, 0.50, 0.27, 0.27],
+    [0.70, 0.70, 0.42, 0.42, 0.22, 0.22],
+    [0.60, 0.60, 0.35, 0.35, 0.18, 0.18],
+    [0.52, 0.52, 0.30, 0.30, 0.00, 0.15],
+    [0.45, 0.45, 0.26, 0.26, 0.00, 0.13],
+    [0.41, 0.41, 0.00, 0.23, 0.00, 0.00],
+    [0.37, 0.37, 0.00, 0.21, 0.00, 0.00],
+    [0.00, 0.34, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.31, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.28, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 0.00, 0.00, 0.00],  # 15회/분 초과
+])
+# 손잡이계수: 행은 손잡이 종류, 열은 수직높이 75cm 미만, 이상
+_손잡이계수 = np.array([[1.00, 1.00], [0.95, 1.00], [0.90, 0.90]])
+
+# --- RULA (McAtamney & Corlett, 1993) ---
+# 표 A[상완-1, 전완-1, 손목-1, 손목비틀림-1]
+_RULA_A = np.array([
+    [[1, 2, 2, 2, 2, 3, 3, 3], [2, 2, 2, 2, 3, 3, 3, 3], [2, 3, 3, 3, 3, 3, 4, 4]],
+    [[2, 3, 3, 3, 3, 4, 4, 4], [3, 3, 3, 3, 3, 4, 4, 4], [3, 4, 4, 4, 4, 4, 5, 5]],
+    [[3, 3, 4, 4, 4, 4, 5, 5], [3, 4, 4, 4, 4, 4, 5, 5], [4, 4, 4, 4, 4, 5, 5, 5]],
+    [[4, 4, 4, 4, 4, 5, 5, 5], [4, 4, 4, 4, 4, 5, 5, 5], [4, 4, 4, 5, 5, 5, 6, 6]],
+    [[5, 5, 5, 5, 5, 6, 6, 7], [5, 6, 6, 6, 6, 7, 7, 7], [6, 6, 6, 7, 7, 7, 7, 8]],
+    [[7, 7, 7, 7, 7, 8, 8, 9], [8, 8, 8, 8, 8, 9, 9, 9], [9, 9, 9, 9, 9, 9, 9, 9]],
+]).reshape(6, 3, 4, 2)
+# 표 B[목-1, 몸통-1, 다리-1]
+_RULA_B = np.array([
+    [1, 3, 2, 3, 3, 4, 5, 5, 6, 6, 7, 7],
+    [2, 3, 2, 3, 4, 5, 5, 5, 6, 7, 7, 7],
+    [3, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 7],
+    [5, 5, 5, 6, 6, 7, 7, 7, 7, 7, 8, 8],
+    [7, 7, 7, 7, 7, 8, 8, 8, 8, 8, 8, 8],
+    [8, 8, 8, 8, 8, 8, 8, 9, 9, 9, 9, 9],
+]).reshape(6, 6, 2)
+# 표 C[점수C-1 (8 이상은 8), 점수D-1 (7 이상은 7)]
+_RULA_C = np.array([
+    [1, 2, 3, 3, 4, 5, 5],
+    [2, 2, 3, 4, 4, 5, 5],
+    [3, 3, 3, 4, 4, 5, 6],
+    [3, 3, 3, 4, 5, 6, 6],
+    [4, 4, 4, 5, 6, 7, 7],
+    [4, 4, 5, 6, 6, 7, 7],
+    [5, 5, 6, 6, 7, 7, 7],
+    [5, 5, 6, 7, 7, 7, 7],
+])
+
+# --- REBA (Hignett & McAtamney, 2000) ---
+# 표 A[몸통-1, 목-1, 다리-1]
+_REBA_A = np.array([
+    [[1, 2, 3, 4], [1, 2, 3, 4], [3, 3, 5, 6]],
+    [[2, 3, 4, 5], [3, 4, 5, 6], [4, 5, 6, 7]],
+    [[2, 4, 5, 6], [4, 5, 6, 7], [5, 6, 7, 8]],
+    [[3, 5, 6, 7], [5, 6, 7, 8], [6, 7, 8, 9]],
+    [[4, 6, 7, 8], [6, 7, 8, 9], [7, 8, 9, 9]],
+])
+# 표 B[상완-1, 전완-1, 손목-1]
+_REBA_B = np.array([
+    [[1, 2, 2], [1, 2, 3]],
+    [[1, 2, 3], [2, 3, 4]],
+    [[3, 4, 5], [4, 5, 5]],
+    [[4, 5, 5], [5, 6, 7]],
+    [[6, 7, 8], [7, 8, 8]],
+    [[7, 8, 8], [8, 9, 9]],
+])
+# 표 C[점수A-1, 점수B-1] (12 이상은 12)
+_REBA_C = np.array([
+    [1, 1, 1, 2, 3, 3, 4, 5, 6, 7, 7, 7],
+    [1, 2, 2, 3, 4, 4, 5, 6, 6, 7, 7, 8],
+    [2, 3, 3, 3, 4, 5, 6, 7, 7, 8, 8, 8],
+    [3, 4, 4, 4, 5, 6, 7, 8, 8, 9, 9, 9],
+    [4, 4, 4, 5, 6, 7, 8, 8, 9, 9, 9, 9],
+    [6, 6, 6, 7, 8, 8, 9, 9, 10, 10, 10, 10],
+    [7, 7, 7, 8, 9, 9, 9, 10, 10, 11, 11, 11],
+    [8, 8, 8, 9, 10, 10, 10, 10, 10, 11, 11, 11],
+    [9, 9, 9, 10, 10, 10, 11, 11, 11, 12, 12, 12],
+    [10, 10, 10, 11, 11, 11, 11, 12, 12, 12, 12, 12],
+    [11, 11, 11, 11, 12, 12, 12, 12, 12, 12, 12, 12],
+    [12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12],
+])
+REBA_손잡이_종류 = ["양호", "보통", "불량", "부적절"]
+
+# RULA와 REBA가 함께 쓰는 자세 입력
+자세_입력_열 = ["작업명", "상완(°)", "어깨 들림", "상완 벌림", "팔 지지", "전완(°)", "전완 중심선 넘음",
+            "손목(°)", "손목 꺾임", "손목 회전 끝", "목(°)", "목 비틀림", "목 옆굽힘",
+            "몸통(°)", "몸통 비틀림", "몸통 옆굽힘", "한발 지지", "무릎(°)",
+            "하중(kg)", "충격", "정적/반복", "손잡이"]
+_자세_여부_열 = ["어깨 들림", "상완 벌림", "팔 지지", "전완 중심선 넘음", "손목 꺾임", "손목 회전 끝",
+             "목 비틀림", "목 옆굽힘", "몸통 비틀림", "몸통 옆굽힘", "한발 지지", "충격", "정적/반복"]
+
+
+def empty_lifting_table():
+    return pd.DataFrame({열: pd.Series(dtype=object if 열 in ("작업명", "손잡이") else float) for 열 in NIOSH_입력_열})
+
+
+def empty_posture_table():
+    return pd.DataFrame({
+        열: pd.Series(dtype=bool if 열 in _자세_여부_열 else object if 열 in ("작업명", "손잡이") else float)
+        for 열 in 자세_입력_열
+    })
+
+
+def _number(df, col):
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def _flag(df, col):
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=int)
+    return df[col].fillna(False).astype(bool).to_numpy(dtype=int)
+
+
+def _choice(df, col, options, default):
+    """선택 열 -> 선택지 위치 (없거나 모르는 값은 default 위치)"""
+    if col not in df.columns:
+        return np.full(len(df), default)
+    codes = pd.Categorical(df[col], categories=options).codes
+    return np.where(codes < 0, default, codes)
+
+
+def niosh_lifting(df):
+    """NIOSH 들기 작업 식 - 계수, 권장무게한계(RWL), 들기지수(LI), 판정 열을 붙인 표
+
+    입력이 비어 있는 행은 RWL/LI가 비어 있고 판정은 '입력 필요'입니다.
+    """
+    H = _number(df, "수평거리(cm)")
+    V = _number(df, "수직높이(cm)")
+    D = _number(df, "이동거리(cm)")
+    A = _number(df, "비대칭각도(°)")
+    F = _number(df, "빈도(회/분)")
+    시간 = _number(df, "작업시간(시간)")
+    하중 = _number(df, "하중(kg)")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        HM = np.where(H <= 25, 1.0, np.where(H > 63, 0.0, 25 / H))
+        VM = np.where(V > 175, 0.0, 1 - 0.003 * np.abs(V - 75))
+        DM = np.where(D <= 25, 1.0, np.where(D > 175, 0.0, 0.82 + 4.5 / D))
+        AM = np.where(A > 135, 0.0, 1 - 0.0032 * A)
+    for 계수, 값 in ((HM, H), (VM, V), (DM, D), (AM, A)):
+        계수[np.isnan(값)] = np.nan
+
+    낮음 = (V < 75).astype(int)
+    높이_열 = 1 - 낮음
+    시간_열 = np.select([시간 <= 1, 시간 <= 2], [0, 1], 2)
+    행 = np.searchsorted(_빈도, np.nan_to_num(F, nan=0.0), side="left")
+    FM = _빈도계수[행, 시간_열 * 2 + 높이_열]
+    FM[np.isnan(F) | np.isnan(시간) | np.isnan(V)] = np.nan
+    CM = _손잡이계수[_choice(df, "손잡이", 손잡이_종류, 1), 높이_열]
+    CM[np.isnan(V)] = np.nan
+
+    RWL = 하중상수 * HM * VM * DM * AM * FM * CM
+    with np.errstate(divide="ignore", invalid="ignore"):
+        LI = np.where(RWL > 0, 하중 / RWL, np.where(np.isnan(RWL) | np.isnan(하중), np.nan, np.inf))
+    판정 = np.select([np.isnan(LI), LI <= 1, LI <= 3], ["입력 필요", "적정", "위험 증가"], "고위험")
+    return df.assign(HM=HM, VM=VM, DM=DM, AM=AM, FM=FM, CM=CM,
+                     **{"RWL(kg)": np.round(RWL, 2), "LI": np.round(LI, 2), "판정": 판정})
+
+
+def _posture(df):
+    """자세 입력의 공통 배열 {열: 배열}"""
+    values = {col: _number(df, col) for col in ("상완(°)", "전완(°)", "손목(°)", "목(°)", "몸통(°)", "무릎(°)", "하중(kg)")}
+    values.update({col: _flag(df, col) for col in _자세_여부_열})
+    # 팔/목/몸통 각도 중 하나라도 비어 있으면 점수를 매기지 않음
+    values["입력_없음"] = np.isnan(np.column_stack([values[col] for col in ("상완(°)", "전완(°)", "손목(°)", "목(°)", "몸통(°)")])).any(axis=1)
+    return values
+
+
+def _upper_arm(상완):
+    # 20° 폄 ~ 20° 굽힘: 1, 20° 넘는 폄 또는 20~45° 굽힘: 2, 45~90°: 3, 90° 초과: 4
+    return np.select([np.abs(상완) <= 20, 상완 <= 45, 상완 <= 90], [1, 2, 3], 4)
+
+
+def _lower_arm(전완):
+    return np.where((전완 >= 60) & (전완 <= 100), 1, 2)
+
+
+def rula(df):
+    """RULA 점수(1~7)와 조치수준(1~4) 열을 붙인 표"""
+    p = _posture(df)
+    상완 = np.clip(_upper_arm(p["상완(°)"]) + p["어깨 들림"] + p["상완 벌림"] - p["팔 지지"], 1, 6)
+    전완 = np.clip(_lower_arm(p["전완(°)"]) + p["전완 중심선 넘음"], 1, 3)
+    손목 = np.clip(np.select([p["손목(°)"] == 0, np.abs(p["손목(°)"]) <= 15], [1, 2], 3) + p["손목 꺾임"], 1, 4)
+    비틀림 = 1 + p["손목 회전 끝"]
+    목 = np.clip(np.select([p["목(°)"] < 0, p["목(°)"] <= 10, p["목(°)"] <= 20], [4, 1, 2], 3)
+                + p["목 비틀림"] + p["목 옆굽힘"], 1, 6)
+    몸통 = np.clip(np.select([p["몸통(°)"] <= 0, p["몸통(°)"] <= 20, p["몸통(°)"] <= 60], [1, 2, 3], 4)
+                 + p["몸통 비틀림"] + p["몸통 옆굽힘"], 1, 6)
+    다리 = 1 + p["한발 지지"]
+
+    하중 = np.nan_to_num(p["하중(kg)"])
+    근육 = p["정적/반복"]
+    힘 = np.select([(하중 > 10) | (p["충격"] == 1), 하중 >= 2], [3, 1 + 근육], 0)
+    점수C = _RULA_A[상완 - 1, 전완 - 1, 손목 - 1, 비틀림 - 1] + 근육 + 힘
+    점수D = _RULA_B[목 - 1, 몸통 - 1, 다리 - 1] + 근육 + 힘
+    점수 = _RULA_C[np.minimum(점수C, 8) - 1, np.minimum(점수D, 7) - 1]
+    입력_없음 = p["입력_없음"]
+    조치수준 = np.select([점수 <= 2, 점수 <= 4, 점수 <= 6], [1, 2, 3], 4)
+    return df.assign(**{
+        "RULA": np.where(입력_없음, np.nan, 점수),
+        "RULA 조치수준": np.where(입력_없음, np.nan, 조치수준),
+    })
+
+
+def reba(df):
+    """REBA 점수(1~15)와 위험수준 열을 붙인 표"""
+    p = _posture(df)
+    몸통 = np.clip(np.select([p["몸통(°)"] == 0, np.abs(p["몸통(°)"]) <= 20, (p["몸통(°)"] <= 60) | (p["몸통(°)"] < 0)], [1, 2, 3], 4)
+                 + (p["몸통 비틀림"] | p["몸통 옆굽힘"]), 1, 5)
+    목 = np.clip(np.where((p["목(°)"] >= 0) & (p["목(°)"] <= 20), 1, 2) + (p["목 비틀림"] | p["목 옆굽힘"]), 1, 3)
+    무릎 = np.nan_to_num(p["무릎(°)"])
+    다리 = np.clip(1 + p["한발 지지"] + np.select([무릎 > 60, 무릎 >= 30], [2, 1], 0), 1, 4)
+    상완 = np.clip(_upper_arm(p["상완(°)"]) + p["어깨 들림"] + p["상완 벌림"] - p["팔 지지"], 1, 6)
+    전완 = _lower_arm(p["전완(°)"])
+    손목 = np.clip(np.where(np.abs(p["손목(°)"]) <= 15, 1, 2) + p["손목 꺾임"], 1, 3)
+
+    하중 = np.nan_to_num(p["하중(kg)"])
+    힘 = np.select([하중 > 10, 하중 >= 5], [2, 1], 0) + p["충격"]
+    손잡이 = _choice(df, "손잡이", REBA_손잡이_종류, 0)
+    점수A = np.minimum(_REBA_A[몸통 - 1, 목 - 1, 다리 - 1] + 힘, 12)
+    점수B = np.minimum(_REBA_B[상완 - 1, 전완 - 1, 손목 - 1] + 손잡이, 12)
+    점수 = _REBA_C[점수A - 1, 점수B - 1] + p["정적/반복"]
+    입력_없음 = p["입력_없음"]
+    위험수준 = np.select([점수 <= 1, 점수 <= 3, 점수 <= 7, 점수 <= 10], ["무시", "낮음", "보통", "높음"], "매우 높음")
+    return df.assign(**{
+        "REBA": np.where(입력_없음, np.nan, 점수),
+        "REBA 위험수준": np.where(입력_없음, "입력 필요", 위험수준),
+    })
+
+
+def posture_scores(df):
+    """자세 입력 표에 RULA와 REBA 결과 열을 함께 붙임"""
+    return reba(rula(df))
+
+
+# --- 작업조건조사(tab4) 원인분석 항목에서 입력 채우기 ---
+# 부담작업자세(호)별 대표 자세 (현장에서 측정한 각도로 고쳐 쓰는 시작값)
+_자세_시작값 = {
+    "(3호)": {"상완(°)": 100.0, "어깨 들림": True, "목(°)": -10.0, "몸통(°)": 0.0},
+    "(4호)": {"상완(°)": 30.0, "목(°)": 30.0, "몸통(°)": 45.0, "몸통 비틀림": True},
+    "(5호)": {"상완(°)": 20.0, "목(°)": 25.0, "몸통(°)": 30.0, "무릎(°)": 90.0},
+}
+_기본_자세 = {"상완(°)": 0.0, "전완(°)": 80.0, "손목(°)": 0.0, "목(°)": 10.0, "몸통(°)": 0.0, "무릎(°)": 0.0}
+
+
+def _as_float(series):
+    return pd.to_numeric(series, errors="coerce") if series is not None else np.nan
+
+
+def prefill_lifting(hazards):
+    """work_model 원인분석 표의 '과도한 힘' 항목 -> NIOSH 입력 표 (무게/횟수만 채우고 자세 치수는 비워 둠)"""
+    table = hazards[hazards["유형"] == "과도한 힘"] if "유형" in hazards.columns else hazards.iloc[0:0]
+    if table.empty:
+        return empty_lifting_table()
+    횟수 = _as_float(table.get("하루 8시간동안 중량물을 드는 횟수(회)"))
+    result = empty_lifting_table().reindex(range(len(table)))
+    result["작업명"] = table["작업명"].to_numpy()
+    result["하중(kg)"] = np.asarray(_as_float(table.get("중량물 무게(kg)")), dtype=float)
+    # 하루 8시간(480분) 동안의 횟수 -> 분당 빈도
+    result["빈도(회/분)"] = np.round(np.asarray(횟수, dtype=float) / 480, 3)
+    result["작업시간(시간)"] = 8.0
+    result["손잡이"] = "보통"
+    return result
+
+
+def prefill_postures(hazards):
+    """work_model 원인분석 표의 '부자연스러운 자세' 항목 -> 자세 입력 표 (부담작업자세별 대표 각도)"""
+    table = hazards[hazards["유형"] == "부자연스러운 자세"] if "유형" in hazards.columns else hazards.iloc[0:0]
+    if table.empty:
+        return empty_posture_table()
+    result = empty_posture_table().reindex(range(len(table)))
+    result["작업명"] = table["작업명"].to_numpy()
+    for col, value in _기본_자세.items():
+        result[col] = value
+    for col in _자세_여부_열:
+        result[col] = False
+    result["하중(kg)"] = 0.0
+    result["손잡이"] = "양호"
+
+    자세 = table["부담작업자세"].fillna("").astype(str).to_numpy() if "부담작업자세" in table.columns else np.array([""] * len(table))
+    for 호, values in _자세_시작값.items():
+        mask = np.char.find(자세.astype(str), 호) >= 0
+        for col, value in values.items():
+            result.loc[mask, col] = value
+
+    # 분당 4회를 넘게 반복하면 정적/반복 작업으로 표시
+    횟수 = np.asarray(_as_float(table.get("작업시간동안 반복횟수(회/일)")), dtype=float)
+    분 = np.asarray(_as_float(table.get("총 작업시간(분)")), dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["정적/반복"] = np.nan_to_num(횟수 / 분) > 4
+    return result
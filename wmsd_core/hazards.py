@@ -0,0 +1,104 @@
+import pandas as pd
+
+from wmsd_core.checklist import safe_convert
+
+# 체크리스트의 유해요인 원인분석 열 -> 원인분석 항목 (tab4 원인분석 섹션이 처음 열릴 때 만드는 값)
+# 작업 행마다 항목이 최대 5개 (열 이름 끝의 _1 ~ _5)
+최대_항목수 = 5
+유형_열 = "유해요인_원인분석_유형_{}"
+빈_항목 = {"유형": "", "부담작업": "", "부담작업자세": ""}
+
+# 유형별 (항목 필드, 체크리스트 열 형식, 타입, 기본값)
+유형별_필드 = {
+    "반복동작": [
+        ("부담작업", "유해요인_원인분석_부담작업_{}_반복", str, ""),
+        ("수공구 종류", "유해요인_원인분석_수공구_종류_{}", str, ""),
+        ("수공구 용도", "유해요인_원인분석_수공구_용도_{}", str, ""),
+        ("수공구 무게(kg)", "유해요인_원인분석_수공구_무게(kg)_{}", float, 0.0),
+        ("수공구 사용시간(분)", "유해요인_원인분석_수공구_사용시간(분)_{}", str, ""),
+        ("부담부위", "유해요인_원인분석_부담부위_{}", str, ""),
+        ("회당 반복시간(초/회)", "유해요인_원인분석_반복_회당시간(초/회)_{}", str, ""),
+        ("작업시간동안 반복횟수(회/일)", "유해요인_원인분석_반복_총횟수(회/일)_{}", str, ""),
+        ("총 작업시간(분)", "유해요인_원인분석_반복_총시간(분)_{}", str, ""),
+        # 10호 관련 필드
+        ("물체 무게(kg)_10호", "유해요인_원인분석_반복_물체무게_10호(kg)_{}", float, 0.0),
+        ("분당 반복횟수(회/분)_10호", "유해요인_원인분석_반복_분당반복횟수_10호(회/분)_{}", str, ""),
+        # 12호 정적자세 관련 필드
+        ("작업내용_12호_정적", "유해요인_원인분석_반복_작업내용_12호_정적_{}", str, ""),
+        ("작업시간(분)_12호_정적", "유해요인_원인분석_반복_작업시간_12호_정적_{}", int, 0),
+        ("휴식시간(분)_12호_정적", "유해요인_원인분석_반복_휴식시간_12호_정적_{}", int, 0),
+        ("인체부담부위_12호_정적", "유해요인_원인분석_반복_인체부담부위_12호_정적_{}", str, ""),
+    ],
+    "부자연스러운 자세": [
+        ("부담작업자세", "유해요인_원인분석_부담작업자세_{}", str, ""),
+        ("회당 반복시간(초/회)", "유해요인_원인분석_자세_회당시간(초/회)_{}", str, ""),
+        ("작업시간동안 반복횟수(회/일)", "유해요인_원인분석_자세_총횟수(회/일)_{}", str, ""),
+        ("총 작업시간(분)", "유해요인_원인분석_자세_총시간(분)_{}", str, ""),
+    ],
+    "과도한 힘": [
+        ("부담작업", "유해요인_원인분석_부담작업_{}_힘", str, ""),
+        ("중량물 명칭", "유해요인_원인분석_힘_중량물_명칭_{}", str, ""),
+        ("중량물 용도", "유해요인_원인분석_힘_중량물_용도_{}", str, ""),
+        ("중량물 무게(kg)", "유해요인_원인분석_중량물_무게(kg)_{}", float, 0.0),
+        ("하루 8시간동안 중량물을 드는 횟수(회)", "유해요인_원인분석_하루8시간_중량물_횟수(회)_{}", int, 0),
+        ("취급방법", "유해요인_원인분석_힘_취급방법_{}", str, ""),
+        ("중량물 이동방법", "유해요인_원인분석_힘_이동방법_{}", str, ""),
+        ("작업자가 직접 밀고/당기기", "유해요인_원인분석_힘_직접_밀당_{}", str, ""),
+        ("기타_밀당_설명", "유해요인_원인분석_힘_기타_밀당_설명_{}", str, ""),
+        ("작업시간동안 작업횟수(회/일)", "유해요인_원인분석_힘_총횟수(회/일)_{}", str, ""),
+    ],
+    "접촉스트레스 또는 기타(진동, 밀고 당기기 등)": [
+        ("부담작업", "유해요인_원인분석_부담작업_{}_기타", str, ""),
+    ],
+}
+# 접촉스트레스/기타는 부담작업에 따라 필드가 다름
+부담작업별_필드 = {
+    "(11호)접촉스트레스": [
+        ("작업시간(분)", "유해요인_원인분석_기타_작업시간(분)_{}", str, ""),
+    ],
+    "(12호)진동작업(그라인더, 임팩터 등)": [
+        ("진동수공구명", "유해요인_원인분석_기타_진동수공구명_{}", str, ""),
+        ("진동수공구 용도", "유해요인_원인분석_기타_진동수공구_용도_{}", str, ""),
+        ("작업시간(분)_진동", "유해요인_원인분석_기타_작업시간_진동_{}", str, ""),
+        ("작업빈도(초/회)_진동", "유해요인_원인분석_기타_작업빈도_진동_{}", str, ""),
+        ("작업량(회/일)_진동", "유해요인_원인분석_기타_작업량_진동_{}", str, ""),
+        ("수공구사용시 지지대가 있는가?", "유해요인_원인분석_기타_지지대_여부_{}", str, ""),
+    ],
+}
+# 부담작업에 따라 필드가 더 붙는 유형
+부담작업_유형 = ("접촉스트레스 또는 기타(진동, 밀고 당기기 등)",)
+
+
+def hazard_columns(df):
+    """체크리스트의 원인분석 관련 열 이름"""
+    return [col for col in df.columns if "유해요인_원인분석" in col]
+
+
+def _fill(entry, row, 필드_목록, 번호):
+    for 필드, 열_형식, 타입, 기본값 in 필드_목록:
+        entry[필드] = safe_convert(row.get(열_형식.format(번호), ""), 타입, 기본값)
+
+
+def extract_hazard_entries(rows):
+    """작업 행(체크리스트 일부) -> 원인분석 항목 dict 목록 (유형이 적힌 항목만, 행 순서 -> 항목 번호 순서)"""
+    entries = []
+    유형_열들 = [(번호, 유형_열.format(번호)) for 번호 in range(1, 최대_항목수 + 1) if 유형_열.format(번호) in rows.columns]
+    if not 유형_열들:
+        return entries
+    for row in rows.to_dict("records"):
+        for 번호, 열 in 유형_열들:
+            value = row[열]
+            if pd.isna(value) or str(value).strip() == "":
+                continue
+            entry = {"유형": str(value).strip()}
+            _fill(entry, row, 유형별_필드.get(entry["유형"], []), 번호)
+            if entry["유형"] in 부담작업_유형:
+                _fill(entry, row, 부담작업별_필드.get(entry["부담작업"], []), 번호)
+            entries.append(entry)
+    return entries
+
+
+def default_hazard_entries(rows):
+    """작업의 원인분석 기본값 - 체크리스트에 항목이 없으면 빈 항목 하나"""
+    return extract_hazard_entries(rows) or [dict(빈_항목)]
+
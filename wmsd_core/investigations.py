@@ -0,0 +1,115 @@
+import re
+
+import pandas as pd
+
+# 정밀조사 등록부: 조사마다 다시 쓰지 않는 ID를 붙이고, 조사별 데이터는 ID로 정해진 키에만 보관
+# 추가/삭제가 세션 상태 전체를 훑지 않으므로 세션 크기와 상관없이 일정한 시간에 끝남
+등록부_키 = "정밀조사_목록"          # {ID: 번호} (추가한 순서 유지)
+다음번호_키 = "정밀조사_다음번호"
+ID_형식 = "정밀조사_{}"
+
+# 조사별 세션 상태 키 형식 (데이터와 위젯)
+조사_필드 = {
+    "작업공정명": "정밀_작업공정명_{}",
+    "작업명": "정밀_작업명_{}",
+    "원인분석": "정밀_원인분석_data_{}",
+}
+조사_위젯 = ("정밀_원인분석_editor_{}", "delete_{}")
+
+원인분석_열 = ["작업내용", "유해요인", "개선방안"]
+
+# 인간공학적 평가 입력 표 (사업장 전체 하나씩, 결과는 입력에서 다시 계산하므로 저장하지 않음)
+평가_키 = {"NIOSH": "정밀_NIOSH_data", "자세평가": "정밀_자세평가_data"}
+평가_편집기_키 = {"NIOSH": "정밀_NIOSH_editor", "자세평가": "정밀_자세평가_editor"}
+_ID_번호 = re.compile(r"_(\d+)$")
+
+
+def investigation_key(필드, 조사_id):
+    """조사 필드의 세션 상태 키 (예: investigation_key("작업명", "정밀조사_3") -> "정밀_작업명_정밀조사_3")"""
+    return 조사_필드[필드].format(조사_id)
+
+
+def investigation_keys(조사_id):
+    """조사 하나가 쓰는 모든 세션 상태 키"""
+    return [형식.format(조사_id) for 형식 in list(조사_필드.values()) + list(조사_위젯)]
+
+
+def registry(state):
+    """등록부 {ID: 번호} - 이전 형식(조사명 목록)이면 한 번 변환 (등록된 조사가 없으면 상태를 바꾸지 않음)"""
+    목록 = state.get(등록부_키)
+    if isinstance(목록, dict):
+        return 목록
+    if not 목록:
+        return {}
+    목록 = list(목록)
+    번호 = [int(m.group(1)) for m in map(_ID_번호.search, 목록) if m]
+    state[등록부_키] = {조사_id: n for n, 조사_id in enumerate(목록, start=1)}
+    state[다음번호_키] = max(번호 + [len(목록), state.get(다음번호_키, 1) - 1]) + 1
+    return state[등록부_키]
+
+
+def investigation_ids(state):
+    """등록된 조사 ID 목록 (추가한 순서)"""
+    return list(registry(state))
+
+
+def add_investigation(state):
+    """새 조사 등록 후 ID 반환 (삭제한 조사의 번호는 다시 쓰지 않음)"""
+    registry(state)
+    목록 = state.setdefault(등록부_키, {})
+    번호 = state.get(다음번호_키, 1)
+    조사_id = ID_형식.format(번호)
+    목록[조사_id] = 번호
+    state[다음번호_키] = 번호 + 1
+    return 조사_id
+
+
+def delete_investigation(state, 조사_id):
+    """조사와 그 조사의 키(보관된 위젯 값 포함)만 삭제"""
+    registry(state).pop(조사_id, None)
+    보관 = state.get("_위젯_보관", {})
+    for key in investigation_keys(조사_id):
+        if key in state:
+            del state[key]
+        보관.pop(key, None)
+
+
+def empty_cause_table():
+    return pd.DataFrame({열: [""] for 열 in 원인분석_열})
+
+
+def _widget_value(state, key):
+    if key in state:
+        return state[key]
+    return state.get("_위젯_보관", {}).get(key, "")
+
+
+def to_frames(state):
+    """저장용 표 (조사 목록, 원인분석) - 원인분석은 모든 조사를 조사 ID 열로 구분해 한 표에"""
+    ids = investigation_ids(state)
+    목록 = pd.DataFrame({
+        "조사ID": ids,
+        "작업공정명": [_widget_value(state, investigation_key("작업공정명", i)) for i in ids],
+        "작업명": [_widget_value(state, investigation_key("작업명", i)) for i in ids],
+    })
+    tables = [
+        state[investigation_key("원인분석", i)].assign(조사ID=i)
+        for i in ids if isinstance(state.get(investigation_key("원인분석", i)), pd.DataFrame)
+    ]
+    원인분석 = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=원인분석_열 + ["조사ID"])
+    return 목록, 원인분석
+
+
+def from_frames(목록, 원인분석):
+    """to_frames로 저장한 표 -> {세션 상태 키: 값}"""
+    ids = [str(i) for i in 목록["조사ID"].tolist()] if "조사ID" in 목록.columns else []
+    번호 = [int(m.group(1)) for m in map(_ID_번호.search, ids) if m]
+    values = {등록부_키: {i: n for n, i in enumerate(ids, start=1)}, 다음번호_키: max(번호 + [len(ids)]) + 1}
+    for row in 목록.to_dict("records"):
+        for 필드 in ("작업공정명", "작업명"):
+            values[investigation_key(필드, row["조사ID"])] = row.get(필드, "")
+    if "조사ID" in 원인분석.columns:
+        columns = [열 for 열 in 원인분석.columns if 열 != "조사ID"]
+        for 조사_id, table in 원인분석.groupby("조사ID", sort=False):
+            values[investigation_key("원인분석", 조사_id)] = table[columns].reset_index(drop=True)
+    return values
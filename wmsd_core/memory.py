@@ -0,0 +1,33 @@
+import sys
+
+# 세션 상태 값의 메모리 추정 (운영 지표, 세션 캐시, 지난 작업 정리에서 공통으로 사용)
+
+
+def estimate_bytes(value):
+    """세션 상태 값 하나의 대략적인 메모리 크기"""
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage) and hasattr(value, "columns"):
+        try:
+            return int(memory_usage(index=True, deep=True).sum())
+        except Exception:
+            return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+def estimate_session_bytes(state):
+    """세션 상태 전체의 메모리 추정치 (DataFrame은 deep 측정)"""
+    total = 0
+    for key in list(state.keys()):
+        try:
+            total += estimate_bytes(state[key])
+        except Exception:
+            continue
+    return total
@@ -0,0 +1,37 @@
+from wmsd_core.checklist import task_groups, first_value, work_conditions_table, total_scores
+from wmsd_core.hazards import default_hazard_entries
+from wmsd_core.work_model import task_key, 작업조건_키, 원인분석_키
+
+# 사업장개요 탭의 항목 (저장 파일 1_사업장개요 시트와 같은 키)
+개요_항목 = ("사업장명", "소재지", "업종", "예비조사", "수행기관", "본조사", "성명")
+
+
+def task_defaults(작업명, rows):
+    """작업 하나를 탭에서 처음 열었을 때 채워지는 세션 상태 값 {키: 값}"""
+    작업조건 = work_conditions_table(rows)
+    return {
+        # 유해요인조사표, 작업조건조사 1·3단계 입력칸의 기본값
+        task_key("작업공정명", 작업명): 작업명,
+        task_key("조사_작업명", 작업명): 작업명,
+        task_key("작업공정", 작업명): 작업명,
+        task_key("작업내용", 작업명): first_value(rows, "작업내용(상세설명)"),
+        task_key("평가_작업명", 작업명): 작업명,
+        task_key("근로자수", 작업명): first_value(rows, "작업자 수"),
+        작업조건_키.format(작업명): 작업조건.assign(총점=total_scores(작업조건)),
+        원인분석_키.format(작업명): default_hazard_entries(rows),
+    }
+
+
+def initial_state(checklist_df, **개요):
+    """체크리스트로 세션 상태 dict 생성 (모든 작업을 탭에서 한 번씩 연 것과 같은 값)
+
+    개요에는 사업장명, 소재지 등 사업장개요 항목을 줄 수 있습니다. 결과는 write_workbook,
+    build_site, build_report_pdf 등 세션 상태를 받는 함수에 그대로 넘길 수 있습니다.
+    """
+    state = {key: str(value) for key, value in 개요.items() if key in 개요_항목}
+    state["checklist_df"] = checklist_df
+    if checklist_df.empty or "작업명" not in checklist_df.columns:
+        return state
+    for 작업명, rows in task_groups(checklist_df):
+        state.update(task_defaults(작업명, rows))
+    return state
@@ -0,0 +1,158 @@
+import os
+import json
+import tempfile
+import threading
+from io import BytesIO
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 등 fcntl이 없는 환경에서는 프로세스 안의 잠금만 사용
+    fcntl = None
+
+# 저장 디렉토리 (실제로 파일을 쓸 때 생성)
+SAVE_DIR = "saved_sessions"
+# 세션 목록을 빠르게 읽기 위한 메타데이터 파일 확장자 (Excel과 같은 이름으로 저장)
+SESSION_META_EXT = ".meta.json"
+# 세션별 잠금 파일 위치 (여러 서버 프로세스가 같은 SAVE_DIR을 쓸 때 사용)
+LOCK_DIR = os.path.join(SAVE_DIR, ".locks")
+# 임시 파일 접두사 - 저장 목록(.xlsx)에 나타나지 않도록 확장자는 .tmp
+TMP_PREFIX = ".tmp_"
+
+_thread_locks = {}   # 잠금 이름 -> [threading.Lock, 사용 중인 수]
+_registry_lock = threading.Lock()
+
+
+def _safe_name(name):
+    return str(name).replace("/", "_").replace("\\", "_")
+
+
+def _acquire_thread_lock(name):
+    with _registry_lock:
+        entry = _thread_locks.setdefault(name, [threading.Lock(), 0])
+        entry[1] += 1
+    entry[0].acquire()
+    return entry
+
+
+def _release_thread_lock(name, entry):
+    entry[0].release()
+    with _registry_lock:
+        entry[1] -= 1
+        # 아무도 쓰지 않는 잠금은 제거 (세션 수만큼 잠금이 쌓이지 않도록)
+        if entry[1] == 0 and _thread_locks.get(name) is entry:
+            del _thread_locks[name]
+
+
+@contextmanager
+def session_lock(session_id):
+    """세션 하나의 쓰기 잠금 (같은 세션의 저장만 순서대로 실행, 다른 세션은 막지 않음)
+
+    프로세스 안에서는 스레드 잠금, 프로세스 사이에서는 잠금 파일(flock)을 사용합니다.
+    """
+    name = _safe_name(session_id)
+    entry = _acquire_thread_lock(name)
+    lock_fp = None
+    try:
+        if fcntl is not None:
+            os.makedirs(LOCK_DIR, exist_ok=True)
+            lock_fp = open(os.path.join(LOCK_DIR, f"{name}.lock"), "a+b")
+            fcntl.flock(lock_fp.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        if lock_fp is not None:
+            fcntl.flock(lock_fp.fileno(), fcntl.LOCK_UN)
+            lock_fp.close()
+        _release_thread_lock(name, entry)
+
+
+@contextmanager
+def atomic_write(path, mode="wb", encoding=None):
+    """임시 파일에 쓴 뒤 이름을 바꿔 교체 (읽는 쪽은 항상 이전 파일 또는 완성된 새 파일만 봄)
+
+    with 블록에서 예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둡니다.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{TMP_PREFIX}{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_snapshot(path):
+    """파일 전체를 한 번에 읽어 BytesIO로 반환 (읽는 도중 교체되어도 한 버전만 읽음)"""
+    with open(path, "rb") as fp:
+        return BytesIO(fp.read())
+
+
+def session_path(session_id, directory=None):
+    """세션 Excel 파일 경로 (directory를 주지 않으면 SAVE_DIR)"""
+    return os.path.join(directory or SAVE_DIR, f"{session_id}.xlsx")
+
+
+def ensure_save_dir(directory=None):
+    """저장 디렉토리를 만들고 경로를 반환"""
+    directory = directory or SAVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def write_session_meta(filepath, metadata):
+    """Excel 세션 파일 옆에 메타데이터 JSON 기록 (임시 파일에 쓴 뒤 교체)"""
+    meta_path = filepath[:-len(".xlsx")] + SESSION_META_EXT
+    with atomic_write(meta_path, "w", encoding="utf-8") as fp:
+        json.dump(metadata, fp, ensure_ascii=False)
+
+
+def read_session_meta(filepath):
+    """세션 메타데이터 읽기 (JSON이 없는 예전 파일은 Excel에서 읽고 JSON을 만들어 둠)"""
+    meta_path = filepath[:-len(".xlsx")] + SESSION_META_EXT
+    if os.path.exists(meta_path) and os.path.getmtime(meta_path) >= os.path.getmtime(filepath):
+        with open(meta_path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    import pandas as pd
+    metadata_df = pd.read_excel(filepath, sheet_name='메타데이터')
+    if metadata_df.empty:
+        return None
+    row = metadata_df.iloc[0].to_dict()
+    metadata = {key: str(row.get(key, "")) for key in ("session_id", "workplace", "saved_at")}
+    try:
+        write_session_meta(filepath, metadata)
+    except OSError:
+        pass
+    return metadata
+
+
+def saved_sessions(directory=None):
+    """디렉토리의 저장된 Excel 세션 파일 목록 (최근 저장 순)"""
+    directory = directory or SAVE_DIR
+    sessions = []
+    if os.path.exists(directory):
+        for filename in os.listdir(directory):
+            if filename.endswith('.xlsx'):
+                filepath = os.path.join(directory, filename)
+                try:
+                    metadata = read_session_meta(filepath)
+                    if metadata:
+                        sessions.append({
+                            "filename": filename,
+                            "session_id": metadata.get("session_id", ""),
+                            "workplace": metadata.get("workplace", ""),
+                            "saved_at": metadata.get("saved_at", "")
+                        })
+                except Exception:
+                    # 읽을 수 없는 파일(손상, 메타데이터 시트 없음 등)은 목록에서 제외
+                    continue
+    return sorted(sessions, key=lambda x: x["saved_at"], reverse=True)
@@ -0,0 +1,362 @@
+import pandas as pd
+
+# 증상조사 분석 표의 구분값 (tab6_symptom_analysis 표 양식과 동일)
+성별_목록 = ["남", "여"]
+연령대_목록 = ["20대", "30대", "40대", "50대", "60대 이상"]
+근무기간_목록 = ["1년 미만", "1~5년", "5~10년", "10년 이상"]
+육체적부담_목록 = ["매우 쉬움", "쉬움", "약간 힘듦", "힘듦", "매우 힘듦"]
+통증부위_목록 = ["목", "어깨", "등/허리", "팔/팔꿈치", "손/손목/손가락", "다리/발"]
+
+# 개인별 설문 응답 파일의 컬럼 (부서/공정은 "부서", "공정" 컬럼으로도 받음)
+설문_필수_컬럼 = ["성별", "나이", "근무기간(년)", "육체적부담"]
+설문_선택_컬럼 = ["응답자ID", "부서/공정", "통증부위"]
+
+미기재_부서 = "미기재"
+
+_성별_변환 = {
+    "남": "남", "남자": "남", "남성": "남", "M": "남", "m": "남", "1": "남",
+    "여": "여", "여자": "여", "여성": "여", "F": "여", "f": "여", "2": "여",
+}
+
+_부담_변환 = {
+    **{label: label for label in 육체적부담_목록},
+    "매우쉬움": "매우 쉬움", "약간힘듦": "약간 힘듦", "매우힘듦": "매우 힘듦",
+    "1": "매우 쉬움", "2": "쉬움", "3": "약간 힘듦", "4": "힘듦", "5": "매우 힘듦",
+}
+
+_부위_변환 = {
+    **{부위: 부위 for 부위 in 통증부위_목록},
+    "허리": "등/허리", "등": "등/허리",
+    "팔": "팔/팔꿈치", "팔꿈치": "팔/팔꿈치",
+    "손": "손/손목/손가락", "손목": "손/손목/손가락", "손가락": "손/손목/손가락",
+    "다리": "다리/발", "무릎": "다리/발", "발": "다리/발",
+}
+
+_해당_값 = {"O", "o", "1", "1.0", "Y", "y", "예", "있음", "TRUE", "True", "true"}
+
+
+def _normalize_text(series):
+    """결측값을 빈 문자열로 바꾸고 앞뒤 공백 제거"""
+    return series.astype("string").fillna("").str.strip()
+
+
+def _pain_matrix(df):
+    """응답자별 통증부위를 부위 컬럼의 0/1 행렬로 변환"""
+    부위_컬럼 = [부위 for 부위 in 통증부위_목록 if 부위 in df.columns]
+    if 부위_컬럼:
+        matrix = pd.DataFrame(0, index=df.index, columns=통증부위_목록, dtype="int64")
+        for 부위 in 부위_컬럼:
+            matrix[부위] = _normalize_text(df[부위]).isin(_해당_값).astype("int64")
+        return matrix
+
+    if "통증부위" not in df.columns:
+        return pd.DataFrame(0, index=df.index, columns=통증부위_목록, dtype="int64")
+
+    # "목, 어깨/허리" 처럼 여러 부위를 한 셀에 적은 경우
+    부위_문자열 = _normalize_text(df["통증부위"]).str.replace(r"\s*[,;·]\s*", ",", regex=True)
+    dummies = 부위_문자열.str.get_dummies(sep=",")
+    dummies.columns = [_부위_변환.get(col.strip(), None) for col in dummies.columns]
+    dummies = dummies.loc[:, dummies.columns.notna()]
+    # 같은 부위로 변환된 별칭 컬럼은 하나로 합친 뒤 0/1로 정리
+    matrix = dummies.T.groupby(level=0).max().T if not dummies.empty else dummies
+    return matrix.reindex(columns=통증부위_목록, fill_value=0).clip(upper=1).astype("int64")
+
+
+def normalize_responses(raw_df):
+    """개인별 설문 응답을 구분값(성별, 연령대, 근무기간, 육체적부담, 부서/공정, 통증부위)으로 정규화합니다.
+
+    반환값은 (정규화된 DataFrame, 누락된 필수 컬럼 목록)입니다.
+    """
+    missing_columns = [col for col in 설문_필수_컬럼 if col not in raw_df.columns]
+    if missing_columns:
+        return pd.DataFrame(), missing_columns
+
+    df = pd.DataFrame(index=raw_df.index)
+
+    성별 = _normalize_text(raw_df["성별"]).str.replace(r"\.0$", "", regex=True)
+    df["성별"] = pd.Categorical(성별.map(_성별_변환), categories=성별_목록)
+
+    나이 = pd.to_numeric(raw_df["나이"], errors="coerce")
+    df["연령대"] = pd.cut(
+        나이, bins=[-float("inf"), 30, 40, 50, 60, float("inf")],
+        right=False, labels=연령대_목록
+    )
+
+    근무기간 = pd.to_numeric(raw_df["근무기간(년)"], errors="coerce")
+    df["근무기간"] = pd.cut(
+        근무기간, bins=[-float("inf"), 1, 5, 10, float("inf")],
+        right=False, labels=근무기간_목록
+    )
+
+    부담 = _normalize_text(raw_df["육체적부담"]).str.replace(r"\.0$", "", regex=True)
+    df["육체적부담"] = pd.Categorical(부담.map(_부담_변환), categories=육체적부담_목록)
+
+    if "부서/공정" in raw_df.columns:
+        부서 = _normalize_text(raw_df["부서/공정"])
+    elif "부서" in raw_df.columns and "공정" in raw_df.columns:
+        부서 = (_normalize_text(raw_df["부서"]) + "/" + _normalize_text(raw_df["공정"])).str.strip("/")
+    elif "부서" in raw_df.columns:
+        부서 = _normalize_text(raw_df["부서"])
+    elif "공정" in raw_df.columns:
+        부서 = _normalize_text(raw_df["공정"])
+    else:
+        부서 = pd.Series("", index=raw_df.index, dtype="string")
+    df["부서/공정"] = 부서.mask(부서 == "", 미기재_부서).astype(str)
+
+    df[통증부위_목록] = _pain_matrix(raw_df)
+
+    if "응답자ID" in raw_df.columns:
+        df["응답자ID"] = _normalize_text(raw_df["응답자ID"]).str.replace(r"\.0$", "", regex=True)
+    return df, []
+
+
+def _with_totals(counts, 구분_목록, 구분_컬럼="구분"):
+    """건수 표에 계 컬럼과 계 행을 붙여 tab6 표 양식으로 변환"""
+    counts = counts.reindex(index=구분_목록, fill_value=0).astype("int64")
+    counts["계"] = counts.sum(axis=1)
+    counts.loc["계"] = counts.sum(axis=0)
+    counts.index.name = 구분_컬럼
+    counts.columns.name = None
+    return counts.reset_index()
+
+
+def _count_tensors(responses):
+    """응답 묶음의 건수 텐서(성별×연령대, 성별×근무기간, 부담×성별, 부서/공정×통증부위) 계산"""
+    성별 = responses["성별"]
+
+    성별_연령대 = pd.crosstab(성별, responses["연령대"], dropna=False)
+    성별_근무기간 = pd.crosstab(성별, responses["근무기간"], dropna=False)
+    부담_성별 = pd.crosstab(responses["육체적부담"], 성별, dropna=False)
+    부서_부위 = responses.groupby("부서/공정", sort=False)[통증부위_목록].sum()
+
+    return {
+        "성별_연령대": 성별_연령대.reindex(index=성별_목록, columns=연령대_목록, fill_value=0).astype("int64"),
+        "성별_근무기간": 성별_근무기간.reindex(index=성별_목록, columns=근무기간_목록, fill_value=0).astype("int64"),
+        "부담_성별": 부담_성별.reindex(index=육체적부담_목록, columns=성별_목록, fill_value=0).astype("int64"),
+        "부서_부위": 부서_부위.astype("int64"),
+    }
+
+
+def _tables_from_tensors(tensors):
+    """건수 텐서를 tab6 표 양식(계 행/열 포함)으로 변환"""
+    통증호소자 = tensors["부서_부위"].sort_index()
+    통증호소자 = 통증호소자.loc[통증호소자.sum(axis=1) > 0] if not 통증호소자.empty else 통증호소자
+    통증호소자 = 통증호소자.copy()
+    통증호소자["계"] = 통증호소자.sum(axis=1)
+    통증호소자.index.name = "부서/공정"
+
+    return {
+        "기초현황_data": _with_totals(tensors["성별_연령대"].copy(), 성별_목록),
+        "작업기간_data": _with_totals(tensors["성별_근무기간"].copy(), 성별_목록),
+        "육체적부담_data": _with_totals(tensors["부담_성별"].copy(), 육체적부담_목록),
+        "통증호소자_data": 통증호소자.astype("int64").reset_index(),
+    }
+
+
+def build_symptom_tables(responses):
+    """정규화된 응답으로 기초현황, 작업기간, 육체적부담, 통증호소자 표를 한 번에 계산합니다."""
+    return _tables_from_tensors(_count_tensors(responses))
+
+
+# --- 누적 집계 (설문이 교대조별로 나누어 들어오는 경우) ---
+
+# 응답자별로 보관하는 구분값 (통증부위는 비트마스크 하나로 저장)
+_기록_컬럼 = ["성별", "연령대", "근무기간", "육체적부담", "부서/공정"]
+
+
+def empty_aggregates():
+    """빈 누적 집계 생성 (st.session_state["증상조사_집계"]에 보관)"""
+    return {
+        "성별_연령대": pd.DataFrame(0, index=성별_목록, columns=연령대_목록, dtype="int64"),
+        "성별_근무기간": pd.DataFrame(0, index=성별_목록, columns=근무기간_목록, dtype="int64"),
+        "부담_성별": pd.DataFrame(0, index=육체적부담_목록, columns=성별_목록, dtype="int64"),
+        "부서_부위": pd.DataFrame(columns=통증부위_목록, dtype="int64"),
+        "records": {},      # 응답자ID -> (성별, 연령대, 근무기간, 육체적부담, 부서/공정, 통증부위 비트)
+        "next_auto_id": 1,  # 응답자ID가 없는 응답에 붙일 일련번호
+        "version": 0,
+    }
+
+
+def _encode_records(responses):
+    """응답 DataFrame을 응답자별 튜플 목록으로 변환"""
+    부위_비트 = sum(
+        responses[부위].to_numpy(dtype="int64") << i for i, 부위 in enumerate(통증부위_목록)
+    )
+    columns = [responses[col].astype(object).where(responses[col].notna(), None) for col in _기록_컬럼]
+    return list(zip(*columns, 부위_비트.tolist()))
+
+
+def _decode_records(records):
+    """응답자별 튜플 목록을 정규화된 응답 DataFrame으로 되돌림"""
+    df = pd.DataFrame.from_records(records, columns=_기록_컬럼 + ["_부위"])
+    df["성별"] = pd.Categorical(df["성별"], categories=성별_목록)
+    df["연령대"] = pd.Categorical(df["연령대"], categories=연령대_목록)
+    df["근무기간"] = pd.Categorical(df["근무기간"], categories=근무기간_목록)
+    df["육체적부담"] = pd.Categorical(df["육체적부담"], categories=육체적부담_목록)
+    비트 = df.pop("_부위").to_numpy(dtype="int64")
+    for i, 부위 in enumerate(통증부위_목록):
+        df[부위] = (비트 >> i) & 1
+    return df
+
+
+def _apply_tensors(agg, tensors, sign):
+    """누적 집계에 건수 텐서를 더하거나(sign=1) 뺌(sign=-1)"""
+    for name, counts in tensors.items():
+        if counts.empty:
+            continue
+        agg[name] = agg[name].add(counts * sign, fill_value=0).astype("int64")
+
+
+def fold_batch(agg, responses):
+    """새 응답 묶음을 누적 집계에 반영합니다 (처리량은 묶음 크기에 비례).
+
+    이미 반영된 응답자ID가 다시 들어오면 이전 응답을 빼고 새 응답으로 정정합니다.
+    반환값은 (신규 건수, 정정 건수)입니다.
+    """
+    if responses.empty:
+        return 0, 0
+
+    if "응답자ID" in responses.columns:
+        ids = responses["응답자ID"].astype("string").fillna("").str.strip().to_numpy(dtype=object)
+    else:
+        ids = pd.Series("", index=responses.index).to_numpy(dtype=object)
+
+    # 응답자ID가 없는 응답은 자동 번호 부여
+    비어있음 = ids == ""
+    if 비어있음.any():
+        시작 = agg["next_auto_id"]
+        ids[비어있음] = [f"AUTO-{n:06d}" for n in range(시작, 시작 + int(비어있음.sum()))]
+        agg["next_auto_id"] = 시작 + int(비어있음.sum())
+
+    # 같은 묶음 안에서 중복된 ID는 마지막 응답만 사용
+    중복아님 = ~pd.Series(ids).duplicated(keep="last").to_numpy()
+    responses = responses.loc[중복아님]
+    ids = ids[중복아님].tolist()
+
+    records = agg["records"]
+    이전_기록 = [records[rid] for rid in ids if rid in records]
+    if 이전_기록:
+        _apply_tensors(agg, _count_tensors(_decode_records(이전_기록)), -1)
+
+    _apply_tensors(agg, _count_tensors(responses), 1)
+    records.update(zip(ids, _encode_records(responses)))
+    agg["version"] += 1
+    return len(ids) - len(이전_기록), len(이전_기록)
+
+
+def retract_responses(agg, respondent_ids):
+    """응답자ID 목록의 응답을 누적 집계에서 철회합니다. 철회된 건수를 반환합니다."""
+    records = agg["records"]
+    철회_기록 = [records.pop(rid) for rid in dict.fromkeys(respondent_ids) if rid in records]
+    if 철회_기록:
+        _apply_tensors(agg, _count_tensors(_decode_records(철회_기록)), -1)
+        agg["version"] += 1
+    return len(철회_기록)
+
+
+def records_frame(agg):
+    """누적 집계의 응답자별 기록 -> 표 (응답자ID, 구분값, 통증부위 0/1 열) - 세션 파일의 응답 시트"""
+    df = _decode_records(list(agg["records"].values()))
+    df.insert(0, "응답자ID", list(agg["records"]))
+    return df
+
+
+def aggregates_from_records(df):
+    """records_frame 표(세션 파일에서 읽은 표) -> 누적 집계 (정정/철회를 계속할 수 있도록 응답자별 기록도 복원)"""
+    agg = empty_aggregates()
+    if df.empty:
+        return agg
+    responses = pd.DataFrame({
+        "성별": pd.Categorical(df["성별"], categories=성별_목록),
+        "연령대": pd.Categorical(df["연령대"], categories=연령대_목록),
+        "근무기간": pd.Categorical(df["근무기간"], categories=근무기간_목록),
+        "육체적부담": pd.Categorical(df["육체적부담"], categories=육체적부담_목록),
+        "부서/공정": df["부서/공정"].astype("string").fillna(미기재_부서).astype(str),
+        **{부위: pd.to_numeric(df.get(부위), errors="coerce").fillna(0).astype("int64") for 부위 in 통증부위_목록},
+    })
+    ids = df["응답자ID"].astype(str).tolist()
+    _apply_tensors(agg, _count_tensors(responses), 1)
+    agg["records"] = dict(zip(ids, _encode_records(responses)))
+    자동_번호 = [int(rid[len("AUTO-"):]) for rid in ids if rid.startswith("AUTO-") and rid[len("AUTO-"):].isdigit()]
+    agg["next_auto_id"] = max(자동_번호, default=0) + 1
+    agg["version"] = 1
+    return agg
+
+
+def _table_counts(table, index, columns, 구분_컬럼="구분"):
+    """tab6 표 -> 건수 표 (계 행/열은 빼고, 숫자가 아닌 칸은 0)"""
+    counts = table.set_index(table[구분_컬럼].astype(str).str.strip()).reindex(index=index, columns=columns)
+    return counts.apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+
+
+def aggregates_from_tables(tables):
+    """tab6 표(직접 입력했거나 세션 파일에서 읽은 표) -> 누적 집계
+
+    응답자별 기록이 없으므로 이전 응답의 정정/철회는 할 수 없고, 새로 반영하는 응답은 표의 건수에 더해집니다.
+    """
+    agg = empty_aggregates()
+    for name, key, index, columns in [
+        ("성별_연령대", "기초현황_data", 성별_목록, 연령대_목록),
+        ("성별_근무기간", "작업기간_data", 성별_목록, 근무기간_목록),
+        ("부담_성별", "육체적부담_data", 육체적부담_목록, 성별_목록),
+    ]:
+        table = tables.get(key)
+        if isinstance(table, pd.DataFrame) and "구분" in table.columns:
+            agg[name] = _table_counts(table, index, columns)
+    통증호소자 = tables.get("통증호소자_data")
+    if isinstance(통증호소자, pd.DataFrame) and "부서/공정" in 통증호소자.columns:
+        부서 = 통증호소자["부서/공정"].astype("string").fillna("").str.strip()
+        counts = 통증호소자.reindex(columns=통증부위_목록).apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+        counts.index = pd.Index(부서.mask(부서 == "", 미기재_부서).astype(str), name="부서/공정")
+        counts = counts[counts.sum(axis=1) > 0]
+        agg["부서_부위"] = counts.groupby(level=0, sort=False).sum()
+    return agg
+
+
+def materialize_tables(agg):
+    """누적 집계로부터 tab6 표를 만듭니다 (집계가 바뀌지 않았으면 이전 결과 재사용)."""
+    cached = agg.get("_views")
+    if cached and cached[0] == agg["version"]:
+        return cached[1]
+    tables = _tables_from_tensors(agg)
+    agg["_views"] = (agg["version"], tables)
+    return tables
+
+
+def finalize_sex_table(df, band_columns):
+    """남/여 행의 계 컬럼과 계 행을 다시 계산 (기초현황, 작업기간 편집표용)"""
+    df = df.copy()
+    df[band_columns] = df[band_columns].apply(pd.to_numeric, errors="coerce").fillna(0)
+    df.loc[0:1, "계"] = df.loc[0:1, band_columns].sum(axis=1)
+    df.loc[2, band_columns + ["계"]] = df.loc[0:1, band_columns + ["계"]].sum(axis=0)
+    return df
+
+
+def finalize_burden_table(df):
+    """부담 정도별 계 컬럼과 계 행을 다시 계산 (육체적부담 편집표용)"""
+    df = df.copy()
+    df[성별_목록] = df[성별_목록].apply(pd.to_numeric, errors="coerce").fillna(0)
+    df.loc[0:4, "계"] = df.loc[0:4, 성별_목록].sum(axis=1)
+    df.loc[5, 성별_목록 + ["계"]] = df.loc[0:4, 성별_목록 + ["계"]].sum(axis=0)
+    return df
+
+
+def finalize_pain_table(df):
+    """부서/공정별 계 컬럼을 다시 계산 (통증호소자 편집표용)"""
+    df = df.reset_index(drop=True)
+    df[통증부위_목록] = df[통증부위_목록].apply(pd.to_numeric, errors="coerce").fillna(0)
+    df["계"] = df[통증부위_목록].sum(axis=1)
+    return df
+
+
+def sample_responses():
+    """업로드 양식 확인용 샘플 응답"""
+    return pd.DataFrame({
+        "응답자ID": ["R0001", "R0002", "R0003"],
+        "성별": ["남", "여", "남"],
+        "나이": [34, 41, 57],
+        "근무기간(년)": [2.5, 12, 0.5],
+        "육체적부담": ["약간 힘듦", "힘듦", "쉬움"],
+        "부서/공정": ["생산1팀/조립", "물류팀/운반", "생산1팀/조립"],
+        "통증부위": ["목, 어깨", "허리", ""],
+    })
@@ -0,0 +1,275 @@
+import re
+
+import pandas as pd
+
+from wmsd_core.memory import estimate_session_bytes
+
+# 작업별 데이터 모델: 사업장(Site) → 작업(Task) → 단위작업(작업조건 표) → 원인분석 항목(열 단위 표)
+# 탭 위젯은 세션 상태 키에 묶이므로 키 형식은 여기서만 정의하고, 탭/저장/보고서는 모두 이 형식을 사용
+
+# 작업별 단일 값 필드 -> 세션 상태 키 형식
+작업_필드 = {
+    # 유해요인조사표 - 가. 조사개요
+    "조사일시": "조사일시_{}",
+    "부서명": "부서명_{}",
+    "조사자": "조사자_{}",
+    "작업공정명": "작업공정명_{}",
+    "조사_작업명": "작업명_{}",
+    # 작업조건조사 - 1단계, 3단계
+    "작업공정": "1단계_작업공정_{}",
+    "작업내용": "1단계_작업내용_{}",
+    "평가_작업명": "3단계_작업명_{}",
+    "근로자수": "3단계_근로자수_{}",
+}
+작업조건_키 = "작업조건_data_{}"
+원인분석_키 = "원인분석_항목_{}"
+
+# 유해요인조사표 - 나. 작업장 상황조사
+상황조사_항목 = ("작업설비", "작업량", "작업속도", "업무변화")
+상황조사_종류 = ("상태", "감소_시작", "증가_시작", "기타_내용")
+
+# 작업을 한 번이라도 연 흔적으로 남는 키의 접두사 (접두사 뒤가 곧 작업명)
+# 작업조건_data_는 편집기 키(작업조건_data_editor_...)와 겹치므로 쓰지 않음
+작업_흔적_접두사 = tuple(형식[:-2] for 형식 in 작업_필드.values()) + (원인분석_키[:-2], "사진개수_")
+
+# 작업별 키 형식 전체 - 작업 데이터와 tab4 위젯 키 ({번호}는 원인분석 항목/사진 번호, {}는 작업명)
+# 작업을 지우거나 구역으로 나눌 때 이 형식에 맞는 키만 작업의 키로 봄 (끝이 _작업명인 다른 키는 건드리지 않음)
+_원인분석_위젯 = (
+    "hazard_type", "delete_hazard_analysis", "burden_task_반복", "burden_pose", "burden_force", "burden_other",
+    "수공구_종류", "수공구_용도", "수공구_무게", "수공구_사용시간", "부담부위",
+    "반복_회당시간", "반복_총횟수", "반복_총시간", "물체_무게_10호", "분당_반복횟수_10호",
+    "반복_작업내용_12호_정적", "반복_작업시간_12호_정적", "반복_휴식시간_12호_정적", "반복_인체부담부위_12호_정적",
+    "자세_회당시간", "자세_총횟수", "자세_총시간",
+    "힘_중량물_명칭", "힘_중량물_용도", "중량물_무게_기본", "중량물_횟수", "힘_취급방법", "힘_이동방법",
+    "힘_직접_밀당", "힘_기타_밀당_설명",
+    "기타_작업시간", "기타_진동수공구명", "기타_진동수공구_용도", "기타_작업시간_진동", "기타_작업빈도_진동",
+    "기타_작업량_진동", "기타_지지대_여부",
+)
+작업_키_형식 = (
+    tuple(작업_필드.values())
+    + (작업조건_키, 원인분석_키, "작업조건_data_editor_{}", "작업조건_편집기준_{}", "add_hazard_analysis_{}", "사진개수_{}")
+    + tuple(f"사진_{{번호}}_{종류}_{{}}" for 종류 in ("데이터", "업로드", "삭제", "설명"))
+    + tuple(f"{항목}_{종류}_{{}}" for 항목 in 상황조사_항목 for 종류 in 상황조사_종류)
+    + tuple(f"{이름}_{{번호}}_{{}}" for 이름 in _원인분석_위젯)
+)
+# 접두사가 긴 형식부터 (작업조건_data_editor_A는 작업조건_data_{} 형식보다 편집기 형식을 먼저 봄)
+_작업_키_패턴 = [
+    re.compile(re.escape(형식[:-2]).replace(re.escape("{번호}"), r"\d+") + "(.+)")
+    for 형식 in sorted(작업_키_형식, key=len, reverse=True)
+]
+
+# 원인분석 표의 기본 열 (항목마다 유형에 따라 다른 열이 더 붙음)
+원인분석_기본_열 = ["작업명", "순번", "유형", "부담작업", "부담작업자세"]
+
+
+def task_key(필드, 작업명):
+    """작업 필드의 세션 상태 키 (예: task_key("조사일시", "조립") -> "조사일시_조립")"""
+    return 작업_필드[필드].format(작업명)
+
+
+def situation_key(항목, 종류, 작업명):
+    """작업장 상황조사 값의 세션 상태 키 (예: "작업설비_상태_조립")"""
+    return f"{항목}_{종류}_{작업명}"
+
+
+def key_owner(key, 후보):
+    """작업별 키 형식(작업_키_형식)으로 만든 키가 속한 작업명 - 후보 작업명 중에서만 (형식에 맞지 않으면 None)
+
+    '기초현황_data'처럼 끝만 작업명과 같은 키는 작업 'data'의 키가 아닙니다.
+    """
+    for pattern in _작업_키_패턴:
+        match = pattern.fullmatch(key)
+        if match and match.group(1) in 후보:
+            return match.group(1)
+    return None
+
+
+class Task:
+    """작업 하나의 조사 내용 - 단일 값 필드는 속성, 단위작업별 평가는 작업조건 표"""
+    __slots__ = ("작업명", "회사명", "소속", "단위작업", "상황조사", "작업조건") + tuple(작업_필드)
+
+    def __init__(self, 작업명, 회사명="", 소속="", 단위작업=()):
+        self.작업명 = 작업명
+        self.회사명 = 회사명
+        self.소속 = 소속
+        self.단위작업 = tuple(단위작업)
+        self.상황조사 = {}      # (항목, 종류) -> 값
+        self.작업조건 = None    # DataFrame 또는 None
+        for 필드 in 작업_필드:
+            setattr(self, 필드, "")
+
+    def fields(self):
+        """단일 값 필드 {필드: 값}"""
+        return {필드: getattr(self, 필드) for 필드 in 작업_필드}
+
+
+class Site:
+    """사업장 전체 - 작업은 작업명으로 바로 찾고, 원인분석 항목은 모든 작업을 한 표에 보관"""
+    __slots__ = ("작업", "원인분석")
+
+    def __init__(self, 작업=None, 원인분석=None):
+        self.작업 = 작업 if 작업 is not None else {}
+        self.원인분석 = 원인분석 if 원인분석 is not None else pd.DataFrame(columns=원인분석_기본_열)
+
+    def task(self, 작업명):
+        return self.작업.get(작업명)
+
+    def hazards(self, 작업명):
+        """작업 하나의 원인분석 항목 (순번 순서)"""
+        return self.원인분석[self.원인분석["작업명"] == 작업명]
+
+
+def task_names(state):
+    """체크리스트의 작업명 목록 (utils.get_작업명_목록과 같은 순서, 모델을 만들지 않고 이름만 필요할 때)"""
+    checklist_df = state.get("checklist_df")
+    if not isinstance(checklist_df, pd.DataFrame) or checklist_df.empty or "작업명" not in checklist_df.columns:
+        return []
+    return [str(item) for item in checklist_df["작업명"].dropna().unique().tolist()]
+
+
+def _checklist_tasks(checklist_df):
+    """체크리스트에서 작업 목록 생성 (utils.get_작업명_목록과 같은 순서)"""
+    if not isinstance(checklist_df, pd.DataFrame) or checklist_df.empty or "작업명" not in checklist_df.columns:
+        return {}
+    df = checklist_df.dropna(subset=["작업명"])
+    작업명 = df["작업명"].astype(str)
+    # 작업별 첫 행의 회사명/소속, 단위작업 목록을 작업마다 반복하지 않고 한 번에 계산
+    첫행 = df.assign(작업명=작업명).drop_duplicates("작업명")
+    회사명 = 첫행["회사명"].astype(str).tolist() if "회사명" in df.columns else [""] * len(첫행)
+    소속 = 첫행["소속"].astype(str).tolist() if "소속" in df.columns else [""] * len(첫행)
+    단위작업 = {}
+    if "단위작업명" in df.columns:
+        units = df["단위작업명"]
+        mask = units.notna()
+        단위작업 = units[mask].astype(str).groupby(작업명[mask], sort=False).unique().to_dict()
+    return {
+        name: Task(name, 회사, 팀, 단위작업.get(name, ()))
+        for name, 회사, 팀 in zip(첫행["작업명"].tolist(), 회사명, 소속)
+    }
+
+
+def hazard_table(entries_by_task):
+    """{작업명: 원인분석 항목 dict 목록} -> 열 단위 표 (작업명, 순번 + 항목의 모든 열)"""
+    records = [
+        {"작업명": 작업명, "순번": 순번, **entry}
+        for 작업명, entries in entries_by_task.items()
+        for 순번, entry in enumerate(entries or [])
+    ]
+    if not records:
+        return pd.DataFrame(columns=원인분석_기본_열)
+    # object 열로 보관해 항목에 있던 값(정수 등)이 빈 칸 때문에 실수로 바뀌지 않도록
+    table = pd.DataFrame(records, dtype=object)
+    return table.reindex(columns=원인분석_기본_열 + [col for col in table.columns if col not in 원인분석_기본_열])
+
+
+def hazard_entries(table):
+    """열 단위 표 -> {작업명: 원인분석 항목 dict 목록} (항목에 없던 열은 빼고 원래 모양으로)"""
+    entries = {}
+    columns = [col for col in table.columns if col not in ("작업명", "순번")]
+    for record in table.sort_values(["작업명", "순번"], kind="stable").to_dict("records"):
+        entry = {col: record[col] for col in columns if not _is_missing(record[col])}
+        entries.setdefault(record["작업명"], []).append(entry)
+    return entries
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def build_site(state):
+    """세션 상태(또는 같은 키를 가진 dict)에서 사업장 모델 생성"""
+    작업 = _checklist_tasks(state.get("checklist_df"))
+    for 작업명, task in 작업.items():
+        for 필드, 형식 in 작업_필드.items():
+            setattr(task, 필드, state.get(형식.format(작업명), ""))
+        for 항목 in 상황조사_항목:
+            for 종류 in 상황조사_종류:
+                key = situation_key(항목, 종류, 작업명)
+                if key in state:
+                    task.상황조사[(항목, 종류)] = state[key]
+        작업조건 = state.get(작업조건_키.format(작업명))
+        task.작업조건 = 작업조건 if isinstance(작업조건, pd.DataFrame) else None
+    원인분석 = hazard_table({작업명: state.get(원인분석_키.format(작업명)) for 작업명 in 작업})
+    return Site(작업, 원인분석)
+
+
+def apply_site(state, site):
+    """사업장 모델의 내용을 세션 상태 키에 반영 (탭 위젯이 그대로 읽을 수 있도록)"""
+    entries = hazard_entries(site.원인분석)
+    for 작업명, task in site.작업.items():
+        for 필드, 형식 in 작업_필드.items():
+            state[형식.format(작업명)] = getattr(task, 필드)
+        for (항목, 종류), value in task.상황조사.items():
+            state[situation_key(항목, 종류, 작업명)] = value
+        if task.작업조건 is not None:
+            state[작업조건_키.format(작업명)] = task.작업조건
+        state[원인분석_키.format(작업명)] = entries.get(작업명, [])
+
+
+def hazard_counts(site):
+    """작업별 원인분석 유형 수 (행: 작업명, 열: 유형) - 모든 작업을 한 번에 집계"""
+    table = site.원인분석
+    table = table[table["유형"].fillna("") != ""]
+    if table.empty:
+        return pd.DataFrame()
+    return pd.crosstab(table["작업명"], table["유형"])
+
+
+def to_frames(site):
+    """직렬화용 표 {작업, 작업조건, 원인분석} - 작업별 키 대신 작업명 열로 구분"""
+    작업_rows = []
+    작업조건_목록 = []
+    for 작업명, task in site.작업.items():
+        row = {"작업명": 작업명, "회사명": task.회사명, "소속": task.소속, **task.fields()}
+        row.update({f"{항목}_{종류}": value for (항목, 종류), value in task.상황조사.items()})
+        작업_rows.append(row)
+        if task.작업조건 is not None and not task.작업조건.empty:
+            작업조건_목록.append(task.작업조건.assign(작업명=작업명))
+    작업조건 = pd.concat(작업조건_목록, ignore_index=True) if 작업조건_목록 else pd.DataFrame()
+    return {"작업": pd.DataFrame(작업_rows), "작업조건": 작업조건, "원인분석": site.원인분석}
+
+
+def _흔적_작업명(key):
+    for 접두사 in 작업_흔적_접두사:
+        if key.startswith(접두사) and len(key) > len(접두사):
+            return key[len(접두사):]
+    return None
+
+
+def purge_orphaned_tasks(state):
+    """체크리스트에서 빠진 작업의 세션 키(입력값, 위젯 상태, 보관된 위젯 값)를 삭제
+
+    (삭제한 작업 목록, 삭제한 키 수, 메모리 추정치)를 반환합니다. 체크리스트가 비어 있으면
+    아직 불러오는 중일 수 있으므로 정리하지 않습니다.
+    """
+    현재 = set(task_names(state))
+    if not 현재:
+        return [], 0, 0
+    보관 = state.get("_위젯_보관", {})
+    지난 = {_흔적_작업명(str(key)) for key in list(state.keys()) + list(보관)} - {None} - 현재
+    if not 지난:
+        return [], 0, 0
+
+    # 작업별 키 형식에 맞는 키만 대상 - 현재 작업까지 후보에 넣어야 두 작업으로 읽히는 키를 현재 작업 쪽으로 봄
+    후보 = 현재 | 지난
+    대상 = [key for key in list(state.keys()) if key_owner(str(key), 후보) in 지난]
+    보관_대상 = [key for key in 보관 if key_owner(key, 후보) in 지난]
+    values = {key: state[key] for key in 대상}
+    values.update({key: 보관[key] for key in 보관_대상 if key not in values})
+
+    nbytes = estimate_session_bytes(values)
+    for key in 대상:
+        del state[key]
+    for key in 보관_대상:
+        del 보관[key]
+    return sorted(지난), len(values), nbytes
+
+
+def collect_orphaned_tasks(state):
+    """체크리스트가 바뀐 실행에서만 purge_orphaned_tasks 실행 (바뀌지 않았으면 None)"""
+    checklist_df = state.get("checklist_df")
+    기준 = (id(checklist_df), len(checklist_df) if isinstance(checklist_df, pd.DataFrame) else 0)
+    if state.get("_작업_정리_기준") == 기준:
+        return None
+    state["_작업_정리_기준"] = 기준
+    return purge_orphaned_tasks(state)
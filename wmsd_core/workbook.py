@@ -0,0 +1,248 @@
+from datetime import datetime
+
+import pandas as pd
+
+from wmsd_core import storage, investigations, symptom_survey
+from wmsd_core.work_model import build_site, hazard_entries, task_key, 작업조건_키, 원인분석_키
+
+# 세션 상태(또는 같은 키를 가진 dict) <-> 세션 Excel 파일
+# 앱의 저장/불러오기(data_manager)와 배치 작업이 같은 형식을 쓰도록 여기서만 정의
+
+# 증상조사 표 (시트 이름 뒤부분, 세션 상태 키)
+증상조사_시트 = [
+    ("기초현황", "기초현황_data"),
+    ("작업기간", "작업기간_data"),
+    ("육체적부담", "육체적부담_data"),
+    ("통증호소자", "통증호소자_data"),
+]
+증상조사_응답_시트 = "6_증상조사_응답"
+# 작업조건 시트 위쪽의 1단계/3단계 항목 (항목 이름 -> 작업 필드)
+작업조건_항목 = {
+    "(1단계)작업공정": "작업공정",
+    "(1단계)작업내용": "작업내용",
+    "(3단계)작업명": "평가_작업명",
+    "(3단계)근로자수": "근로자수",
+}
+
+
+def _sheet_part(작업명):
+    """시트 이름에 쓰는 작업명 부분 (시트 이름은 31자 제한이 있으므로 작업명 일부만 사용)"""
+    return 작업명.replace("/", "_").replace("\\", "_")[:25]
+
+
+def save_session(state, session_id, workplace, directory=None):
+    """state를 세션 파일(directory/session_id.xlsx)로 저장하고 (파일 경로, 메타데이터) 반환
+
+    같은 세션의 저장은 순서대로 실행하고, 파일은 완성된 뒤에 교체합니다.
+    """
+    filepath = storage.session_path(session_id, storage.ensure_save_dir(directory))
+    with storage.session_lock(session_id):
+        with storage.atomic_write(filepath) as fp:
+            metadata = write_workbook(state, fp, session_id=session_id, workplace=workplace)
+        storage.write_session_meta(filepath, metadata)
+    return filepath, metadata
+
+
+def write_workbook(state, target, session_id="", workplace="", progress=None):
+    """state(state 또는 같은 키를 가진 dict)의 데이터를 Excel 통합문서로 기록합니다.
+
+    target은 파일 경로 또는 쓰기용 바이너리 파일 객체(BytesIO 등)이며, progress(완료 비율)는 작업별 시트를 쓸 때마다 호출됩니다.
+    기록한 메타데이터 dict를 반환합니다.
+    """
+    metadata = {
+        "session_id": session_id,
+        "workplace": workplace,
+        "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+    with pd.ExcelWriter(target, engine='openpyxl') as writer:
+        # --- 탭 1: 사업장 개요 ---
+        overview_data = {
+            "분류": ["사업장명", "소재지", "업종", "예비조사일", "수행기관", "본조사일", "성명"],
+            "내용": [
+                state.get("사업장명", ""),
+                state.get("소재지", ""),
+                state.get("업종", ""),
+                state.get("예비조사", ""),
+                state.get("수행기관", ""),
+                state.get("본조사", ""),
+                state.get("성명", "")
+            ]
+        }
+        pd.DataFrame(overview_data).to_excel(writer, sheet_name="1_사업장개요", index=False)
+
+        # --- 탭 2: 체크리스트 ---
+        if "checklist_df" in state and not state["checklist_df"].empty:
+            state["checklist_df"].to_excel(writer, sheet_name="2_체크리스트", index=False)
+
+        # --- 탭 3 & 4 & 5: 작업별 상세 데이터 ---
+        site = build_site(state)
+        원인분석 = hazard_entries(site.원인분석)
+
+        for 번호, (작업명, task) in enumerate(site.작업.items(), start=1):
+            safe_sheet_name = _sheet_part(작업명)
+
+            # --- 탭 3: 유해요인조사표 ---
+            hazard_data = {
+                "항목": ["조사일시", "조사자", "부서명", "작업공정명", "작업명"],
+                "내용": [task.조사일시, task.조사자, task.부서명, task.작업공정명, task.조사_작업명]
+            }
+            pd.DataFrame(hazard_data).to_excel(writer, sheet_name=f"3_{safe_sheet_name}_유해요인", index=False)
+            
+            # --- 탭 4: 작업조건조사 ---
+            # 1단계, 3단계 정보
+            work_cond_data = {
+                 "항목": list(작업조건_항목),
+                 "내용": [getattr(task, 필드) for 필드 in 작업조건_항목.values()]
+            }
+            pd.DataFrame(work_cond_data).to_excel(writer, sheet_name=f"4_{safe_sheet_name}_작업조건", index=False, startrow=0)
+            
+            # 2단계 데이터 (DataFrame)
+            if task.작업조건 is not None:
+                task.작업조건.to_excel(writer, sheet_name=f"4_{safe_sheet_name}_작업조건", index=False, startrow=len(work_cond_data["항목"])+2)
+
+            # 원인분석 데이터
+            if 원인분석_키.format(작업명) in state:
+                df_analysis = pd.DataFrame(원인분석.get(작업명, []))
+                df_analysis.to_excel(writer, sheet_name=f"4_{safe_sheet_name}_원인분석", index=False)
+
+            if progress:
+                progress(번호 / len(site.작업))
+        
+        # --- 탭 5: 정밀조사 (등록부 + 모든 조사의 원인분석을 조사ID 열로 구분한 표) ---
+        if investigations.investigation_ids(state):
+            조사_목록, 조사_원인분석 = investigations.to_frames(state)
+            조사_목록.to_excel(writer, sheet_name="5_정밀조사", index=False)
+            조사_원인분석.to_excel(writer, sheet_name="5_정밀조사_원인분석", index=False)
+        # 인간공학적 평가는 입력만 저장 (결과는 불러온 뒤 다시 계산)
+        for 이름, key in investigations.평가_키.items():
+            if isinstance(state.get(key), pd.DataFrame):
+                state[key].to_excel(writer, sheet_name=f"5_{이름}", index=False)
+
+        # --- 탭 6: 증상조사 (표 + 누적 집계의 응답자별 기록) ---
+        for 이름, key in 증상조사_시트:
+            if isinstance(state.get(key), pd.DataFrame):
+                state[key].to_excel(writer, sheet_name=f"6_{이름}", index=False)
+        if state.get("증상조사_집계") is not None:
+            symptom_survey.records_frame(state["증상조사_집계"]).to_excel(writer, sheet_name=증상조사_응답_시트, index=False)
+
+        # (기타 탭 데이터 추가 영역)
+        # tab7_improvement_plan 관련 데이터가 
+        # st.session_state에 저장된다면 여기에 유사한 로직으로 추가할 수 있습니다.
+
+        # --- 메타데이터 (저장된 세션 목록에서 사용) ---
+        pd.DataFrame([metadata]).to_excel(writer, sheet_name="메타데이터", index=False)
+    return metadata
+
+
+
+def read_workbook(source):
+    """세션 Excel 파일(경로 또는 바이너리 파일 객체) 내용을 {세션 상태 키: 값}으로 변환"""
+    values = {}
+    xls = pd.ExcelFile(source)
+
+    # 1. 사업장개요
+    if "1_사업장개요" in xls.sheet_names:
+        df = pd.read_excel(xls, sheet_name="1_사업장개요")
+        # key-value 쌍으로 저장
+        # 예: values["사업장명"] = "A사업장"
+        for _, row in df.iterrows():
+            if pd.notna(row["분류"]) and pd.notna(row["내용"]):
+                 # overview 탭의 key값으로 저장
+                if row["분류"] == "예비조사일": values["예비조사"] = row["내용"]
+                elif row["분류"] == "본조사일": values["본조사"] = row["내용"]
+                else: values[row["분류"]] = row["내용"]
+
+    # 2. 체크리스트
+    if "2_체크리스트" in xls.sheet_names:
+        values["checklist_df"] = pd.read_excel(xls, sheet_name="2_체크리스트")
+    else:
+        values["checklist_df"] = pd.DataFrame()
+
+    # 3, 4, 5. 작업별 데이터
+    작업명_목록 = _sheet_tasks(values["checklist_df"])
+    for sheet_name in xls.sheet_names:
+        if sheet_name.startswith("3_"):
+            df = pd.read_excel(xls, sheet_name=sheet_name)
+            작업명 = _sheet_task(sheet_name, "_유해요인", 작업명_목록)
+            for _, row in df.iterrows():
+                key_suffix = row['항목'].replace(" ", "_") # "조사 일시" -> "조사_일시"
+                state_key = f"{key_suffix}_{작업명}"
+                values[state_key] = row['내용']
+
+        elif sheet_name.startswith("4_") and sheet_name.endswith("_작업조건"):
+            작업명 = _sheet_task(sheet_name, "_작업조건", 작업명_목록)
+            values.update(_read_work_conditions(xls, sheet_name, 작업명))
+
+        elif sheet_name.startswith("4_") and "원인분석" in sheet_name:
+            작업명 = _sheet_task(sheet_name, "_원인분석", 작업명_목록)
+            df_analysis = pd.read_excel(xls, sheet_name=sheet_name)
+            values[f"원인분석_항목_{작업명}"] = df_analysis.to_dict('records')
+
+    # 5. 정밀조사
+    if "5_정밀조사" in xls.sheet_names:
+        # 빈 칸은 NaN 대신 빈 문자열로 (입력 위젯/편집기가 그대로 쓸 수 있도록)
+        조사_목록 = pd.read_excel(xls, sheet_name="5_정밀조사", dtype=str, keep_default_na=False)
+        조사_원인분석 = pd.DataFrame()
+        if "5_정밀조사_원인분석" in xls.sheet_names:
+            조사_원인분석 = pd.read_excel(xls, sheet_name="5_정밀조사_원인분석", dtype=str, keep_default_na=False)
+        values.update(investigations.from_frames(조사_목록, 조사_원인분석))
+    for 이름, key in investigations.평가_키.items():
+        if f"5_{이름}" in xls.sheet_names:
+            values[key] = pd.read_excel(xls, sheet_name=f"5_{이름}")
+
+    # 6. 증상조사 - 응답 기록이 있으면 누적 집계도 복원 (정정/철회를 이어서 할 수 있도록)
+    for 이름, key in 증상조사_시트:
+        if f"6_{이름}" in xls.sheet_names:
+            values[key] = pd.read_excel(xls, sheet_name=f"6_{이름}")
+    if 증상조사_응답_시트 in xls.sheet_names:
+        응답 = pd.read_excel(xls, sheet_name=증상조사_응답_시트, dtype={"응답자ID": str})
+        values["증상조사_집계"] = symptom_survey.aggregates_from_records(응답)
+    return values
+
+
+def _sheet_tasks(checklist_df):
+    """{시트 이름의 작업명 부분: 작업명} - 잘리거나 바뀐 시트 이름을 체크리스트의 작업명으로 되돌릴 때 사용"""
+    if checklist_df.empty or "작업명" not in checklist_df.columns:
+        return {}
+    작업명 = checklist_df["작업명"].dropna().astype(str).unique()
+    return {_sheet_part(name): name for name in 작업명}
+
+
+def _sheet_task(sheet_name, suffix, 작업명_목록):
+    """작업별 시트 이름(예: "4_조립_작업조건") -> 작업명 (체크리스트에 없으면 시트 이름 그대로)"""
+    part = sheet_name[2:-len(suffix)]
+    return 작업명_목록.get(part, part)
+
+
+def _cell_text(value):
+    return "" if pd.isna(value) else str(value)
+
+
+def _read_work_conditions(xls, sheet_name, 작업명):
+    """작업조건 시트 -> {세션 상태 키: 값} (위쪽 1단계/3단계 항목과 아래쪽 2단계 작업조건 표)
+
+    표는 항목이 아닌 첫 행을 머리글로 읽습니다 (이전 파일은 표가 마지막 항목 행을 덮어써 한 행 위에서 시작).
+    """
+    values = {}
+    raw = pd.read_excel(xls, sheet_name=sheet_name, header=None, dtype=object)
+    header_row = None
+    for row in range(1, len(raw)):
+        항목 = raw.iat[row, 0]
+        if 항목 in 작업조건_항목:
+            values[task_key(작업조건_항목[항목], 작업명)] = _cell_text(raw.iat[row, 1])
+        elif pd.notna(항목):
+            header_row = row
+            break
+    if header_row is None:
+        return values
+    columns = [col for col in raw.columns if pd.notna(raw.iat[header_row, col])]
+    table = raw.iloc[header_row + 1:, columns].dropna(how="all")
+    table.columns = [str(raw.iat[header_row, col]) for col in columns]
+    # 편집기의 글자 열은 빈 칸을 빈 문자열로, 총점은 숫자로
+    for col in table.columns:
+        if col == "총점":
+            table[col] = pd.to_numeric(table[col], errors="coerce").fillna(0).astype(int)
+        else:
+            table[col] = table[col].map(_cell_text)
+    values[작업조건_키.format(작업명)] = table.reset_index(drop=True)
+    return values
@@ -0,0 +1,325 @@
+import os
+import re
+import json
+import time
+import pickle
+import hashlib
+from datetime import datetime
+from contextlib import nullcontext
+
+import pandas as pd
+import streamlit as st
+
+from utils import hash_content
+from wmsd_core.storage import SAVE_DIR
+from wmsd_core import storage
+from wmsd_core.work_model import task_names, key_owner
+from wmsd_core import investigations
+
+# 같은 현장을 여러 조사자가 함께 조사할 때 쓰는 공동 작업공간
+# 현장마다 디렉토리 하나, 구역(작업별 + 공통 항목별)마다 버전이 붙은 파일 하나를 둡니다.
+# 저장은 낙관적 방식: 불러온 뒤 다른 사람이 같은 구역을 먼저 저장했다면 덮어쓰지 않고 충돌로 표시합니다.
+WORKSPACE_DIR = os.path.join(SAVE_DIR, "workspaces")
+SYNC_SECONDS = float(os.environ.get("WMSD_WORKSPACE_SYNC_SECONDS", "5"))
+PART_EXT = ".part"
+
+# 공통 구역: (데이터 키, 받은 내용으로 바꿀 때 초기화할 편집기 위젯 키)
+# 체크리스트는 작업 목록을 정하므로 가장 먼저 동기화
+구역_목록 = {
+    "체크리스트": (["checklist_df"], ["checklist_editor"]),
+    "사업장개요": (["사업장명", "소재지", "업종", "예비조사", "수행기관", "본조사", "성명"], []),
+    "증상조사": (["기초현황_data", "작업기간_data", "육체적부담_data", "통증호소자_data", "증상조사_집계"],
+              ["기초현황_editor", "작업기간_editor", "육체적부담_editor", "통증호소자_editor"]),
+    "개선계획": (["개선계획_data"], ["개선계획_editor"]),
+}
+정밀조사_구역 = "정밀조사"
+작업_구역_접두사 = "작업_"
+# 작업별 데이터 키 (그 밖의 작업별 키는 보관 위젯 값만 포함)
+_작업_데이터_키 = re.compile(r"^(작업조건_data_(?!editor_)|원인분석_항목_|사진_\d+_데이터_)")
+
+
+def _is_empty(value):
+    if value is None:
+        return True
+    if isinstance(value, pd.DataFrame):
+        return value.empty
+    if isinstance(value, (str, list, dict, tuple)):
+        return len(value) == 0
+    return False
+
+
+def _작업_키(state, 작업명_목록):
+    """작업별 구역에 속하는 키 {작업명: [키]}"""
+    보관 = state.get("_위젯_보관", {})
+    후보 = sorted(작업명_목록, key=len, reverse=True)
+    result = {작업명: [] for 작업명 in 작업명_목록}
+    for key in list(state.keys()):
+        if key in 보관 or _작업_데이터_키.match(key):
+            작업명 = key_owner(key, 후보)
+            if 작업명 is not None:
+                result[작업명].append(key)
+    return result
+
+
+def _section_keys(state, name):
+    """공통 구역(정밀조사 포함)에 속하는 키"""
+    if name in 구역_목록:
+        return [key for key in 구역_목록[name][0] if key in state]
+    # 정밀조사: 등록부와 등록된 조사의 데이터 키 (세션 상태 전체를 훑지 않음)
+    keys = [investigations.등록부_키, investigations.다음번호_키] + list(investigations.평가_키.values())
+    for 조사_id in investigations.investigation_ids(state):
+        keys += [key.format(조사_id) for key in investigations.조사_필드.values()]
+    return [key for key in keys if key in state]
+
+
+def partition_keys(state):
+    """현재 세션 상태의 구역별 키 {구역 이름: [키]}"""
+    parts = {name: _section_keys(state, name) for name in list(구역_목록) + [정밀조사_구역]}
+    for 작업명, keys in _작업_키(state, task_names(state)).items():
+        parts[f"{작업_구역_접두사}{작업명}"] = keys
+    return parts
+
+
+def _partition_data(state, keys):
+    """구역 내용 (빈 값은 제외 - 위젯이 기본값으로 만든 키는 변경으로 보지 않음)"""
+    return {key: state[key] for key in sorted(keys) if key in state and not _is_empty(state[key])}
+
+
+def _key_hashes(data):
+    """키별 내용 해시 {키: 해시}"""
+    hashes = {}
+    for key, value in data.items():
+        hasher = hashlib.sha256()
+        hash_content(hasher, value)
+        hashes[key] = hasher.hexdigest()
+    return hashes
+
+
+def _changed(hashes, base_hashes):
+    """기준과 달라진(추가/삭제 포함) 키"""
+    return {key for key in set(hashes) | set(base_hashes) if hashes.get(key) != base_hashes.get(key)}
+
+
+def _safe(name):
+    return str(name).replace("/", "_").replace("\\", "_")
+
+
+def _site_dir(site):
+    return os.path.join(WORKSPACE_DIR, _safe(site))
+
+
+def _part_path(site, name):
+    return os.path.join(_site_dir(site), f"{_safe(name)}{PART_EXT}")
+
+
+def _lock_name(site, name):
+    return f"작업공간_{_safe(site)}_{_safe(name)}"
+
+
+def read_header(path):
+    """구역 파일의 머리글 {name, version, saved_by, saved_at} (없으면 None)"""
+    try:
+        with open(path, "rb") as fp:
+            return json.loads(fp.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_part(path):
+    snapshot = storage.read_snapshot(path)
+    header = json.loads(snapshot.readline())
+    return header, pickle.load(snapshot)
+
+
+def _write_part(path, header, data):
+    """머리글(JSON 한 줄) + 내용(pickle)을 원자적으로 기록"""
+    with storage.atomic_write(path) as fp:
+        fp.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        pickle.dump(data, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _remote_parts(site):
+    """작업공간에 저장된 구역 {구역 이름: 경로}"""
+    directory = _site_dir(site)
+    if not os.path.isdir(directory):
+        return {}
+    parts = {}
+    for filename in os.listdir(directory):
+        if filename.endswith(PART_EXT):
+            header = read_header(os.path.join(directory, filename))
+            if header:
+                parts[header["name"]] = os.path.join(directory, filename)
+    return parts
+
+
+def _transient_keys(state, name):
+    """받은 내용으로 바꿀 때 지울 편집기/입력 위젯 키 (이전 내용 기준의 위젯 상태)"""
+    if name in 구역_목록:
+        return [key for key in 구역_목록[name][1] if key in state]
+    if name == 정밀조사_구역:
+        return [key for key in state.keys() if key.startswith("정밀_원인분석_editor_")] + [
+            key for key in investigations.평가_편집기_키.values() if key in state]
+    작업명 = name[len(작업_구역_접두사):]
+    후보 = sorted(set(task_names(state)) | {작업명}, key=len, reverse=True)
+    return [key for key in state.keys() if key_owner(key, 후보) == 작업명]
+
+
+def _apply(state, name, keys, data):
+    """다른 조사자가 저장한 구역 내용을 세션 상태에 반영"""
+    보관 = state.setdefault("_위젯_보관", {})
+    for key in set(keys) | set(_transient_keys(state, name)):
+        if key not in data:
+            if key in state:
+                del state[key]
+            보관.pop(key, None)
+    for key, value in data.items():
+        state[key] = value
+        # 문자열/숫자 값은 보관 위젯 값 (탭을 옮겨도 유지되도록)
+        if not isinstance(value, (pd.DataFrame, list, dict, tuple)):
+            보관[key] = value
+    state["data_changed"] = True
+
+
+def _header(name, version, user):
+    return {"name": name, "version": version, "saved_by": user,
+            "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def _sync_partition(state, site, name, keys, path, base, conflicts, user, result, prefer=None):
+    """구역 하나를 3-way 병합으로 동기화
+
+    기준(마지막으로 맞춘 버전) 대비 나와 상대가 바꾼 키를 비교해, 서로 다른 키를 바꿨으면
+    합쳐서 저장하고 같은 키를 다르게 바꿨으면 충돌로 남깁니다 (prefer로 어느 쪽을 따를지 지정).
+    """
+    local = _partition_data(state, keys)
+    local_hashes = _key_hashes(local)
+    mine = base.get(name) or {"version": 0, "hashes": {}}
+    내_변경 = _changed(local_hashes, mine["hashes"])
+    header = read_header(path)
+    if not 내_변경 and (header["version"] if header else 0) == mine["version"]:
+        return
+
+    # 저장할 내용이 있을 때만 잠금 (받기만 할 때는 원자적으로 교체된 파일을 그냥 읽음)
+    with storage.session_lock(_lock_name(site, name)) if 내_변경 else nullcontext():
+        header = read_header(path)
+        remote_version = header["version"] if header else 0
+        if remote_version == mine["version"]:
+            remote_hashes, 상대_변경, merged = mine["hashes"], set(), local
+        else:
+            header, remote = _read_part(path)
+            remote_hashes = _key_hashes(remote)
+            상대_변경 = _changed(remote_hashes, mine["hashes"])
+            충돌_키 = sorted(key for key in 내_변경 & 상대_변경 if local_hashes.get(key) != remote_hashes.get(key))
+            if 충돌_키 and prefer is None:
+                conflicts[name] = {"base_version": mine["version"], "theirs": header, "keys": 충돌_키}
+                result["conflicts"].append(name)
+                return
+            merged = dict(remote)
+            for key in 내_변경:
+                if prefer == "theirs" and key in 충돌_키:
+                    continue
+                if key in local:
+                    merged[key] = local[key]
+                else:
+                    merged.pop(key, None)
+
+        merged_hashes = _key_hashes(merged)
+        version = remote_version
+        if merged_hashes != remote_hashes:
+            version += 1
+            _write_part(path, _header(name, version, user), merged)
+            result["saved"].append(name)
+    if 상대_변경:
+        _apply(state, name, keys, merged)
+        result["pulled"].append(name)
+    base[name] = {"version": version, "hashes": merged_hashes}
+    conflicts.pop(name, None)
+
+
+def sync_site(state, site, user):
+    """현장 작업공간과 동기화 - 내가 바꾼 구역은 저장, 다른 조사자가 바꾼 구역은 받기
+
+    구역마다 잠금이 따로 있으므로 서로 다른 작업을 저장하는 조사자는 서로 기다리지 않습니다.
+    같은 구역이라도 서로 다른 항목을 바꿨으면 합쳐서 저장하고, 같은 항목을 다르게 바꿨으면
+    덮어쓰지 않고 충돌로 남깁니다.
+    반환: {"saved": [...], "pulled": [...], "conflicts": [...]}
+    """
+    base = state.setdefault("_작업공간_기준", {}).setdefault(site, {})
+    conflicts = state.setdefault("_작업공간_충돌", {}).setdefault(site, {})
+    result = {"saved": [], "pulled": [], "conflicts": []}
+    remote = _remote_parts(site)
+
+    # 공통 구역 먼저 (받은 체크리스트에 따라 작업 구역이 정해짐)
+    for name in list(구역_목록) + [정밀조사_구역]:
+        _sync_partition(state, site, name, _section_keys(state, name), remote.get(name, _part_path(site, name)),
+                        base, conflicts, user, result)
+
+    parts = partition_keys(state)
+    작업_구역 = [name for name in parts if name.startswith(작업_구역_접두사)]
+    작업_구역 += [name for name in remote if name.startswith(작업_구역_접두사) and name not in parts]
+    for name in 작업_구역:
+        _sync_partition(state, site, name, parts.get(name, []), remote.get(name, _part_path(site, name)),
+                        base, conflicts, user, result)
+    return result
+
+
+def resolve_conflict(state, site, name, user, keep_mine):
+    """충돌 해결 - 충돌한 항목을 keep_mine이면 내 값으로, 아니면 상대 값으로 맞춘 뒤 합쳐서 저장"""
+    base = state.setdefault("_작업공간_기준", {}).setdefault(site, {})
+    conflicts = state.setdefault("_작업공간_충돌", {}).setdefault(site, {})
+    result = {"saved": [], "pulled": [], "conflicts": []}
+    keys = partition_keys(state).get(name, [])
+    path = _remote_parts(site).get(name, _part_path(site, name))
+    _sync_partition(state, site, name, keys, path, base, conflicts, user, result,
+                    prefer="mine" if keep_mine else "theirs")
+    return result
+
+
+def _구역_표시(name):
+    if name.startswith(작업_구역_접두사):
+        return f"작업 '{name[len(작업_구역_접두사):]}'"
+    return name
+
+
+def render_workspace_panel():
+    """사이드바 공동 작업 패널 (켜져 있으면 주기적으로 동기화하고 충돌 표시)"""
+    st.markdown("---")
+    st.markdown("### 👥 현장 공동 작업")
+    if not st.checkbox("같은 현장의 다른 조사자와 함께 작업", key="공동작업_사용"):
+        return
+    조사자 = st.text_input("조사자 이름", key="공동작업_조사자")
+    if not 조사자:
+        st.info("조사자 이름을 입력하면 동기화를 시작합니다.")
+        return
+
+    site = st.session_state["workplace"]
+    지금_동기화 = st.button("🔄 지금 동기화", use_container_width=True, key="공동작업_동기화")
+    if 지금_동기화 or time.time() - st.session_state.get("_작업공간_동기화_시각", 0) >= SYNC_SECONDS:
+        try:
+            result = sync_site(st.session_state, site, 조사자)
+            st.session_state["_작업공간_동기화_시각"] = time.time()
+            st.session_state["_작업공간_결과"] = result
+        except Exception as e:
+            st.error(f"작업공간 동기화 중 오류 발생: {e}")
+
+    result = st.session_state.get("_작업공간_결과")
+    if result and (result["saved"] or result["pulled"]):
+        st.caption(f"최근 동기화: 저장 {len(result['saved'])}개 · 받음 {len(result['pulled'])}개 구역")
+
+    충돌 = st.session_state.get("_작업공간_충돌", {}).get(site, {})
+    for name, info in list(충돌.items()):
+        theirs = info.get("theirs") or {}
+        st.warning(
+            f"⚠️ {_구역_표시(name)}: {theirs.get('saved_by', '다른 조사자')}님이 "
+            f"{theirs.get('saved_at', '')}에 같은 항목({', '.join(info.get('keys', []))})을 먼저 저장했습니다. "
+            f"내 변경은 아직 저장되지 않았습니다."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("내 내용 저장", key=f"공동작업_내것_{name}", use_container_width=True):
+                resolve_conflict(st.session_state, site, name, 조사자, keep_mine=True)
+                st.rerun()
+        with col2:
+            if st.button("상대 내용 받기", key=f"공동작업_상대_{name}", use_container_width=True):
+                resolve_conflict(st.session_state, site, name, 조사자, keep_mine=False)
+                st.rerun()